@@ -0,0 +1,51 @@
+# once_contention.py
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Final
+from benchmark import report
+from once_factory import once
+
+class Settings:
+    pass
+
+@cache
+def cached() -> Settings:
+    return Settings()
+
+_lock: Final[threading.Lock] = threading.Lock()
+_instance: Settings | None = None
+
+def locked() -> Settings:
+    global _instance
+    with _lock:
+        if _instance is None:
+            _instance = Settings()
+    return _instance
+
+@once()
+def once_only() -> Settings:
+    return Settings()
+
+CALLS: Final = 200_000  # Total calls, split across the threads
+
+def hammer(get: Callable[[], Settings], threads: int) -> float:
+    def work(_: int) -> None:
+        for _ in range(CALLS // threads):
+            get()
+    get()  # Build the instance; time only the steady state
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(work, range(threads)))
+        return time.perf_counter() - start
+
+wins: list[bool] = []
+for threads in (1, 4, 16, 64):
+    t_cache, t_lock, t_once = (
+        hammer(get, threads) for get in (cached, locked, once_only))
+    report(threads=threads, cache=t_cache, lock=t_lock, once=t_once)
+    wins.append(t_once < t_lock)
+print(f"once beats locking at 1 to 64 threads: {all(wins)}")
+#: once beats locking at 1 to 64 threads: True
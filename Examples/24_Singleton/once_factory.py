@@ -0,0 +1,66 @@
+# once_factory.py
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import wraps
+
+_KWD_MARK = object()  # Keeps keywords apart from positionals in a key
+
+def once[**P, T](
+    maxsize: int | None = None,
+) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    def decorate(factory: Callable[P, T]) -> Callable[P, T]:
+        built: dict[Hashable, T] = {}
+        lock = threading.Lock()
+
+        @wraps(factory)
+        def get(*args: P.args, **kwargs: P.kwargs) -> T:
+            key: Hashable = args
+            if kwargs:
+                key = (*args, _KWD_MARK, *kwargs.items())
+            try:
+                return built[key]  # Fast path: no lock
+            except KeyError:
+                pass
+            with lock:
+                if key not in built:  # Another thread may have won
+                    if maxsize is not None and len(built) >= maxsize:
+                        del built[next(iter(built))]  # Oldest first
+                    built[key] = factory(*args, **kwargs)
+                return built[key]
+
+        return get
+    return decorate
+
+@dataclass
+class Settings:
+    data: dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        time.sleep(0.05)  # Widen the first-call window
+
+@once()
+def settings() -> Settings:
+    return Settings()
+
+@dataclass
+class Connection:
+    host: str
+
+@once(maxsize=2)
+def connection(host: str) -> Connection:
+    return Connection(host)
+
+if __name__ == "__main__":
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        built = list(pool.map(lambda _: settings(), range(8)))
+    print(len({id(s) for s in built}))
+    a = connection("db1")
+    print(a is connection("db1"), a is connection("db2"))
+    connection("db3")  # Evicts db1, the oldest
+    print(a is connection("db1"))
+#: 1
+#: True False
+#: False
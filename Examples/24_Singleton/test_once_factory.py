@@ -0,0 +1,47 @@
+# test_once_factory.py
+from concurrent.futures import ThreadPoolExecutor
+from once_factory import once, settings
+
+def test_racing_threads_share_one_instance() -> None:
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        built = list(pool.map(lambda _: settings(), range(8)))
+    assert all(s is built[0] for s in built)
+
+def test_each_key_gets_its_own_instance() -> None:
+    @once()
+    def box(name: str) -> list[str]:
+        return [name]
+
+    assert box("a") is box("a")
+    assert box("a") is not box("b")
+
+def test_keywords_do_not_collide_with_positionals() -> None:
+    @once()
+    def pack(*args: object, **kwargs: object) -> list[object]:
+        return [args, kwargs]
+
+    assert pack("a", x=1) is pack("a", x=1)
+    assert pack("a", x=1) is not pack(("a",), (("x", 1),))
+
+def test_maxsize_evicts_the_oldest() -> None:
+    built: list[str] = []
+
+    @once(maxsize=2)
+    def make(name: str) -> str:
+        built.append(name)
+        return name
+
+    for name in "abcca":
+        make(name)
+    assert built == ["a", "b", "c", "a"]
+
+def test_a_none_result_is_still_built_once() -> None:
+    built: list[None] = []
+
+    @once()
+    def nothing() -> None:
+        built.append(None)
+
+    nothing()
+    nothing()
+    assert built == [None]
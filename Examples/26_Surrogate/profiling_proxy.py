@@ -0,0 +1,103 @@
+# profiling_proxy.py
+import time
+import timeit
+from array import array
+from collections.abc import Callable
+from typing import Any
+from benchmark import report
+from counting_proxy import CountingProxy, Implementation
+
+class ProfilingProxy:
+    def __init__(self, impl: Any, *, enabled: bool = True) -> None:
+        self._impl = impl
+        self._enabled = enabled
+        self._slots: dict[str, int] = {}  # Method name -> index
+        self._cached: set[str] = set()  # Wrappers in __dict__
+        self.calls = array("Q")  # Per-method call counts
+        self.elapsed_ns = array("Q")  # Per-method total time
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._impl, name)
+        if not (self._enabled and callable(attr)):
+            return attr  # Passthrough: no wrapper at all
+        wrapper = self._wrap(name, attr)
+        # Store it on the instance, so the next lookup of name
+        # finds it directly and never reaches __getattr__():
+        self.__dict__[name] = wrapper
+        self._cached.add(name)
+        return wrapper
+
+    def _wrap(
+        self, name: str, method: Callable[..., Any]
+    ) -> Callable[..., Any]:
+        if (slot := self._slots.get(name)) is None:
+            slot = self._slots[name] = len(self._slots)
+            self.calls.append(0)
+            self.elapsed_ns.append(0)
+        impl, cls = self._impl, type(self._impl)
+        calls, elapsed = self.calls, self.elapsed_ns
+        clock = time.perf_counter_ns
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            if type(impl) is not cls:  # Class swapped: rebuild
+                self._uncache()
+                return getattr(self, name)(*args, **kwargs)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed[slot] += clock() - start
+                calls[slot] += 1
+
+        return timed
+
+    def _uncache(self) -> None:
+        for name in self._cached:
+            del self.__dict__[name]
+        self._cached.clear()
+
+    def enable(self) -> None:
+        self._enabled = True
+
+    def disable(self) -> None:
+        self._enabled = False
+        self._uncache()
+
+    def stats(self) -> dict[str, tuple[int, int]]:
+        return {
+            name: (self.calls[i], self.elapsed_ns[i])
+            for name, i in self._slots.items()
+        }
+
+class Cheap:
+    def f(self) -> int: return 1
+
+def per_call(proxy: Any) -> float:
+    # Look up proxy.f on every call, as ordinary code does:
+    return min(timeit.repeat(
+        lambda: proxy.f(), number=100_000, repeat=5))
+
+if __name__ == "__main__":
+    p = ProfilingProxy(Implementation())
+    p.f()
+    p.g()
+    p.f()
+    print({name: n for name, (n, _) in p.stats().items()})
+    print("f" in vars(p))  # Built once, cached on the instance
+    p.disable()
+    p.f()  # Passthrough: not counted
+    print(p.calls[0])
+    t_count = per_call(CountingProxy(Cheap()))
+    t_profile = per_call(ProfilingProxy(Cheap()))
+    t_off = per_call(ProfilingProxy(Cheap(), enabled=False))
+    report(counting=t_count, profiling=t_profile, passthrough=t_off)
+    print(f"disabled at least 2x faster than CountingProxy: "
+          f"{t_off * 2 < t_count}")
+#: f()
+#: g()
+#: f()
+#: {'f': 2, 'g': 1}
+#: True
+#: f()
+#: 2
+#: disabled at least 2x faster than CountingProxy: True
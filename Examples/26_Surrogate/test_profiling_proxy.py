@@ -0,0 +1,41 @@
+# test_profiling_proxy.py
+from profiling_proxy import ProfilingProxy
+
+class Doubler:
+    def double(self, n: int) -> int:
+        return n * 2
+
+class Tripler:
+    def double(self, n: int) -> int:
+        return n * 3
+
+def test_counts_and_times_each_method() -> None:
+    p = ProfilingProxy(Doubler())
+    assert p.double(5) == 10
+    assert p.double(3) == 6
+    calls, elapsed_ns = p.stats()["double"]
+    assert calls == 2
+    assert elapsed_ns > 0
+
+def test_wrapper_is_built_once() -> None:
+    p = ProfilingProxy(Doubler())
+    assert p.double is p.double
+
+def test_disabled_proxy_returns_the_bound_method() -> None:
+    impl = Doubler()
+    p = ProfilingProxy(impl)
+    p.double(1)
+    p.disable()
+    assert p.double == impl.double  # No wrapper in between
+    p.double(1)
+    p.enable()
+    p.double(1)
+    assert p.stats()["double"][0] == 2
+
+def test_class_swap_rebuilds_the_wrapper() -> None:
+    impl = Doubler()
+    p = ProfilingProxy(impl)
+    assert p.double(2) == 4
+    impl.__class__ = Tripler
+    assert p.double(2) == 6
+    assert p.stats()["double"][0] == 2
@@ -0,0 +1,66 @@
+# lazy_registry.py
+import importlib
+import importlib.util
+import pkgutil
+import sys
+import time
+from typing import Protocol
+from benchmark import report
+
+class Shape(Protocol):
+    def draw(self) -> None: ...
+
+class LazyRegistry:
+    def __init__(self) -> None:
+        self.paths: dict[str, str] = {}  # Name -> "module:Class"
+        self.loaded: dict[str, type[Shape]] = {}
+        self.import_ns: dict[str, int] = {}  # Cost per module
+
+    def add(self, name: str, path: str) -> None:
+        self.paths[name] = path
+
+    def scan(self, package: str) -> None:
+        # Record each module in package without importing it:
+        spec = importlib.util.find_spec(package)
+        if spec is None or spec.submodule_search_locations is None:
+            raise ModuleNotFoundError(f"No package {package!r}")
+        where = spec.submodule_search_locations
+        for module in pkgutil.iter_modules(where):
+            name = module.name.capitalize()
+            self.add(name, f"{package}.{module.name}:{name}")
+
+    def load(self, name: str) -> type[Shape]:
+        if (cls := self.loaded.get(name)) is not None:
+            return cls
+        module_name, _, class_name = self.paths[name].partition(":")
+        start = time.perf_counter_ns()
+        module = importlib.import_module(module_name)
+        elapsed = time.perf_counter_ns() - start
+        self.import_ns.setdefault(module_name, elapsed)
+        cls = self.loaded[name] = getattr(module, class_name)
+        return cls
+
+    def create(self, name: str) -> Shape:
+        return self.load(name)()
+
+    def warm(self, *names: str) -> None:
+        for name in names:
+            self.load(name)
+
+if __name__ == "__main__":
+    shapes = LazyRegistry()
+    shapes.scan("shape_plugins")
+    print(sorted(shapes.paths))
+    print("shape_plugins.circle" in sys.modules)
+    shapes.create("Circle").draw()
+    shapes.create("Circle").draw()  # Already loaded
+    shapes.warm("Square")
+    print(sorted(shapes.import_ns))
+    report(**{m: ns / 1e6 for m, ns in shapes.import_ns.items()})
+#: ['Circle', 'Square', 'Triangle']
+#: False
+#: loading circle
+#: Circle.draw
+#: Circle.draw
+#: loading square
+#: ['shape_plugins.circle', 'shape_plugins.square']
@@ -0,0 +1,58 @@
+# prototype_compiled.py
+import copy
+import timeit
+from collections.abc import Callable
+from dataclasses import fields
+from typing import Any, Final, cast
+from benchmark import report
+from prototype_registry import PROTOTYPES, Monster
+
+type Cloner = Callable[[], Monster]
+
+SHARED: Final = (str, int, float, bool)  # Immutable all the way
+OWNED: Final = (list, dict, set)  # Each clone gets its own copy
+
+def compile_cloner(proto: Monster) -> Cloner:
+    args: list[str] = []
+    for f in fields(proto):
+        value = getattr(proto, f.name)
+        if isinstance(value, SHARED):
+            args.append(f"{f.name}=proto.{f.name}")
+        elif isinstance(value, OWNED):
+            args.append(f"{f.name}=proto.{f.name}.copy()")
+        else:  # Anything else, tuple included: the safe copy
+            args.append(f"{f.name}=deepcopy(proto.{f.name})")
+    source = f"def clone():\n    return cls({', '.join(args)})"
+    namespace: dict[str, Any] = {
+        "cls": type(proto), "proto": proto, "deepcopy": copy.deepcopy,
+    }
+    exec(source, namespace)
+    return cast(Cloner, namespace["clone"])
+
+CLONERS: Final[dict[str, Cloner]] = {
+    kind: compile_cloner(proto) for kind, proto in PROTOTYPES.items()
+}
+
+def register(kind: str, proto: Monster) -> None:
+    PROTOTYPES[kind] = proto
+    CLONERS[kind] = compile_cloner(proto)
+
+def spawn(kind: str) -> Monster:
+    return CLONERS[kind]()
+
+def spawn_many(kind: str, n: int) -> list[Monster]:
+    clone = CLONERS[kind]  # One lookup for the whole batch
+    return [clone() for _ in range(n)]
+
+if __name__ == "__main__":
+    goblins = spawn_many("goblin", 3)
+    goblins[0].powers.append("curse")
+    print([g.powers for g in goblins])
+    troll = PROTOTYPES["troll"]
+    n = 20_000
+    t_deep = timeit.timeit(lambda: copy.deepcopy(troll), number=n)
+    t_fast = timeit.timeit(lambda: spawn("troll"), number=n)
+    report(deepcopy=t_deep, compiled=t_fast, ratio=t_deep / t_fast)
+    print(f"compiled clone at least 3x faster: {t_fast * 3 < t_deep}")
+#: [['bite', 'curse'], ['bite'], ['bite']]
+#: compiled clone at least 3x faster: True
@@ -0,0 +1,5 @@
+# shape_plugins/circle.py
+print("loading circle")
+
+class Circle:
+    def draw(self) -> None: print("Circle.draw")
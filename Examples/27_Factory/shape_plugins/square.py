@@ -0,0 +1,5 @@
+# shape_plugins/square.py
+print("loading square")
+
+class Square:
+    def draw(self) -> None: print("Square.draw")
@@ -0,0 +1,5 @@
+# shape_plugins/triangle.py
+print("loading triangle")
+
+class Triangle:
+    def draw(self) -> None: print("Triangle.draw")
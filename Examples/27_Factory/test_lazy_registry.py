@@ -0,0 +1,28 @@
+# test_lazy_registry.py
+import pytest
+from lazy_registry import LazyRegistry
+
+@pytest.fixture
+def shapes() -> LazyRegistry:
+    registry = LazyRegistry()
+    registry.scan("shape_plugins")
+    return registry
+
+def test_scan_imports_nothing(shapes: LazyRegistry) -> None:
+    assert set(shapes.paths) == {"Circle", "Square", "Triangle"}
+    assert shapes.loaded == {}
+
+def test_create_imports_on_demand(shapes: LazyRegistry) -> None:
+    circle = shapes.create("Circle")
+    assert type(circle).__name__ == "Circle"
+    assert list(shapes.loaded) == ["Circle"]
+
+def test_warm_preloads_a_subset(shapes: LazyRegistry) -> None:
+    shapes.warm("Square", "Triangle")
+    assert set(shapes.loaded) == {"Square", "Triangle"}
+    assert set(shapes.import_ns) == {
+        "shape_plugins.square", "shape_plugins.triangle"}
+
+def test_unknown_name_raises(shapes: LazyRegistry) -> None:
+    with pytest.raises(KeyError):
+        shapes.create("Hexagon")
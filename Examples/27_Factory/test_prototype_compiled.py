@@ -0,0 +1,42 @@
+# test_prototype_compiled.py
+import copy
+from dataclasses import dataclass
+from prototype_compiled import (
+    CLONERS,
+    compile_cloner,
+    register,
+    spawn,
+    spawn_many,
+)
+from prototype_registry import PROTOTYPES, Monster
+
+def test_clone_matches_deepcopy() -> None:
+    for kind, proto in PROTOTYPES.items():
+        assert spawn(kind) == copy.deepcopy(proto)
+
+def test_clones_stay_independent() -> None:
+    batch = spawn_many("troll", 100)
+    batch[0].powers.append("curse")
+    assert all(m.powers == ["smash", "regenerate"] for m in batch[1:])
+    assert PROTOTYPES["troll"].powers == ["smash", "regenerate"]
+
+def test_register_compiles_a_new_kind() -> None:
+    imp = Monster("Imp", hp=3, powers=["blink"])
+    register("imp", imp)
+    try:
+        clone = spawn("imp")
+        assert clone == imp
+        assert clone.powers is not imp.powers
+    finally:  # Leave the registry as the other tests expect it
+        del PROTOTYPES["imp"], CLONERS["imp"]
+
+@dataclass
+class Hoarder(Monster):
+    loot: tuple[list[str], ...] = ()
+
+def test_a_tuple_holding_a_list_is_not_shared() -> None:
+    dragon = Hoarder("Dragon", hp=90, loot=(["gold"],))
+    clone = compile_cloner(dragon)()
+    assert isinstance(clone, Hoarder)
+    clone.loot[0].append("gem")
+    assert dragon.loot == (["gold"],)
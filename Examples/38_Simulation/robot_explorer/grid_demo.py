@@ -0,0 +1,61 @@
+# robot_explorer/grid_demo.py
+import time
+from benchmark import report
+from game import GameBuilder, solution, string_maze
+from grid_world import GridWorld
+
+route = GridWorld(string_maze).solve()
+assert route is not None
+game = GameBuilder(string_maze)
+game.run(route)  # Replay the route in the object model
+print(game.robot.finished, len(route), len(solution))
+#: True 198 198
+
+def serpentine(n: int) -> str:
+    # A wall on every odd row, its gap at alternating ends:
+    wall = "#" * (n - 1)
+    rows: list[str] = []
+    for row in range(n):
+        if row % 2 == 0:
+            rows.append("_" * n)
+        elif row % 4 == 1:
+            rows.append(wall + "_")
+        else:
+            rows.append("_" + wall)
+    rows[0] = "R" + "_" * (n - 3) + "a_"
+    rows[-1] = "a" + "_" * (n - 2) + "!"
+    return "\n".join(rows)
+
+def open_floor(n: int) -> str:
+    rows = ["_" * n] * n
+    rows[0] = "R" + "_" * (n - 1)
+    rows[-1] = "_" * (n - 1) + "!"
+    return "\n".join(rows)
+
+big = serpentine(1001)
+start = time.perf_counter()
+world = GridWorld(big)
+loaded = time.perf_counter()
+route = world.solve()
+solved = time.perf_counter()
+assert route is not None
+print(len(route))  # Through the teleport, not along the snake
+#: 1999
+field = GridWorld(open_floor(1001))
+start_open = time.perf_counter()
+route = field.solve()
+t_open = time.perf_counter() - start_open
+assert route is not None
+print(len(route))  # Straight across, no detours
+#: 2000
+small = serpentine(201)
+start_objects = time.perf_counter()
+GameBuilder(small)
+t_objects = time.perf_counter() - start_objects
+start_grid = time.perf_counter()
+GridWorld(small)
+t_grid = time.perf_counter() - start_grid
+report(load=loaded - start, solve=solved - loaded,
+       solve_open=t_open, objects_201=t_objects, grid_201=t_grid)
+print(f"grid loads at least 10x faster: {t_grid * 10 < t_objects}")
+#: grid loads at least 10x faster: True
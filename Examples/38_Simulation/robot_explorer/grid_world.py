@@ -0,0 +1,108 @@
+# robot_explorer/grid_world.py
+# The maze as flat arrays: one byte per cell, found by arithmetic.
+import heapq
+from collections.abc import Callable
+from typing import Final
+
+WALL, OPEN, END, TELEPORT = range(4)
+CODES: Final = bytearray([TELEPORT]) * 256  # Letters teleport
+for symbol, code in {"#": WALL, "/": WALL, "_": OPEN, ".": OPEN,
+                     "R": OPEN, "!": END}.items():
+    CODES[ord(symbol)] = code
+
+class GridWorld:
+    def __init__(self, maze: str) -> None:
+        lines = maze.splitlines()
+        width = max(map(len, lines))
+        # A border of wall on every side means a neighbor index is
+        # always in range, so no move needs a bounds check:
+        self.stride = width + 2
+        border = b"#" * self.stride
+        raw = b"".join([border, *(
+            b"#" + line.encode().ljust(width, b"#") + b"#"
+            for line in lines), border])
+        self.cells = raw.translate(CODES)
+        self.start = raw.index(b"R")
+        self.end = raw.index(b"!")
+        # The edge table: each teleport cell maps to its partner
+        found: dict[int, list[int]] = {}
+        at = self.cells.find(TELEPORT)
+        while at != -1:
+            found.setdefault(raw[at], []).append(at)
+            at = self.cells.find(TELEPORT, at + 1)
+        self.teleports: dict[int, int] = {}
+        for a, b in found.values():  # Exactly two per letter
+            self.teleports[a] = b
+            self.teleports[b] = a
+
+    def solve(self) -> str | None:
+        # A* search: extend the route whose moves so far plus fewest
+        # possible moves left is smallest, the longest on a tie
+        cells, jump = self.cells, self.teleports
+        steps = ((-self.stride, "n"), (self.stride, "s"),
+                 (1, "e"), (-1, "w"))
+        estimate = self.estimator()
+        moves = [-1] * len(cells)  # Fewest moves found to each cell
+        came = [-1] * len(cells)  # Cell we arrived from
+        how = [""] * len(cells)  # Move that got us here
+        moves[self.start] = 0
+        frontier = [(estimate(self.start), 0, self.start)]
+        while frontier:
+            _, behind, here = heapq.heappop(frontier)
+            if here == self.end:
+                break
+            if -behind > moves[here]:
+                continue  # Reached more cheaply since it was queued
+            taken = moves[here] + 1
+            for delta, move in steps:
+                there = here + delta
+                code = cells[there]
+                if code == WALL:
+                    continue
+                if code == TELEPORT:
+                    there = jump[there]  # Land at the partner
+                if moves[there] == -1 or taken < moves[there]:
+                    moves[there] = taken
+                    came[there] = here
+                    how[there] = move
+                    heapq.heappush(frontier, (
+                        taken + estimate(there), -taken, there))
+        if moves[self.end] == -1:
+            return None  # No route to the end
+        route: list[str] = []
+        at = self.end
+        while at != self.start:
+            route.append(how[at])
+            at = came[at]
+        return "".join(reversed(route))
+
+    def estimator(self) -> Callable[[int], int]:
+        # Fewest moves to the end if every cell were open: walk
+        # straight there, or to a teleport that leaves you nearer
+        stride, end = self.stride, self.end
+
+        def apart(a: int, b: int) -> int:
+            (ar, ac), (br, bc) = divmod(a, stride), divmod(b, stride)
+            return abs(ar - br) + abs(ac - bc)
+
+        # after[t]: fewest moves to the end once you step onto t,
+        # settled nearest-first because teleports can chain
+        after = {t: apart(p, end) for t, p in self.teleports.items()}
+        waiting = set(after)
+        while waiting:
+            u = min(waiting, key=after.__getitem__)
+            waiting.remove(u)
+            for t in waiting:
+                p = self.teleports[t]
+                after[t] = min(after[t], apart(p, u) + after[u])
+        # A teleport no nearer the end than walking never helps:
+        useful = [(t, rest) for t, rest in after.items()
+                  if rest < apart(t, end)]
+
+        def estimate(cell: int) -> int:
+            best = apart(cell, end)
+            for t, rest in useful:
+                best = min(best, apart(cell, t) + rest)
+            return best
+
+        return estimate
@@ -0,0 +1,34 @@
+# robot_explorer/test_grid_world.py
+import pytest
+from game import GameBuilder, solution, string_maze
+from grid_world import GridWorld
+
+def finishes(maze: str, route: str) -> bool:
+    game = GameBuilder(maze)
+    game.run(route)
+    return game.robot.finished
+
+def test_shortest_route_finishes_the_object_model() -> None:
+    route = GridWorld(string_maze).solve()
+    assert route is not None
+    assert finishes(string_maze, route)
+    assert len(route) <= len(solution)
+
+def test_route_takes_the_teleport() -> None:
+    maze = "Ra#!\n##a_"  # The wall is only passable by teleport
+    route = GridWorld(maze).solve()
+    assert route == "een"
+    assert finishes(maze, route)
+
+def test_walled_off_end_has_no_route() -> None:
+    assert GridWorld("R#!").solve() is None
+
+def test_route_chains_teleports() -> None:
+    maze = "Ra###b!\n##ab###"  # Only two jumps in a row cross
+    route = GridWorld(maze).solve()
+    assert route == "eee"
+    assert finishes(maze, route)
+
+def test_unpaired_teleport_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        GridWorld("Ra_!")
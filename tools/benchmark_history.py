@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Track the numbers the book's measured listings report, run over run.
+
+A listing that measures something hands its numbers to ``report()`` from
+``utils/benchmark.py`` and prints a threshold instead ("set at least 100x
+faster: True"), so the book's output is the same on every machine. The
+numbers themselves are printed only under ``--numbers``, and then lost, so
+nothing shows a claim in chapter 18 or 19 wearing thin on a new Python
+release until the day its threshold line flips.
+
+This runs every listing in the tree that imports ``report()``,
+``--repeat`` times each (default 5), each run a fresh interpreter. Runs
+are one at a time: these are timings, and two at once would compete for
+the CPU they are timing. tools_benchmark.py catches what each run hands to
+report(), so the listings run unchanged.
+
+Every measurement is appended to a JSON-lines history,
+``build/benchmarks.jsonl`` by default, one line per listing, metric, and
+run, with the interpreter and machine it was taken on:
+
+    {"session": "2026-10-19T14:03:11",
+     "listing": "18_Performance/membership.py", "metric": "ratio",
+     "run": 0, "value": 13935.56, "python": "3.14.0",
+     "build": "3.14.0 (main, ...) [GCC 14.2.0]", "machine": "x86_64",
+     "cpus": 8}
+
+Each metric's median is then compared with the last session that
+measured it on the same interpreter build, machine type and CPU count, so
+a number taken on a laptop is never held against one from a CI runner.
+``--against 3.14`` instead takes the last such session on Python 3.14
+(3.14.0, 3.14.1, ..., but not 3.14t, which is ``--against 3.14t``) on the
+same machine type and CPU count, and ``--any-machine`` drops the machine
+and CPU match for either comparison. A metric is flagged when its median
+moved more than ``--threshold`` (default 0.10, ten percent) and the two
+sessions' runs do not overlap at all: with five runs on each side, a shift
+that clean is not noise. The tool cannot know which way is better (a time
+should fall, a speedup ratio should rise), so a move either way past the
+threshold is flagged, with its sign. Exit status is 1 if anything was
+flagged or a listing failed.
+
+Listings in ``tools/data/norun.txt`` or marked ``# extract: no-run`` are
+skipped, as in run_examples.py.
+
+Usage:
+    python tools/benchmark_history.py                 # run, compare, record
+    python tools/benchmark_history.py 18_Performance  # only that subtree
+    python tools/benchmark_history.py --repeat 9 --threshold 0.05
+    python tools/benchmark_history.py --against 3.14  # vs the last 3.14 run
+    python tools/benchmark_history.py --any-machine   # vs any machine's runs
+    python tools/benchmark_history.py --no-record     # compare, write nothing
+    python tools/benchmark_history.py --all           # every metric printed
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import sysconfig
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from run_examples import is_pytest_file, is_skipped
+from tools_config import BUILD_DIR, NORUN_FILE, TOOLS_DIR
+from tools_config import EXAMPLES_TREE as DEFAULT_TREE
+from tools_repo import load_glob_list
+
+HISTORY = BUILD_DIR / "benchmarks.jsonl"
+USES_REPORT_RE = re.compile(r"^from benchmark import .*\breport\b",
+                            re.MULTILINE)
+
+Samples = dict[tuple[str, str], list[float]]
+
+
+def measured_listings(tree: Path, subtree: str = "") -> list[Path]:
+    """The runnable listings under `tree` that call report()."""
+    skips = load_glob_list(NORUN_FILE)
+    found = []
+    for path in sorted(tree.rglob("*.py")):
+        rel = path.relative_to(tree).as_posix()
+        if (subtree not in rel or path.parent == tree / "utils"
+                or is_pytest_file(path.name)):
+            continue
+        text = path.read_text(encoding="utf-8", errors="replace")
+        if USES_REPORT_RE.search(text) and not is_skipped(rel, text, skips):
+            found.append(path)
+    return found
+
+
+def interpreter() -> dict[str, Any]:
+    """What a measurement depends on besides the code: Python and machine."""
+    build = sys.version.replace("\n", " ")
+    if sysconfig.get_config_var("Py_GIL_DISABLED"):
+        build += " free-threading"
+    return {"python": platform.python_version(), "build": build,
+            "machine": platform.machine(), "cpus": os.cpu_count()}
+
+
+def run_once(path: Path, tree: Path, timeout: float,
+             ) -> list[tuple[str, float]] | str:
+    """One run's measurements, or the reason it failed."""
+    pythonpath = os.pathsep.join(filter(None, [
+        str(TOOLS_DIR), str(tree / "utils"), os.environ.get("PYTHONPATH")]))
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "measured.json"
+        try:
+            proc = subprocess.run(
+                [sys.executable, "-m", "tools_benchmark", str(out),
+                 path.name],
+                cwd=path.parent, env={**os.environ, "PYTHONPATH": pythonpath},
+                stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return f"timed out after {timeout:g}s"
+        if proc.returncode != 0:
+            return (proc.stderr.strip().splitlines() or ["(no stderr)"])[-1]
+        return [tuple(pair) for pair in
+                json.loads(out.read_text(encoding="utf-8"))]
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    """Every recorded measurement, oldest first; torn lines are dropped."""
+    if not path.is_file():
+        return []
+    records = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def on_version(record: dict[str, Any], against: str) -> bool:
+    """True if `record` ran on Python `against`, e.g. "3.14" or "3.14t".
+
+    Versions match on whole components, so "3.14" takes 3.14.0 but not
+    3.140, and a trailing "t" asks for a free-threaded build.
+    """
+    wanted = against.removesuffix("t").split(".")
+    free = against.endswith("t")
+    version = record["python"].split(".")[:len(wanted)]
+    return (version == wanted
+            and record["build"].endswith(" free-threading") == free)
+
+
+def baseline(records: list[dict[str, Any]], against: str | None,
+             host: dict[str, Any] | None = None) -> Samples:
+    """Each metric's samples from the last session that measured it.
+
+    Only records on Python `against` (if given) and agreeing with every
+    field in `host` (if given) count.
+    """
+    latest: dict[tuple[str, str], str] = {}
+    samples: Samples = {}
+    for r in records:
+        if against is not None and not on_version(r, against):
+            continue
+        if host and any(r.get(k) != v for k, v in host.items()):
+            continue
+        key = (r["listing"], r["metric"])
+        if r["session"] > latest.get(key, ""):
+            latest[key] = r["session"]
+            samples[key] = []
+        if r["session"] == latest[key]:
+            samples[key].append(r["value"])
+    return samples
+
+
+def change(old: list[float], new: list[float], threshold: float,
+           ) -> tuple[float, bool]:
+    """(relative change of the median, whether that is flagged)."""
+    before, after = statistics.median(old), statistics.median(new)
+    if before == 0:
+        return (0.0, False) if after == 0 else (float("inf"), True)
+    moved = (after - before) / abs(before)
+    apart = min(new) > max(old) or max(new) < min(old)
+    return moved, abs(moved) > threshold and apart
+
+
+def compare(old: Samples, new: Samples, threshold: float,
+            show_all: bool) -> int:
+    """Print the comparison; the number of flagged metrics."""
+    flagged = 0
+    for key in sorted(new):
+        if key not in old:
+            continue
+        moved, bad = change(old[key], new[key], threshold)
+        flagged += bad
+        if bad or show_all:
+            listing, metric = key
+            print(f"  {'!' if bad else ' '} {moved:+8.1%}  "
+                  f"{statistics.median(old[key]):>14,.6g} -> "
+                  f"{statistics.median(new[key]):<14,.6g} "
+                  f"{listing} {metric}")
+    new_only = len(new.keys() - old.keys())
+    if new_only:
+        print(f"  {new_only} metric(s) have no earlier numbers to compare.")
+    return flagged
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("subtree", nargs="?", default="",
+                    help="only listings whose path contains this substring")
+    ap.add_argument("--tree", type=Path, default=DEFAULT_TREE,
+                    help=f"extracted tree (default: {DEFAULT_TREE.name})")
+    ap.add_argument("--history", type=Path, default=HISTORY,
+                    help=f"JSON-lines history (default: {HISTORY.name} in "
+                         "build/)")
+    ap.add_argument("--repeat", type=int, default=5, metavar="N",
+                    help="runs of each listing (default: 5)")
+    ap.add_argument("--threshold", type=float, default=0.10,
+                    help="flag a median that moved more than this "
+                         "fraction (default: 0.10)")
+    ap.add_argument("--against", metavar="VERSION",
+                    help="compare with the last session on this Python "
+                         "version, e.g. 3.14 or 3.14t (default: last "
+                         "session on this build)")
+    ap.add_argument("--any-machine", action="store_true",
+                    help="compare with sessions on any machine type and "
+                         "CPU count, not just this one's")
+    ap.add_argument("--timeout", type=float, default=120.0,
+                    help="seconds before a run is killed (default: 120)")
+    ap.add_argument("--no-record", action="store_true",
+                    help="compare only; append nothing to the history")
+    ap.add_argument("--all", action="store_true",
+                    help="print every compared metric, not just the flagged")
+    args = ap.parse_args(argv)
+
+    if not args.tree.is_dir():
+        print(f"No example tree at {args.tree}. "
+              "Run: python tools/extract_examples.py --write")
+        return 2
+    listings = measured_listings(args.tree, args.subtree)
+    if not listings:
+        print(f"No listing under {args.tree} calls report().")
+        return 0
+
+    session = datetime.now().isoformat(timespec="seconds")
+    machine = interpreter()
+    new: Samples = {}
+    records: list[dict[str, Any]] = []
+    failed: list[tuple[str, str]] = []
+    print(f"Running {len(listings)} listing(s) {args.repeat} time(s) each "
+          f"on Python {machine['python']}, {machine['cpus']} CPUs.")
+    for path in listings:
+        rel = path.relative_to(args.tree).as_posix()
+        runs = []
+        for _ in range(args.repeat):
+            result = run_once(path, args.tree, args.timeout)
+            if isinstance(result, str):
+                failed.append((rel, result))
+                break
+            runs.append(dict(result))  # A name reported twice keeps the last
+        else:
+            for run, measured in enumerate(runs):
+                for metric, value in measured.items():
+                    new.setdefault((rel, metric), []).append(value)
+                    records.append({"session": session, "listing": rel,
+                                    "metric": metric, "run": run,
+                                    "value": value, **machine})
+
+    # Another version's build string differs by design, so --against
+    # matches the machine alone.
+    fields = ["machine", "cpus"] if args.against else [
+        "build", "machine", "cpus"]
+    host = {} if args.any_machine else {k: machine[k] for k in fields}
+    old = baseline(load_history(args.history), args.against, host)
+    wanted = f" on Python {args.against}" if args.against else ""
+    if not args.any_machine:
+        wanted += f" on {machine['machine']}, {machine['cpus']} CPUs"
+    flagged = 0
+    if not old:
+        print(f"\nNo earlier numbers{wanted} in {args.history} to compare.")
+    else:
+        print(f"\nAgainst each metric's last recorded run{wanted}, "
+              f"threshold {args.threshold:.0%}:")
+        flagged = compare(old, new, args.threshold, args.all)
+        print(f"{flagged} of {len(new.keys() & old.keys())} metric(s) "
+              "flagged.")
+
+    if records and not args.no_record:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with args.history.open("a", encoding="utf-8", newline="\n") as f:
+            f.writelines(json.dumps(r) + "\n" for r in records)
+        print(f"Appended {len(records)} measurement(s) to {args.history}.")
+    if failed:
+        print("\nFailures (last stderr line):")
+        for rel, reason in failed:
+            print(f"  F {rel}\n      {reason}")
+    return 1 if flagged or failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
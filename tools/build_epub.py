@@ -38,13 +38,17 @@ The book's diagrams are SVG, which the site serves as-is. Kindle's SVG
 support is unreliable, so this build rasterizes each one to PNG and
 points the EPUB at that instead. The conversion needs one of
 `rsvg-convert`, `magick`, or `inkscape`; with none of them installed the
-build still succeeds and keeps the SVGs, printing a note.
+build still succeeds and keeps the SVGs, printing a note. Each PNG is
+cached under `build/cache/svg-png/` by the SVG's hash and the exact
+conversion command, so only new or edited diagrams are converted, several
+at once (`-j`).
 
 Usage:
     python tools/build_epub.py              # build/epub/ThinkingInPython.epub
     python tools/build_epub.py -o DIR       # build somewhere else
     python tools/build_epub.py --keep-source  # leave build/epub/src/ in place
     python tools/build_epub.py --keep-svg     # skip the PNG conversion
+    python tools/build_epub.py --no-cache     # convert every diagram again
 
 Requires `pandoc` on PATH (`make tools-check-full` verifies it).
 """
@@ -56,15 +60,20 @@ import re
 import shutil
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from html import escape
 from pathlib import Path
 
 import build_site
+import tools_cache
 from build_site import Chapter
 from heading_links import ATTR_BLOCK, EXPLICIT_ID, LINK, pandoc_anchor
+from tools_cache import digest
 from tools_config import BUILD_EPUB_DIR as DEFAULT_OUT
 from tools_config import ROOT
 from tools_markdown import Document
+from tools_repo import add_jobs_arg
 
 COVER = ROOT / "resources" / "static" / "cover.png"
 IMAGES_SRC = build_site.IMAGES_SRC
@@ -270,13 +279,45 @@ def find_svg_tool() -> str | None:
     return None
 
 
-def rasterize_svgs(img_map: dict[str, str],
-                   stage: Path) -> tuple[dict[str, str], list[str]]:
+def raster_key(tool: str, svg: bytes) -> str:
+    """The cache key for one diagram: its bytes plus the exact command.
+
+    The command template carries the tool, width, density, and flags, so
+    changing any of them, or switching tools, misses every entry.
+    """
+    return digest(svg, *svg_command(tool, Path("{src}"), Path("{dst}")))
+
+
+def convert_svg(tool: str, src: Path, dst: Path) -> bool:
+    """Rasterize `src` to `dst`, atomically. True if `dst` now exists.
+
+    The tool writes beside `dst` and the result is renamed into place, so
+    an interrupted build never leaves a truncated PNG behind to be served
+    as a hit.
+    """
+    tmp = dst.with_name(f"{dst.stem}.part.png")
+    proc = subprocess.run(svg_command(tool, src, tmp),
+                          capture_output=True, text=True,
+                          encoding="utf-8", errors="replace")
+    if proc.returncode != 0 or not tmp.is_file():
+        tmp.unlink(missing_ok=True)
+        return False
+    tmp.replace(dst)
+    return True
+
+
+def rasterize_svgs(img_map: dict[str, str], stage: Path, jobs: int = 1,
+                   use_cache: bool = True,
+                   ) -> tuple[dict[str, str], list[str]]:
     """Convert every SVG in `img_map` to a PNG under `stage`.
 
     Returns the map with those entries repointed at the PNGs, plus any
     notes for the caller to print. An SVG that cannot be converted stays
     an SVG, so the build never fails over a diagram.
+
+    Each PNG is kept under build/cache/svg-png/, named for `raster_key()`,
+    so a rebuild after a prose-only edit converts nothing. The misses run
+    concurrently: each is a separate process, so a thread pool only waits.
     """
     svgs = {stem: name for stem, name in img_map.items()
             if name.lower().endswith(".svg")}
@@ -291,20 +332,44 @@ def rasterize_svgs(img_map: dict[str, str],
         ]
 
     stage.mkdir(parents=True, exist_ok=True)
+    cache_dir = tools_cache.CACHE_DIR / "svg-png" if use_cache else stage
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    rasters: dict[str, Path] = {}
+    misses: dict[Path, Path] = {}
+    hits = 0
+    for stem, name in sorted(svgs.items()):
+        src = IMAGES_SRC / name
+        if use_cache:
+            key = raster_key(tool, src.read_bytes())
+            rasters[stem] = cache_dir / f"{key}.png"
+        else:
+            rasters[stem] = stage / f"{stem}.png"
+        if rasters[stem].is_file():
+            hits += 1
+        else:
+            # Identical diagrams share a key: convert it once.
+            misses.setdefault(rasters[stem], src)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        list(pool.map(lambda dst: convert_svg(tool, misses[dst], dst),
+                      misses))
+    seconds = time.perf_counter() - start
+
     out = dict(img_map)
     failed: list[str] = []
-    for stem, name in sorted(svgs.items()):
-        dst = stage / f"{stem}.png"
-        proc = subprocess.run(svg_command(tool, IMAGES_SRC / name, dst),
-                              capture_output=True, text=True,
-                              encoding="utf-8", errors="replace")
-        if proc.returncode != 0 or not dst.is_file():
-            failed.append(name)
+    for stem, raster in rasters.items():
+        if not raster.is_file():
+            failed.append(svgs[stem])
             continue
+        dst = stage / f"{stem}.png"
+        if raster != dst:
+            shutil.copyfile(raster, dst)
         out[stem] = dst.name
 
     notes = [f"Rasterized {len(svgs) - len(failed)} SVG diagram(s) to PNG "
-             f"with {tool}."]
+             f"with {tool}: {hits} cached, {len(misses)} converted "
+             f"in {seconds:.1f}s."]
     if failed:
         notes.append(f"WARNING: {len(failed)} SVG(s) could not be "
                      f"converted and stay SVG: {', '.join(sorted(failed))}")
@@ -582,7 +647,8 @@ def run_pandoc(src: Path, css: Path, meta: Path, epub: Path,
 
 
 def build(out_dir: Path, keep_source: bool = False,
-          keep_svg: bool = False) -> int:
+          keep_svg: bool = False, jobs: int = 1,
+          use_cache: bool = True) -> int:
     build_site.check_pandoc()
     chapters = build_site.discover()
     if not chapters:
@@ -596,7 +662,7 @@ def build(out_dir: Path, keep_source: bool = False,
 
     img_map = build_site.build_image_map()
     if not keep_svg:
-        img_map, notes = rasterize_svgs(img_map, images)
+        img_map, notes = rasterize_svgs(img_map, images, jobs, use_cache)
         for note in notes:
             print(note)
 
@@ -651,8 +717,12 @@ def main(argv: list[str] | None = None) -> int:
                     help="leave the generated pandoc input under <out>/src/")
     ap.add_argument("--keep-svg", action="store_true",
                     help="skip converting SVG diagrams to PNG")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="convert every SVG, ignoring build/cache/svg-png/")
+    add_jobs_arg(ap, "SVG diagrams")
     args = ap.parse_args(argv)
-    return build(args.out, args.keep_source, args.keep_svg)
+    return build(args.out, args.keep_source, args.keep_svg, args.jobs,
+                 not args.no_cache)
 
 
 if __name__ == "__main__":
@@ -15,24 +15,40 @@ Usage:
     python tools/build_site.py            # build into build/site/
     python tools/build_site.py -o DIR     # build somewhere else
     python tools/build_site.py --chapter-toc   # add a per-chapter TOC
+    python tools/build_site.py --force    # re-render every page
+    python tools/build_site.py -j 1       # one pandoc at a time
 
 Set CHAPTER_TOC below (or pass --chapter-toc / --no-chapter-toc) to give each
 chapter page its own table of contents listing that chapter's sections. The
 floating "Contents" link to the index is unaffected.
+
+A build is incremental. Each page's pandoc inputs (the rewritten chapter
+body, the template, the title, label and prev/next neighbors, the TOC
+setting, and the pandoc version) are hashed into build/cache/build_site.json,
+and a page whose hash and output file are both still there is not rendered
+again. The pages that do need pandoc render concurrently (-j, default all
+cores), since each is its own pandoc process. Images are copied only when
+missing or changed, and pages or images the book no longer produces are
+deleted, which is what the old wipe of the output directory was for.
+Pass --force to render every page regardless.
 """
 
 import argparse
+import os
 import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
 import search_index
+import tools_trace
+from tools_cache import JsonCache, cache_file, digest
 from tools_config import BUILD_SITE_DIR as DEFAULT_OUT
 from tools_config import ROOT
-from tools_repo import md_files
+from tools_repo import add_jobs_arg, md_files
 
 IMAGES_SRC = ROOT / "resources" / "images"
 STATIC_SRC = ROOT / "resources" / "static"
@@ -157,9 +173,16 @@ def check_pandoc() -> None:
                  "Install it: https://pandoc.org/installing.html")
 
 
-def render_chapter(body: str, ch: Chapter,
-                   prev: Chapter | None, nxt: Chapter | None,
-                   chapter_toc: bool = False) -> str:
+def pandoc_version() -> str:
+    """`pandoc --version`'s first line; a new pandoc can render differently."""
+    proc = subprocess.run(["pandoc", "--version"], capture_output=True,
+                          text=True, encoding="utf-8")
+    return (proc.stdout.splitlines() or [""])[0]
+
+
+def pandoc_command(ch: Chapter, prev: Chapter | None, nxt: Chapter | None,
+                   chapter_toc: bool = False) -> list[str]:
+    """The pandoc argv that renders `ch`, everything but its body."""
     variables = [
         f"--variable=title:{ch.title}",
         f"--variable=chapter-label:{ch.label}",
@@ -174,10 +197,20 @@ def render_chapter(body: str, ch: Chapter,
         variables += [f"--variable=next-url:{nxt.out_name}",
                       f"--variable=next-title:{nxt.title}"]
     toc_opts = ["--toc", f"--toc-depth={CHAPTER_TOC_DEPTH}"] if chapter_toc else []
-    proc = subprocess.run(
-        ["pandoc", "--template", str(TEMPLATE), "--from", "markdown+smart",
-         "--highlight-style", "pygments", *toc_opts, *variables],
-        input=body, capture_output=True, text=True, encoding="utf-8",
+    return ["pandoc", "--template", str(TEMPLATE), "--from", "markdown+smart",
+            "--highlight-style", "pygments", *toc_opts, *variables]
+
+
+def render_chapter(body: str, ch: Chapter,
+                   prev: Chapter | None, nxt: Chapter | None,
+                   chapter_toc: bool = False) -> str:
+    proc = tools_trace.run(
+        pandoc_command(ch, prev, nxt, chapter_toc),
+        name=f"pandoc {ch.md.name}",
+        input=body,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
     )
     if proc.returncode != 0:
         sys.exit(f"pandoc failed on {ch.md.name}:\n{proc.stderr}")
@@ -289,10 +322,22 @@ figcaption {{ font-family: '{HEADING_FONT}', sans-serif;
 # --------------------------------------------------------------------------- #
 # Driver
 # --------------------------------------------------------------------------- #
-def write_page(ch: Chapter, chapters: list[Chapter], out_dir: Path,
-               img_map: dict[str, str], missing: set[str],
-               chapter_toc: bool) -> set[str]:
-    """Render one chapter into out_dir; return the images it references."""
+@dataclass
+class Page:
+    """One chapter page, prepared for pandoc but not yet rendered."""
+
+    ch: Chapter
+    body: str
+    """The chapter body, images and .md links already rewritten."""
+
+    prev: Chapter | None
+    nxt: Chapter | None
+    used: set[str]
+    """The image names the body references."""
+
+
+def prepare_page(ch: Chapter, chapters: list[Chapter],
+                 img_map: dict[str, str], missing: set[str]) -> Page:
     i = chapters.index(ch)
     prev = chapters[i - 1] if i > 0 else None
     nxt = chapters[i + 1] if i + 1 < len(chapters) else None
@@ -300,9 +345,94 @@ def write_page(ch: Chapter, chapters: list[Chapter], out_dir: Path,
     used = {m.group(2) for m in IMG_REF.finditer(body)}
     body = rewrite_images(body, img_map, missing)
     body = rewrite_md_links(body)
-    page = render_chapter(body, ch, prev, nxt, chapter_toc)
-    (out_dir / ch.out_name).write_text(page, encoding="utf-8")
-    return used
+    return Page(ch, body, prev, nxt, used)
+
+
+def page_key(page: Page, chapter_toc: bool, salt: str) -> str:
+    """A hash of everything pandoc sees when rendering `page`.
+
+    The argv carries the title, label, neighbors and TOC setting; `salt`
+    carries the template and pandoc's version.
+    """
+    argv = pandoc_command(page.ch, page.prev, page.nxt, chapter_toc)
+    return digest(salt, "\0".join(argv), page.body)
+
+
+def render_salt() -> str:
+    """What every page's rendering depends on beyond its own inputs."""
+    return digest(TEMPLATE.read_text(encoding="utf-8"), pandoc_version())
+
+
+def write_pages(pages: list[Page], out_dir: Path, chapter_toc: bool,
+                jobs: int, force: bool = False) -> int:
+    """Render the pages whose inputs changed, concurrently. Returns how many.
+
+    A page is skipped when the hash of its inputs matches the one recorded
+    for its output file and that file still exists. Rendering runs in a
+    thread pool: each page is a separate pandoc process, so the threads
+    only wait.
+    """
+    store = JsonCache(cache_file("build_site"))
+    salt = render_salt()
+    stale: list[tuple[Page, Path, str]] = []
+    for page in pages:
+        dest = out_dir / page.ch.out_name
+        key = page_key(page, chapter_toc, salt)
+        fresh = dest.exists() and store.data.get(str(dest.resolve())) == key
+        if force or not fresh:
+            stale.append((page, dest, key))
+
+    def render(dest: Path, page: Page) -> None:
+        html = render_chapter(page.body, page.ch, page.prev, page.nxt,
+                              chapter_toc)
+        dest.write_text(html, encoding="utf-8")
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        list(pool.map(tools_trace.traced(render, "build_site"),
+                      [dest for _, dest, _ in stale],
+                      [page for page, _, _ in stale]))
+    for _, dest, key in stale:
+        store.data[str(dest.resolve())] = key
+    store.save()
+    return len(stale)
+
+
+def same_file(src: Path, dest: Path) -> bool:
+    """Whether `dest` is an unchanged copy2() of `src` (size and mtime)."""
+    try:
+        a, b = src.stat(), dest.stat()
+    except FileNotFoundError:
+        return False
+    return a.st_size == b.st_size and int(a.st_mtime) == int(b.st_mtime)
+
+
+def copy_if_changed(src: Path, dest: Path) -> bool:
+    """copy2() `src` to `dest` unless it is already there. True if copied."""
+    if same_file(src, dest):
+        return False
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dest)
+    return True
+
+
+def remove_strays(out_dir: Path, pages: set[str], images: set[str]) -> int:
+    """Delete chapter pages and images the book no longer produces.
+
+    Replaces wiping out_dir before each build: a renamed chapter or a
+    dropped figure must not linger in the site. Returns how many went.
+    """
+    removed = 0
+    for html in out_dir.glob("*.html"):
+        if html.name != "index.html" and html.name not in pages:
+            html.unlink()
+            removed += 1
+    images_out = out_dir / "images"
+    if images_out.is_dir():
+        for image in images_out.iterdir():
+            if image.name not in images:
+                image.unlink()
+                removed += 1
+    return removed
 
 
 def write_shared(chapters: list[Chapter], out_dir: Path) -> int:
@@ -333,53 +463,55 @@ def rebuild_chapter(md: Path, out_dir: Path,
     if ch is None:
         return False
     img_map = build_image_map()
-    used = write_page(ch, chapters, out_dir, img_map, set(), chapter_toc)
-    images_out = out_dir / "images"
-    for name in sorted(used):
+    page = prepare_page(ch, chapters, img_map, set())
+    write_pages([page], out_dir, chapter_toc, jobs=1)
+    for name in sorted(page.used):
         filename = img_map.get(name)
-        if filename and not (images_out / filename).exists():
-            images_out.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(IMAGES_SRC / filename, images_out / filename)
+        if filename:
+            copy_if_changed(IMAGES_SRC / filename,
+                            out_dir / "images" / filename)
     write_shared(chapters, out_dir)
     return True
 
 
-def build(out_dir: Path, chapter_toc: bool = CHAPTER_TOC) -> int:
+def build(out_dir: Path, chapter_toc: bool = CHAPTER_TOC,
+          jobs: int | None = None, force: bool = False) -> int:
     check_pandoc()
     if not TEMPLATE.exists():
         sys.exit(f"error: template not found at {TEMPLATE}")
     chapters = discover()
     img_map = build_image_map()
+    out_dir.mkdir(parents=True, exist_ok=True)
 
-    if out_dir.exists():
-        shutil.rmtree(out_dir)
-    images_out = out_dir / "images"
-    images_out.mkdir(parents=True)
-
-    used_images: set[str] = set()
     missing: set[str] = set()
-
-    for ch in chapters:
-        used_images |= write_page(ch, chapters, out_dir, img_map, missing,
-                                  chapter_toc)
+    with tools_trace.span("prepare pages"):
+        pages = [prepare_page(ch, chapters, img_map, missing)
+                 for ch in chapters]
+    with tools_trace.span("render pages"):
+        rendered = write_pages(pages, out_dir, chapter_toc,
+                               jobs or os.process_cpu_count() or 1, force)
+    used_images = set().union(*(page.used for page in pages))
 
     (out_dir / "style.css").write_text(render_css(), encoding="utf-8")
 
-    sections = write_shared(chapters, out_dir)
+    with tools_trace.span("index and search index"):
+        sections = write_shared(chapters, out_dir)
     for name in ("search.css", "search.js"):
-        shutil.copy2(STATIC_SRC / name, out_dir / name)
+        copy_if_changed(STATIC_SRC / name, out_dir / name)
 
-    copied = 0
-    for name in sorted(used_images):
-        filename = img_map.get(name)
-        if filename:
-            shutil.copy2(IMAGES_SRC / filename, images_out / filename)
-            copied += 1
+    wanted = {img_map[name] for name in used_images if name in img_map}
+    copied = sum(
+        copy_if_changed(IMAGES_SRC / filename, out_dir / "images" / filename)
+        for filename in sorted(wanted)
+    )
+    removed = remove_strays(out_dir, {ch.out_name for ch in chapters}, wanted)
     if (STATIC_SRC / "favicon.ico").exists():
-        shutil.copy2(STATIC_SRC / "favicon.ico", out_dir / "favicon.ico")
+        copy_if_changed(STATIC_SRC / "favicon.ico", out_dir / "favicon.ico")
 
-    print(f"Built {len(chapters)} pages + index into {out_dir}")
-    print(f"Copied {copied} image(s).")
+    print(f"Built {len(chapters)} pages + index into {out_dir} "
+          f"({rendered} rendered, {len(chapters) - rendered} unchanged).")
+    print(f"Copied {copied} image(s)"
+          + (f", removed {removed} stale file(s)." if removed else "."))
     print(f"Indexed {sections} sections for search "
           f"({(out_dir / search_index.INDEX_NAME).stat().st_size / 1024:.0f}"
           " KB).")
@@ -401,8 +533,12 @@ def main(argv: list[str] | None = None) -> int:
                     default=CHAPTER_TOC,
                     help="add a per-chapter table of contents to each page "
                          f"(default: {CHAPTER_TOC})")
+    ap.add_argument("--force", action="store_true",
+                    help="render every page, even ones whose inputs are "
+                         "unchanged")
+    add_jobs_arg(ap, "pages")
     args = ap.parse_args(argv)
-    return build(args.out, args.chapter_toc)
+    return build(args.out, args.chapter_toc, args.jobs, args.force)
 
 
 if __name__ == "__main__":
@@ -26,15 +26,23 @@ second, nearly all of it interpreter startup, so a process pool would
 cost more than it saves. validate_output.py is the tool that needed
 parallelism, because it *runs* the book rather than reading it.
 
+Parsing is cheap to begin with, and Document.parse() keeps its results in
+build/cache/documents/ so unchanged chapters are not even re-parsed. What
+remains is the checks themselves, and --profile says which of those the
+time goes to: one line per check plus one for the parse, slowest first,
+printed after the findings.
+
 Usage:
     python tools/check_all.py                    # every check, Chapters/
     python tools/check_all.py --list             # names and descriptions
     python tools/check_all.py listings banned    # only these
     python tools/check_all.py --fix              # apply what can be fixed
     python tools/check_all.py Solutions/         # a different tree
+    python tools/check_all.py --profile          # time each check
 """
 
 import argparse
+import time
 from collections.abc import Iterable
 
 import banned_phrases
@@ -78,12 +86,35 @@ def select(names: list[str]) -> list[Check]:
     return [known[n] for n in names]
 
 
-def run(checks: Iterable[Check], docs: Iterable[Document]) -> list[Finding]:
-    """Every finding from every check, sorted into reading order."""
-    findings = [f for doc in docs for check in checks for f in check.run(doc)]
+def run(
+    checks: Iterable[Check], docs: Iterable[Document],
+    timings: dict[str, float] | None = None,
+) -> list[Finding]:
+    """Every finding from every check, sorted into reading order.
+
+    With `timings`, each check's total time across all documents is
+    added to it under the check's name.
+    """
+    findings: list[Finding] = []
+    for doc in docs:
+        for check in checks:
+            start = time.perf_counter()
+            findings.extend(check.run(doc))
+            if timings is not None:
+                timings[check.name] = (timings.get(check.name, 0.0)
+                                       + time.perf_counter() - start)
     return sorted(findings, key=lambda f: (str(f.path), f.line, f.col or 0))
 
 
+def print_profile(timings: dict[str, float]) -> None:
+    """The --profile table: each timed step, slowest first."""
+    width = max(len(name) for name in timings)
+    total = sum(timings.values())
+    print(f"\nProfile ({total * 1000:.0f} ms):")
+    for name, seconds in sorted(timings.items(), key=lambda kv: -kv[1]):
+        print(f"  {name:<{width}}  {seconds * 1000:7.1f} ms")
+
+
 def apply_fixes(checks: list[Check], docs: list[Document]) -> int:
     """Rewrite what the fixable checks can fix. Returns files changed.
 
@@ -122,6 +153,8 @@ def main(argv: list[str] | None = None) -> int:
                     help="list the checks and exit")
     ap.add_argument("--fix", action="store_true",
                     help="apply every fix the selected checks can make")
+    ap.add_argument("--profile", action="store_true",
+                    help="print the time spent parsing and in each check")
     args = ap.parse_args(argv)
 
     if args.list:
@@ -133,22 +166,27 @@ def main(argv: list[str] | None = None) -> int:
 
     checks = select(args.names)
     paths = md_files(args.paths)
+    start = time.perf_counter()
     docs = [Document.parse(p) for p in paths]
+    timings = {"(parse)": time.perf_counter() - start}
 
     if args.fix:
         changed = apply_fixes(checks, docs)
         print(f"{changed} file(s) rewritten.")
         return 0
 
-    findings = run(checks, docs)
+    findings = run(checks, docs, timings if args.profile else None)
     for finding in findings:
         print(finding.format())
     if findings:
         print(f"\n{len(findings)} issue(s) in {len(paths)} file(s) "
               f"from {len(checks)} check(s).")
-        return 1
-    print(f"All {len(checks)} check(s) clean across {len(paths)} file(s).")
-    return 0
+    else:
+        print(f"All {len(checks)} check(s) clean across {len(paths)} "
+              "file(s).")
+    if args.profile:
+        print_profile(timings)
+    return 1 if findings else 0
 
 
 if __name__ == "__main__":
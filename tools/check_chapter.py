@@ -8,42 +8,66 @@ This runs the same checks a code example must pass, scoped to one chapter:
 
     make check-ch CH=12          # or CH=12_Data_Classes_as_Types
 
-The steps, in order:
-
-1. ``extract_examples.py --write`` rebuilds ``build/examples/`` from the
-   Markdown. This is whole-book (and cheap), because a chapter's listings
-   import their siblings and the tree has to be consistent.
-2. ``validate_output.py --update`` on this chapter alone, refreshing
-   its ``#:`` markers. This is the step the full gate spends its time on,
-   and the one worth narrowing.
-3. The Markdown-level listing gates: blank-line density, comment periods,
-   comment spacing, comment capitalization. Hand-editing a listing is what
-   trips these, so they belong in an edit-loop check.
-4. ``ty``, ``ruff``, and ``pytest`` over this chapter's extracted directory.
-
-Only ``capitalize_comments.py`` still reads the whole book, since it takes
-no path argument; it is fast enough not to matter.
+It is one process, plus the tools it cannot be: ty, ruff, pytest, and the
+interpreter validate_output.py runs the listings in. The steps:
+
+1. Extract. The book is parsed once, in process, and the result written
+   three ways: ``build/examples/`` and the committed ``Examples/`` brought
+   up to date (only changed files are written), and this chapter's files
+   plus the shared import roots (``utils/``, and any chapter directory
+   pyproject.toml gives ty) copied into a temporary tree under
+   ``build/``. The
+   checks below run against that tree, so nothing else writing to
+   ``build/examples/`` can change what they see.
+2. The Markdown-level listing gates, on the one parsed chapter: blank-line
+   density, comment periods, comment spacing, comment capitalization.
+   Hand-editing a listing is what trips these, so they belong in an
+   edit-loop check. They run before step 3, which may rewrite the file.
+3. All at once: ``validate_output.py --update`` on this chapter, refreshing
+   its ``#:`` markers (the step the full gate spends its time on), and
+   ``ty``, ``ruff``, and ``pytest`` over the chapter's directory. Each
+   result is printed the moment it finishes. The tools run from the
+   virtual environment directly, skipping ``uv run``'s startup, and fall
+   back on ``uv run`` where the environment has no such binary. pytest
+   shares ``make test``'s record of passes (see pytest_examples.py): if
+   this chapter's tests passed and nothing they read has changed since,
+   they are not run again, and a pass here counts for ``make test`` too.
 
 Step 1 is fail-fast: nothing downstream means anything against a tree that
 would not build. The rest all run even after one fails, so a single pass
 reports every problem instead of making you rediscover them one at a time.
 
-A prose-only chapter (no extracted directory) skips steps 4 and reports so.
+A prose-only chapter (no extracted directory) skips ty, ruff, and pytest,
+and a chapter with no ``test_*.py`` listings skips pytest, reporting so.
 """
 
 import argparse
+import json
+import shutil
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any
 
-from tools_config import CHAPTERS_DIR, EXAMPLES_TREE, ROOT
-from tools_repo import run_capture
+import capitalize_comments
+import comment_periods
+import comment_spacing
+import listing_format
+from extract_examples import COMMITTED_DIR, extract, write_tree_incremental
+from pytest_examples import directory_key
+from tools_cache import JsonCache, cache_file
+from tools_config import BUILD_DIR, CHAPTERS_DIR, EXAMPLES_TREE, ROOT
+from tools_extract import ExtractResult, report_conflicts, write_changed
+from tools_markdown import Document
+from tools_repo import ty_extra_paths, ty_settings, write_text_lf
 
-PY = [sys.executable]
 NO_TESTS_COLLECTED = 5  # pytest's exit code for an empty directory
-# Generous: a chapter of asyncio examples takes seconds, not the 30 that
-# run_capture defaults to for a version probe.
-MARKER_TIMEOUT = 300
+# The Markdown gates run on the parsed chapter, in this order.
+LISTING_CHECKS = [listing_format.CHECK, comment_periods.CHECK,
+                  comment_spacing.CHECK, capitalize_comments.CHECK]
 
 
 def resolve(selector: str) -> Path:
@@ -61,14 +85,128 @@ def resolve(selector: str) -> Path:
     return matches[0]
 
 
-def run(label: str, command: list[str], ok: tuple[int, ...] = (0,)) -> bool:
-    proc = subprocess.run(command, cwd=ROOT)
-    passed = proc.returncode in ok
-    print(f"{'ok  ' if passed else 'FAIL'}  {label}")
-    return passed
+def tool(name: str) -> list[str]:
+    """The command for a dev tool: the venv's own binary, else `uv run`."""
+    found = shutil.which(name, path=str(Path(sys.executable).parent))
+    return [found] if found else ["uv", "run", name]
+
+
+def status(label: str, passed: bool, seconds: float | None = None) -> None:
+    took = "" if seconds is None else f" ({seconds:.2f}s)"
+    print(f"{'ok  ' if passed else 'FAIL'}  {label}{took}", flush=True)
+
+
+def shared_roots() -> list[str]:
+    """The directories of the tree every chapter can import from.
+
+    utils/, and any chapter directory pyproject.toml hands ty as an import
+    root (chapter 6's, for its package), as tree-relative names.
+    """
+    return [path.relative_to(EXAMPLES_TREE).as_posix()
+            for path in ty_extra_paths()
+            if path.is_relative_to(EXAMPLES_TREE)]
+
+
+def chapter_tree(result: ExtractResult, chapter: str, root: Path,
+                 shared: list[str] | None = None) -> bool:
+    """Write `chapter`'s files and the `shared` roots under `root`.
+
+    True if the chapter has any files of its own. `shared` defaults to
+    just utils/.
+    """
+    prefixes = tuple(f"{name}/" for name in (shared or ["utils"]))
+    mine = False
+    for rel, file in result.files.items():
+        if rel.startswith(f"{chapter}/"):
+            mine = True
+        elif not rel.startswith(prefixes):
+            continue
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_text_lf(path, file.content)
+    return mine
+
+
+def test_keys(tree: Path, chapter: str) -> dict[str, str]:
+    """Each test folder's `make test` record name, to its key in `tree`."""
+    folders = {p.parent for p in (tree / chapter).rglob("test_*.py")}
+    return {str(EXAMPLES_TREE.resolve() / f.relative_to(tree)):
+            directory_key(f, tree) for f in folders}
+
 
+def check_listings(md: Path) -> list[bool]:
+    """The Markdown listing gates, on one parse of the chapter."""
+    doc = Document.parse(md)
+    results = []
+    for check in LISTING_CHECKS:
+        findings = list(check.run(doc))
+        status(check.name, not findings)
+        for finding in findings:
+            print(f"      {finding.format()}")
+        results.append(not findings)
+    return results
 
-def run_markers(md: Path) -> bool:
+
+def shown(output: str, tree: Path) -> str:
+    """`output` naming build/examples/ files instead of the temp copies."""
+    for alias in (str(tree), tree.relative_to(ROOT).as_posix()):
+        output = output.replace(alias, EXAMPLES_TREE.relative_to(ROOT)
+                                .as_posix())
+    return output
+
+
+def toml_lines(table: dict[str, Any], name: str = "") -> list[str]:
+    """`table` as TOML: scalars and lists inline, tables as headers."""
+    lines = [f"[{name}]"] if name else []
+    nested: list[tuple[str, Any]] = []
+    for key, value in table.items():
+        if isinstance(value, dict):
+            nested.append((key, value))
+        elif isinstance(value, list) and value and isinstance(value[0], dict):
+            nested += [(key, [item]) for item in value]
+        else:
+            lines.append(f"{json.dumps(key)} = {json.dumps(value)}")
+    for key, value in nested:
+        path = f"{name}.{json.dumps(key)}" if name else json.dumps(key)
+        if isinstance(value, list):
+            lines += [f"[[{path}]]", *toml_lines(value[0], path)[1:]]
+        else:
+            lines += toml_lines(value, path)
+    return lines
+
+
+def ty_command(tree: Path, chapter: str) -> list[str]:
+    """ty over the temp tree, with pyproject's import roots moved into it.
+
+    pyproject.toml names its roots under build/examples/. Left as they are,
+    they resolve a listing's imports against the other copy, and ty cannot
+    place a package's relative import (chapter 6's module4.py) at all: it
+    takes a file's package from the first root holding that module. A -c
+    override adds to the list rather than replacing it, so the [tool.ty]
+    table is written out whole, roots moved, as the temp tree's ty.toml.
+    """
+    settings = ty_settings()
+    settings["environment"]["extra-paths"] = [
+        str(tree / path.relative_to(EXAMPLES_TREE))
+        if path.is_relative_to(EXAMPLES_TREE) else str(path)
+        for path in ty_extra_paths()]
+    config = tree / "ty.toml"
+    write_text_lf(config, "\n".join(toml_lines(settings)) + "\n")
+    return [*tool("ty"), "check", "--config-file", str(config),
+            str(tree / chapter)]
+
+
+def run_tool(command: list[str], ok: tuple[int, ...] = (0,),
+             ) -> tuple[bool, str, float]:
+    """(passed, everything it printed, seconds), for a worker thread."""
+    start = time.perf_counter()
+    proc = subprocess.run(command, cwd=ROOT, capture_output=True, text=True,
+                          stdin=subprocess.DEVNULL)
+    return (proc.returncode in ok, proc.stdout + proc.stderr,
+            time.perf_counter() - start)
+
+
+def run_markers(md: Path, tree: Path) -> tuple[bool, str, float]:
     """Refresh this chapter's `#:` markers, the way `gate` does.
 
     `gate` runs validate_output.py with --update, so a stale marker
@@ -85,21 +223,15 @@ def run_markers(md: Path) -> bool:
     every run and teach you to ignore it.
     """
     before = md.read_bytes()
-    result = run_capture(
-        [*PY, "tools/validate_output.py", "--update", str(md)],
-        timeout=MARKER_TIMEOUT)
-    if result is None:
-        print("FAIL  output markers (validate_output.py would not start)")
-        return False
-    report, code = result
-    passed = code == 0
-    print(f"{'ok  ' if passed else 'FAIL'}  output markers")
-    if not passed:
-        print(report.strip())
-    elif md.read_bytes() != before:
-        print("      Markers were rewritten. Check `git diff Chapters/`,")
-        print("      especially any marker that depends on timing.")
-    return passed
+    passed, report, seconds = run_tool(
+        [sys.executable, "tools/validate_output.py", "--update",
+         "--tree", str(tree), str(md)])
+    if passed:
+        report = ""
+        if md.read_bytes() != before:
+            report = ("Markers were rewritten. Check `git diff Chapters/`,\n"
+                      "especially any marker that depends on timing.")
+    return passed, report, seconds
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -108,43 +240,64 @@ def main(argv: list[str] | None = None) -> int:
                     help="chapter number or stem prefix, e.g. 12")
     args = ap.parse_args(argv)
 
+    start = time.perf_counter()
     md = resolve(args.chapter)
-    chapter_dir = EXAMPLES_TREE / md.stem
     print(f"Checking {md.name}\n")
 
-    if not run("extract", [*PY, "tools/extract_examples.py", "--write"]):
+    result = extract()
+    report_conflicts(result)
+    if result.conflicts:
+        status("extract", False)
         return 1
+    write_tree_incremental(result, EXAMPLES_TREE)
     # Also refresh the committed Examples/ tree. Without this an editing
     # session leaves it behind the Markdown, and the drift shows up much
     # later as a `gate` failure about a file you no longer remember.
-    if not run("sync",
-               [*PY, "tools/extract_examples.py", "--write", "-o",
-                "Examples"]):
-        return 1
+    write_changed(result, COMMITTED_DIR)
+    status("extract and sync", True, time.perf_counter() - start)
+
+    results = check_listings(md)
 
-    results = [
-        True, True,  # extract and sync, already known to have passed
-        run_markers(md),
-        run("listing format", [*PY, "tools/listing_format.py", str(md)]),
-        run("comment periods", [*PY, "tools/comment_periods.py", str(md)]),
-        run("comment spacing", [*PY, "tools/comment_spacing.py", str(md)]),
-        run("comment caps", [*PY, "tools/capitalize_comments.py"]),
-    ]
-
-    if chapter_dir.is_dir():
-        target = str(chapter_dir)
-        results += [
-            run("ty", ["uv", "run", "ty", "check", target]),
-            run("ruff", ["uv", "run", "ruff", "check", target]),
-            run("pytest",
-                ["uv", "run", "pytest", "-q", target],
-                ok=(0, NO_TESTS_COLLECTED)),
-        ]
-    else:
-        print(f"skip  ty/ruff/pytest ({md.stem} extracts no examples)")
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="check-ch-",
+                                     dir=BUILD_DIR) as tmp, \
+            ThreadPoolExecutor(max_workers=4) as pool:
+        tree = Path(tmp)
+        has_examples = chapter_tree(result, md.stem, tree, shared_roots())
+        target = str(tree / md.stem)
+        passes = JsonCache(cache_file(f"pytest_{EXAMPLES_TREE.name}"))
+        keys = test_keys(tree, md.stem)
+        jobs: dict[Future[tuple[bool, str, float]], str] = {
+            pool.submit(run_markers, md, tree): "output markers",
+        }
+        if not has_examples:
+            print(f"skip  ty/ruff/pytest ({md.stem} extracts no examples)")
+        else:
+            jobs[pool.submit(run_tool, ty_command(tree, md.stem))] = "ty"
+            jobs[pool.submit(run_tool,
+                             [*tool("ruff"), "check", target])] = "ruff"
+            if not keys:
+                print(f"skip  pytest ({md.stem} has no tests)")
+            elif all(passes.data.get(f) == k for f, k in keys.items()):
+                print("ok    pytest (passed before, nothing it reads changed)")
+            else:
+                jobs[pool.submit(
+                    run_tool, [sys.executable, "-m", "pytest", "-q", target],
+                    (0, NO_TESTS_COLLECTED))] = "pytest"
+        for future in as_completed(jobs):
+            passed, output, seconds = future.result()
+            status(jobs[future], passed, seconds)
+            if output.strip() and (not passed
+                                   or jobs[future] == "output markers"):
+                print(shown(output.strip(), tree))
+            results.append(passed)
+            if jobs[future] == "pytest" and passed:
+                passes.data.update(keys)
+                passes.save()
 
     failed = results.count(False)
-    print(f"\n{len(results) - failed} passed, {failed} failed")
+    print(f"\n{len(results) - failed} passed, {failed} failed "
+          f"in {time.perf_counter() - start:.2f}s")
     if failed:
         print("Run `make gate` before committing: this checks one chapter,"
               " not the book.")
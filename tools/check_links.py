@@ -3,9 +3,24 @@
 
 Collects each unique ``http(s)://`` URL from the given Markdown files
 (default: all of ``Chapters/``), then requests each one and reports any
-that fail: connection errors, timeouts, and HTTP status >= 400. A HEAD
-request is tried first; servers that reject HEAD (405/403 or an error)
-get one GET retry, since many sites treat HEAD differently.
+that fail: connection errors, timeouts, and HTTP status >= 400 once
+redirects are followed. A HEAD request is tried first; servers that
+reject HEAD (405/403 or an error) get one GET retry, since many sites
+treat HEAD differently.
+
+The requests run on asyncio over a small HTTP/1.1 client of its own, so
+each host's connection is kept alive and reused rather than opened per
+URL (a TLS handshake costs more than most HEAD requests), and no more
+than ``--per-host`` requests are in flight to one host at a time, which
+keeps a big site (docs.python.org has dozens of links) from rate-limiting
+the run. The timeout covers connecting and the exchange itself, not time
+spent waiting for a free slot to that host, so a long queue for one busy
+site does not turn its links into timeouts. ``http_proxy``,
+``https_proxy`` and ``no_proxy`` are honored as urllib honors them: plain
+HTTP goes to the proxy as an absolute URL, HTTPS through a ``CONNECT``
+tunnel. A passing result is remembered under ``build/cache/`` for
+``--ttl`` days; a failing one is always tried again, so a repeat run
+costs only the stale and the broken.
 
 This check is advisory and deliberately not part of ``make verify``.
 The network is flaky, sites rate-limit, and a dead external link should
@@ -17,20 +32,32 @@ Usage:
     python tools/check_links.py                # scan Chapters/
     python tools/check_links.py path ...       # scan specific files/dirs
     python tools/check_links.py --timeout 20   # slow-site tolerance
+    python tools/check_links.py --no-cache     # recheck every URL
 """
 
 import argparse
+import asyncio
+import base64
 import re
-import urllib.error
-import urllib.request
-from concurrent.futures import ThreadPoolExecutor
+import ssl
+import time
 from pathlib import Path
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
 
+from tools_cache import JsonCache, cache_file
 from tools_repo import add_paths_arg, md_files
 
 URL_RE = re.compile(r"https?://[^\s)\]>\"'`]+")
 # Some hosts refuse requests without a browser-ish User-Agent.
 HEADERS = {"User-Agent": "Mozilla/5.0 (ThinkingInPython link check)"}
+MAX_REDIRECTS = 10
+# Requests in flight across all hosts, as the thread pool this replaced.
+MAX_IN_FLIGHT = 16
+# A GET body larger than this is not drained to keep the connection: the
+# connection is closed instead, which is cheaper than reading it.
+MAX_DRAIN = 1 << 20
+DAY = 24 * 60 * 60
 
 
 def find_urls(files: list[Path]) -> dict[str, list[str]]:
@@ -56,24 +83,256 @@ def find_urls(files: list[Path]) -> dict[str, list[str]]:
     return found
 
 
-def probe(url: str, timeout: float) -> str | None:
+# ── a keep-alive HTTP/1.1 client ──────────────────────────────────────────────
+
+type Origin = tuple[str, str, int]   # scheme, host, port
+type Stream = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+# A proxy's host and port, and the headers it wants (Proxy-Authorization).
+type Proxy = tuple[str, int, dict[str, str]]
+
+
+class TooManyRedirects(Exception):
+    pass
+
+
+def find_proxy(scheme: str, host: str) -> Proxy | None:
+    """The proxy the environment names for `scheme`, unless `host` bypasses."""
+    url = getproxies().get(scheme)
+    if not url or proxy_bypass(host):
+        return None
+    parts = urlsplit(url if "://" in url else f"http://{url}")
+    headers = {}
+    if parts.username is not None:
+        user = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = (
+            "Basic " + base64.b64encode(user.encode()).decode("ascii"))
+    return parts.hostname or "", parts.port or 80, headers
+
+
+class Pool:
+    """Idle keep-alive connections and an in-flight limit, per origin.
+
+    A request holds its origin's slot first and one of the MAX_IN_FLIGHT
+    global slots second, so a queue for one slow host holds no global
+    slot while it waits.
+    """
+
+    def __init__(self, per_host: int) -> None:
+        self.per_host = per_host
+        self.idle: dict[Origin, list[Stream]] = {}
+        self.limits: dict[Origin, asyncio.Semaphore] = {}
+        self.in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+        self.proxies: dict[Origin, Proxy | None] = {}
+        self.opened = 0
+        self.tls = ssl.create_default_context()
+
+    def limit(self, origin: Origin) -> asyncio.Semaphore:
+        return self.limits.setdefault(
+            origin, asyncio.Semaphore(self.per_host))
+
+    def proxy(self, origin: Origin) -> Proxy | None:
+        if origin not in self.proxies:
+            self.proxies[origin] = find_proxy(origin[0], origin[1])
+        return self.proxies[origin]
+
+    async def connect(self, origin: Origin) -> tuple[Stream, bool]:
+        """An idle connection to `origin` if there is one, else a new one.
+
+        The flag says whether it was reused: a reused connection the
+        server has since closed is worth one retry on a fresh one.
+        """
+        idle = self.idle.get(origin)
+        if idle:
+            return idle.pop(), True
+        scheme, host, port = origin
+        proxy = self.proxy(origin)
+        if proxy is None:
+            stream = await asyncio.open_connection(
+                host, port, ssl=self.tls if scheme == "https" else None)
+        else:
+            stream = await asyncio.open_connection(proxy[0], proxy[1])
+            if scheme == "https":
+                await self.tunnel(stream, host, port, proxy[2])
+        self.opened += 1
+        return stream, False
+
+    async def tunnel(self, stream: Stream, host: str, port: int,
+                     headers: dict[str, str]) -> None:
+        """Turn a proxy connection into TLS to `host` with CONNECT."""
+        reader, writer = stream
+        lines = [f"CONNECT {host}:{port} HTTP/1.1", f"Host: {host}:{port}",
+                 *(f"{k}: {v}" for k, v in headers.items())]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        status = int(head.split()[1])
+        if status != 200:
+            writer.close()
+            raise ConnectionRefusedError(f"proxy CONNECT answered {status}")
+        await writer.start_tls(self.tls, server_hostname=host)
+
+    def release(self, origin: Origin, stream: Stream, reuse: bool) -> None:
+        if reuse:
+            self.idle.setdefault(origin, []).append(stream)
+        else:
+            stream[1].close()
+
+    def close(self) -> None:
+        for streams in self.idle.values():
+            for _, writer in streams:
+                writer.close()
+        self.idle.clear()
+
+
+async def read_body(reader: asyncio.StreamReader,
+                    headers: dict[str, str]) -> bool:
+    """Consume a response body. True if the connection can be reused."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        drained = 0
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            drained += size
+            if drained > MAX_DRAIN:
+                return False
+            await reader.readexactly(size + 2)
+            if size == 0:
+                return True
+    if "content-length" in headers:
+        length = int(headers["content-length"])
+        if length > MAX_DRAIN:
+            return False
+        await reader.readexactly(length)
+        return True
+    return False   # delimited by close
+
+
+async def exchange(stream: Stream, method: str, host: str, target: str,
+                   extra: dict[str, str],
+                   ) -> tuple[int, dict[str, str], bool]:
+    """One request/response. Returns status, headers, and reusability."""
+    reader, writer = stream
+    lines = [f"{method} {target} HTTP/1.1", f"Host: {host}",
+             *(f"{k}: {v}" for k, v in (HEADERS | extra).items()),
+             "Accept: */*", "Connection: keep-alive"]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+    while True:
+        head = await reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split()[1])
+        if not 100 <= status < 200:
+            break   # an interim 1xx response is followed by the real one
+    headers: dict[str, str] = {}
+    for line in header_lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    reuse = headers.get("connection", "").lower() != "close"
+    if method != "HEAD" and status not in (204, 304):
+        reuse = await read_body(reader, headers) and reuse
+    return status, headers, reuse
+
+
+async def send(pool: Pool, origin: Origin, method: str, authority: str,
+               target: str) -> tuple[int, dict[str, str]]:
+    """One request on a pooled connection, retried past stale idle ones."""
+    extra: dict[str, str] = {}
+    proxy = pool.proxy(origin)
+    if proxy is not None and origin[0] == "http":
+        # A forward proxy takes the absolute URL, and its own credentials.
+        target = f"http://{authority}{target}"
+        extra = proxy[2]
+    while True:
+        stream, reused = await pool.connect(origin)
+        try:
+            status, headers, reuse = await exchange(
+                stream, method, authority, target, extra)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            stream[1].close()
+            if reused:
+                continue   # the server dropped an idle connection
+            raise
+        except BaseException:
+            stream[1].close()
+            raise
+        pool.release(origin, stream, reuse)
+        return status, headers
+
+
+async def request(pool: Pool, method: str, url: str, timeout: float) -> int:
+    """The final status of `url`, following redirects.
+
+    Each hop waits for its host's slot, then a global one, before its
+    `timeout` starts: only connecting and the exchange count against it.
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        origin = (scheme, host, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query
+                                        else "")
+        authority = host if parts.port is None else f"{host}:{port}"
+        async with pool.limit(origin), pool.in_flight:
+            status, headers = await asyncio.wait_for(
+                send(pool, origin, method, authority, target), timeout)
+        location = headers.get("location")
+        if status in (301, 302, 303, 307, 308) and location:
+            url = urljoin(url, location)
+            continue
+        return status
+    raise TooManyRedirects(url)
+
+
+async def probe(pool: Pool, url: str, timeout: float) -> str | None:
     """Return a failure description, or None when the URL is fine."""
+    failure = None
     for method in ("HEAD", "GET"):
-        request = urllib.request.Request(
-            url, method=method, headers=HEADERS)
         try:
-            with urllib.request.urlopen(
-                    request, timeout=timeout) as response:
-                if response.status < 400:
-                    return None
-                failure = f"HTTP {response.status}"
-        except urllib.error.HTTPError as e:
-            failure = f"HTTP {e.code}"
-        except Exception as e:  # URLError, timeout, SSL, ...
+            status = await request(pool, method, url, timeout)
+            if status < 400:
+                return None
+            failure = f"HTTP {status}"
+        except Exception as e:  # OSError, timeout, SSL, a bad response...
             failure = type(e).__name__
     return failure
 
 
+async def probe_all(urls: list[str], timeout: float, per_host: int,
+                    ) -> tuple[dict[str, str | None], int]:
+    """Probe every URL concurrently. Returns outcomes and connections opened."""
+    pool = Pool(per_host)
+    try:
+        outcomes = await asyncio.gather(
+            *(probe(pool, url, timeout) for url in urls))
+    finally:
+        pool.close()
+    return dict(zip(urls, outcomes)), pool.opened
+
+
+def check(urls: list[str], timeout: float, per_host: int,
+          store: JsonCache, ttl_days: float,
+          ) -> tuple[dict[str, str | None], int, int]:
+    """Outcomes for `urls`, probing only those with no fresh pass cached.
+
+    Returns the outcomes, how many came from the cache, and how many
+    connections the probes opened.
+    """
+    now = time.time()
+    fresh = {url for url in urls
+             if now - store.data.get(url, -1e18) < ttl_days * DAY}
+    stale = [url for url in urls if url not in fresh]
+    probed, opened = asyncio.run(probe_all(stale, timeout, per_host))
+    for url, failure in probed.items():
+        if failure is None:
+            store.data[url] = now
+        else:
+            store.data.pop(url, None)
+    store.save()
+    return {url: None for url in fresh} | probed, len(fresh), opened
+
+
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(
         description=__doc__,
@@ -81,24 +340,27 @@ def main(argv: list[str] | None = None) -> int:
     add_paths_arg(ap)
     ap.add_argument("--timeout", type=float, default=10.0,
                     help="seconds per request (default: 10)")
+    ap.add_argument("--per-host", type=int, default=4, metavar="N",
+                    help="requests in flight to one host (default: 4)")
+    ap.add_argument("--ttl", type=float, default=7.0, metavar="DAYS",
+                    help="days a passing result is trusted (default: 7)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="probe every URL, ignoring remembered passes")
     args = ap.parse_args(argv)
 
     urls = find_urls(md_files(args.paths))
     print(f"Checking {len(urls)} unique external links...")
-    with ThreadPoolExecutor(max_workers=16) as pool:
-        failures = {
-            url: outcome
-            for url, outcome in zip(
-                urls, pool.map(
-                    lambda u: probe(u, args.timeout), urls))
-            if outcome is not None
-        }
+    store = JsonCache(cache_file("check_links"), enabled=not args.no_cache)
+    outcomes, cached, opened = check(
+        list(urls), args.timeout, args.per_host, store, args.ttl)
+    failures = {url: f for url, f in outcomes.items() if f is not None}
     for url in sorted(failures):
         print(f"  ! {failures[url]:<22} {url}")
         for place in urls[url][:3]:
             print(f"      {place}")
     ok = len(urls) - len(failures)
-    print(f"{ok} ok, {len(failures)} failing.")
+    print(f"{ok} ok ({cached} remembered from the last {args.ttl:g} days), "
+          f"{len(failures)} failing; {opened} connection(s) opened.")
     return 1 if failures else 0
 
 
@@ -36,11 +36,26 @@ Default mode is ``check``: nothing is written, drift between the Markdown and
 the committed ``Examples/`` tree is reported, and a non-zero exit signals
 trouble (useful in CI). Pass ``--write`` to materialize the tree.
 
-Writing to the default ``build/examples`` (or any path under ``build/``) wipes
-the directory first, so a regenerated tree never carries orphaned files left by
-a renamed or deleted example. Writing to any other ``-o`` target keeps the
-non-destructive incremental write, since trees like the committed ``Examples/``
-hold files that are not generated from the book.
+Writing to the default ``build/examples`` (or any path under ``build/``)
+rewrites only the files whose block changed and deletes every file no block
+produces, so a regenerated tree never carries orphaned files left by a renamed
+or deleted example, and an unchanged file keeps its mtime (and its
+``__pycache__`` entry stays valid). Writing to any other ``-o`` target keeps
+the non-destructive incremental write with no deletion, since trees like the
+committed ``Examples/`` hold files that are not generated from the book.
+
+A ``--write`` into a tree under ``build/`` also records what it did in a
+manifest beside the tree (``build/examples.changed``): one ``M path`` line
+per file written and one ``D path`` line per file deleted. Other targets get
+no manifest, so ``make sync`` leaves nothing beside ``Examples/``.
+Entries accumulate across writes until a consumer clears them, so two
+writes between reads lose nothing; a path keeps only its latest status.
+``--changed`` prints the written files that still exist, one path per line,
+for narrowing a downstream tool to them, and ``--clear`` empties the
+manifest once that tool has seen them::
+
+    python tools/extract_examples.py --changed | xargs -r uv run ruff check \
+        && python tools/extract_examples.py --clear
 
 Check mode also looks the other way: a file under ``Examples/`` (besides
 ``__pycache__`` and ``.idea``) that no current block generates, left behind by
@@ -58,13 +73,15 @@ Usage:
     python tools/extract_examples.py --prune        # also delete orphaned strays
     python tools/extract_examples.py --write        # write build/examples/
     python tools/extract_examples.py --write -o DIR  # write somewhere else
+    python tools/extract_examples.py --changed      # files changed since --clear
+    python tools/extract_examples.py --clear        # mark them all seen
 """
 
 import argparse
 import re
-import shutil
 from pathlib import Path
 
+import tools_trace
 from tools_config import BUILD_DIR, CHAPTERS_DIR, EXAMPLES_TREE, ROOT
 from tools_extract import (
     ExtractResult,
@@ -72,10 +89,10 @@ from tools_extract import (
     extract as extract_blocks,
     report_conflicts,
     report_drift,
-    write_tree,
+    write_changed,
 )
 from tools_markdown import Block, Document
-from tools_repo import md_files
+from tools_repo import md_files, write_text_lf
 
 COMMITTED_DIR = ROOT / "Examples"
 DEFAULT_OUT = EXAMPLES_TREE
@@ -120,6 +137,89 @@ def is_derived(out_dir: Path) -> bool:
         return False
 
 
+def prune_tree(result: ExtractResult, root: Path) -> list[str]:
+    """Delete every file under `root` that no block produces.
+
+    This replaces wiping a derived tree and writing it all back: the
+    result is the same set of files, but the unchanged ones are never
+    touched. Dot-directories and __pycache__ (tool caches and bytecode)
+    are left alone, and directories emptied by a deletion are removed.
+    Returns the relative paths deleted.
+    """
+    if not root.exists():
+        return []
+    expected = set(result.files)
+    deleted = []
+    for path in sorted(root.rglob("*")):
+        rel = path.relative_to(root)
+        if any(part == "__pycache__" or part.startswith(".")
+               for part in rel.parts):
+            continue
+        if path.is_file() and rel.as_posix() not in expected:
+            path.unlink()
+            deleted.append(rel.as_posix())
+    for path in sorted(root.rglob("*"), reverse=True):
+        if path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+    return deleted
+
+
+def manifest_path(out_dir: Path) -> Path:
+    """Where a --write into `out_dir` records what it changed."""
+    return out_dir.with_name(f"{out_dir.name}.changed")
+
+
+def read_manifest(out_dir: Path) -> dict[str, str] | None:
+    """Each path in `out_dir`'s manifest and its status, "M" or "D"."""
+    manifest = manifest_path(out_dir)
+    if not manifest.exists():
+        return None
+    entries = {}
+    for line in manifest.read_text(encoding="utf-8").splitlines():
+        status, _, rel = line.partition(" ")
+        entries[rel] = status
+    return entries
+
+
+def write_manifest(out_dir: Path, entries: dict[str, str]) -> None:
+    """Written files first, then deleted ones, each group sorted."""
+    write_text_lf(manifest_path(out_dir), "".join(
+        f"{status} {rel}\n" for status in "MD"
+        for rel in sorted(entries) if entries[rel] == status
+    ))
+
+
+def write_tree_incremental(result: ExtractResult, out_dir: Path) -> None:
+    """Bring `out_dir` up to date, touching only what changed.
+
+    A derived tree (is_derived()) also loses the files no block produces,
+    and what changed goes into the manifest --changed reads, on top of
+    whatever no consumer has cleared yet. Prints the counts.
+    """
+    written = write_changed(result, out_dir)
+    deleted = []
+    if is_derived(out_dir):
+        deleted = prune_tree(result, out_dir)
+        entries = read_manifest(out_dir) or {}
+        entries |= dict.fromkeys(written, "M") | dict.fromkeys(deleted, "D")
+        write_manifest(out_dir, entries)
+    print(f"Wrote {len(written)} changed file(s) to {out_dir}"
+          + (f", deleted {len(deleted)}." if deleted else "."))
+
+
+def changed_files(out_dir: Path) -> list[Path] | None:
+    """The files --write wrote into `out_dir` since the manifest was cleared.
+
+    None means there is no manifest, so nothing is known and a caller
+    should treat the whole tree as changed.
+    """
+    entries = read_manifest(out_dir)
+    if entries is None:
+        return None
+    return [out_dir / rel for rel, status in sorted(entries.items())
+            if status == "M" and (out_dir / rel).exists()]
+
+
 def find_strays(result: ExtractResult, committed: Path) -> list[str]:
     """Files under `committed` that no book block generates.
 
@@ -218,9 +318,26 @@ def main(argv: list[str] | None = None) -> int:
     ap.add_argument("--prune", action="store_true",
                     help="delete orphaned stray files under Examples/ "
                          "(check mode only)")
+    ap.add_argument("--changed", action="store_true",
+                    help="print the files the last --write into -o changed, "
+                         "one per line, since the last --clear (the tree "
+                         "itself if unknown)")
+    ap.add_argument("--clear", action="store_true",
+                    help="empty -o's manifest, once a consumer has handled "
+                         "what --changed printed")
     args = ap.parse_args(argv)
 
-    result = extract()
+    if args.changed or args.clear:
+        changed = changed_files(args.out)
+        if args.changed:
+            for path in [args.out] if changed is None else changed:
+                print(path.as_posix())
+        if args.clear and is_derived(args.out):
+            write_manifest(args.out, {})
+        return 0
+
+    with tools_trace.span("extract"):
+        result = extract()
     print(f"Scanned {CHAPTERS_DIR.name}: "
           f"{len(result.files)} file-blocks, {result.fragments} fragments.")
 
@@ -228,19 +345,17 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.write:
         print()
-        if is_derived(args.out) and args.out.exists():
-            shutil.rmtree(args.out)
-            print(f"Cleaned {args.out}.")
-        written = write_tree(result, args.out)
-        print(f"Wrote {written} changed file(s) to {args.out}.")
+        with tools_trace.span("write tree"):
+            write_tree_incremental(result, args.out)
         return 1 if result.conflicts else 0
 
     # Default: check mode against the committed Examples/ tree.
-    missing, changed = check_against(result, COMMITTED_DIR)
+    with tools_trace.span("check against the committed tree"):
+        missing, changed = check_against(result, COMMITTED_DIR)
+        strays = find_strays(result, COMMITTED_DIR)
     report_drift(missing, changed, noun="example",
                  where=COMMITTED_DIR.name)
 
-    strays = find_strays(result, COMMITTED_DIR)
     orphaned, referenced = report_strays(strays, COMMITTED_DIR,
                                          prune=args.prune)
 
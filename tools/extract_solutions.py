@@ -10,7 +10,9 @@ docstring for the full slug-naming rules; this module reuses its functions
 directly rather than duplicating them.
 
 Default mode is ``check``: compares against the committed ``SolutionsCode/``
-tree. Pass ``--write`` to materialize a tree (default ``build/solutions``).
+tree. Pass ``--write`` to materialize a tree (default ``build/solutions``),
+incrementally and with a ``build/solutions.changed`` manifest, exactly as
+``extract_examples.py --write`` does.
 
 Both modes first verify that every ``Solutions/*.md`` stem matches a current
 ``Chapters/*.md`` stem, so a chapter renumbering cannot silently leave the
@@ -35,12 +37,16 @@ Usage:
 """
 
 import argparse
-import shutil
 from pathlib import Path
 
-from extract_examples import extract, find_strays, is_derived, report_strays
+from extract_examples import (
+    extract,
+    find_strays,
+    report_strays,
+    write_tree_incremental,
+)
 from tools_config import BUILD_DIR, ROOT
-from tools_extract import check_against, report_conflicts, write_tree
+from tools_extract import check_against, report_conflicts
 
 SOLUTIONS_DIR = ROOT / "Solutions"
 COMMITTED_DIR = ROOT / "SolutionsCode"
@@ -99,11 +105,7 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.write:
         print()
-        if is_derived(args.out) and args.out.exists():
-            shutil.rmtree(args.out)
-            print(f"Cleaned {args.out}.")
-        written = write_tree(result, args.out)
-        print(f"Wrote {written} changed file(s) to {args.out}.")
+        write_tree_incremental(result, args.out)
         return 1 if result.conflicts else 0
 
     missing, changed = check_against(result, COMMITTED_DIR)
@@ -13,29 +13,49 @@ the gate expects. This extracts nothing itself; run it after the tree is built
 names an extractable file, it runs ``ruff check --fix-only --select I,F401``
 over the tree (sort the import block and drop unused imports, leaving
 deliberately-unused ones that per-file-ignores exempt), then splices each fixed
-file back into the block it came from.
+file back into the block it came from. The fixed text is read straight from
+the tree and spliced in memory; nothing goes through a temporary file.
+
+Only what changed since the last clean run is looked at. A chapter whose
+Markdown is unchanged is not even walked, and within a changed chapter only
+the listings whose text changed go to ruff, all of them in one invocation.
+Each record is keyed on the text, the names beside it in the tree (which
+decide what isort calls first-party), and ``pyproject.toml`` plus
+``uv.lock`` (the ruff settings and version), in
+``build/cache/fix_imports.json``. ``--no-cache`` checks everything.
 
 Usage:
     python tools/fix_imports.py          # report listings to organize (exit 1)
     python tools/fix_imports.py --fix     # rewrite them in place
     python tools/fix_imports.py --fix Chapters/05_Modules_and_Packages.md
+    python tools/fix_imports.py --no-cache   # re-check every listing
 """
 
 import argparse
 import subprocess
+import time
 from pathlib import Path
 
+from tools_cache import JsonCache, cache_file, digest
 from tools_config import CHAPTERS_DIR, PATH_LINE_RE, ROOT
 from tools_config import EXAMPLES_TREE as DEFAULT_TREE
 from tools_pycode import walk_fenced
 from tools_repo import write_text_lf
 
+# The files holding ruff's settings (pyproject.toml) and its pinned
+# version (uv.lock): a change to either can change any listing's fix.
+RUFF_INPUTS = ("pyproject.toml", "uv.lock")
+# Past this many listings, ruff gets the whole tree instead of a path
+# list, which keeps the command line within Windows' length limit. A
+# recorded clean listing costs ruff next to nothing.
+MAX_PATHS = 200
+
 
 def block_slug(block: list[str]) -> str | None:
     """The relative path a block names on its first content line, if any.
 
     A "utils/"-prefixed slug lives at the tree root's utils/ directory
-    rather than a chapter dir; ``fixed_for`` below resolves it there.
+    rather than a chapter dir; ``listing_path`` below resolves it there.
     """
     for line in block:
         if line.strip():
@@ -55,19 +75,79 @@ def find_ruff() -> list[str]:
     return ['uv', 'run', 'ruff']
 
 
-def ruff_fix_tree(tree: Path, ruff: list[str]) -> None:
-    """Tidy imports in place across the extracted tree.
+def ruff_fix(targets: list[Path], ruff: list[str]) -> None:
+    """Tidy imports in place in `targets`, files or the tree, in one run.
 
     I organizes the import block; F401 drops unused imports. ruff's autofix
     honors per-file-ignores, so a deliberately unused import (such as the one
     in import_module.py) is left alone.
     """
     subprocess.run(
-        ruff + ['check', '--fix-only', '--select', 'I,F401', str(tree)],
+        ruff + ['check', '--fix-only', '--select', 'I,F401',
+                *map(str, targets)],
         check=False,
     )
 
 
+def listing_path(tree: Path, chapter: str, slug: str) -> Path:
+    """Where `slug`, from the chapter `chapter`, was extracted to."""
+    return tree / slug if slug.startswith('utils/') else tree / chapter / slug
+
+
+def listings(text: str) -> dict[str, str]:
+    """Each slugged python block's text, by slug."""
+    lines = text.splitlines(keepends=True)
+    found: dict[str, str] = {}
+    for ev in walk_fenced(
+        lines, wanted=lambda m: (m.group(1) or '') in ('python', 'py'),
+    ):
+        if ev.match is not None:
+            block = lines[ev.open_at + 1:ev.end]
+            slug = block_slug(block)
+            if slug is not None:
+                found[slug] = ''.join(block)
+    return found
+
+
+class Records:
+    """The chapters and listings found clean by the last run, and their keys.
+
+    A key covers the text, the names beside it in the tree, and the ruff
+    inputs. Only a clean result is recorded: a listing that still needs
+    organizing is checked again next run.
+    """
+
+    def __init__(self, tree: Path, *, enabled: bool = True) -> None:
+        self.tree = tree
+        self.store = JsonCache(cache_file('fix_imports'), enabled=enabled)
+        self.chapters: dict[str, str] = self.store.data.setdefault(
+            'chapters', {})
+        self.listings: dict[str, str] = self.store.data.setdefault(
+            'listings', {})
+        self.salt = digest(*(
+            (ROOT / name).read_bytes() if (ROOT / name).exists() else b''
+            for name in RUFF_INPUTS
+        ))
+        self.layouts: dict[Path, str] = {}
+
+    def layout(self, folder: Path) -> str:
+        if folder not in self.layouts:
+            self.layouts[folder] = '\n'.join(sorted(
+                p.name for p in folder.iterdir()
+            )) if folder.is_dir() else ''
+        return self.layouts[folder]
+
+    def chapter_key(self, md: Path, text: str) -> str:
+        return digest(self.salt, text, self.layout(self.tree / md.stem),
+                      self.layout(self.tree / 'utils'))
+
+    def listing_key(self, path: Path, text: str) -> str:
+        return digest(self.salt, text, self.layout(path.parent))
+
+    def save(self) -> None:
+        self.store.save()
+
+
 def splice_markdown(
     text: str, fixed_for
 ) -> tuple[str, list[str]]:
@@ -133,6 +213,10 @@ def main(argv: list[str] | None = None) -> int:
         '--tree', type=Path, default=DEFAULT_TREE,
         help=f'extracted-examples tree to sort (default: {DEFAULT_TREE})',
     )
+    ap.add_argument(
+        '--no-cache', action='store_true',
+        help='re-check every listing, ignoring the last run\'s records',
+    )
     args = ap.parse_args(argv)
 
     if not args.tree.exists():
@@ -142,32 +226,58 @@ def main(argv: list[str] | None = None) -> int:
         )
         return 1
 
-    ruff_fix_tree(args.tree, find_ruff())
-
+    start = time.perf_counter()
+    records = Records(args.tree, enabled=not args.no_cache)
     files = collect_markdown(args.targets)
-    total = 0
+    texts: dict[Path, str] = {}
+    stale: dict[Path, dict[str, Path]] = {}  # md -> {slug: tree path}
     for md in files:
-        chapter = md.stem
+        text = md.read_text(encoding='utf-8')
+        if records.chapters.get(str(md.resolve())) == records.chapter_key(md, text):
+            continue
+        texts[md] = text
+        stale[md] = {}
+        for slug, block in listings(text).items():
+            path = listing_path(args.tree, md.stem, slug)
+            key = records.listing_key(path, block)
+            if path.exists() and records.listings.get(str(path)) != key:
+                stale[md][slug] = path
+
+    paths = [p for slugs in stale.values() for p in slugs.values()]
+    if paths:
+        ruff_fix(paths if len(paths) <= MAX_PATHS else [args.tree],
+                 find_ruff())
+
+    total = 0
+    for md, text in texts.items():
+        slugs = stale[md]
 
         def fixed_for(slug: str | None) -> str | None:
-            if slug is None:
+            if slug not in slugs:
                 return None
-            fp = (args.tree / slug if slug.startswith('utils/')
-                  else args.tree / chapter / slug)
-            return fp.read_text(encoding='utf-8') if fp.exists() else None
-
-        new_text, changed = splice_markdown(
-            md.read_text(encoding='utf-8'), fixed_for
-        )
-        if not changed:
-            continue
-        total += len(changed)
-        if args.fix:
+            return slugs[slug].read_text(encoding='utf-8')
+
+        new_text, changed = splice_markdown(text, fixed_for)
+        if changed:
+            total += len(changed)
+            if not args.fix:
+                print(f"{md.name}: would organize {', '.join(changed)}")
+                for slug in set(slugs) - set(changed):
+                    path = slugs[slug]
+                    records.listings[str(path)] = records.listing_key(
+                        path, path.read_text(encoding='utf-8'))
+                continue
             write_text_lf(md, new_text)
             print(f"organized {md.name}: {', '.join(changed)}")
-        else:
-            print(f"{md.name}: would organize {', '.join(changed)}")
-
+        for path in slugs.values():
+            records.listings[str(path)] = records.listing_key(
+                path, path.read_text(encoding='utf-8'))
+        records.chapters[str(md.resolve())] = records.chapter_key(md, new_text)
+    records.save()
+
+    seconds = time.perf_counter() - start
+    print(f"{len(texts)} of {len(files)} chapter(s) changed since the last "
+          f"run; ruff re-checked {len(paths)} listing(s) ({seconds:.2f}s).")
     if total == 0:
         print("Imports OK: every listing is organized.")
         return 0
@@ -21,35 +21,128 @@ a diff. ``make clean-examples`` and friends remove only their own
 subdirectories and leave it alone; a full ``rm -rf build`` drops it, which
 is correct, since a rebuilt-from-nothing tree deserves a fresh gate.
 
+Each stage of the gate also keeps its own record, in
+``build/cache/gate_stages.json``: the hashes of the files it checked the
+last time it passed. `make gate-fast` runs the same stages as `make gate`
+through this script, and it uses those records to run each stage one of
+three ways:
+
+* skip it when nothing the stage reads has changed since it passed;
+* narrow it to the chapters that changed, when the stage checks each
+  chapter on its own (the per-file Markdown checks, reflow, the ``#:``
+  markers, and ty and ruff over that chapter's directory);
+* run it in full otherwise.
+
+The pytest stages run ``tools/pytest_examples.py``, as `make gate` does,
+which already reruns only the test directories whose files changed.
+
+A stage is run in full whenever the harness changes, meaning tools/, its
+data files, ``pyproject.toml``, ``uv.lock``, or ``.python-version``, or
+whenever a ``utils/`` helper that every chapter can import changes. For
+ty, ruff, and pytest that also covers every directory pyproject.toml
+gives ty as an extra import root, such as chapter 6's package. It is
+also run in full when a file it read was deleted, and for any stage that
+reads across files, such as ``anchors``. Line endings and extraction
+always run, because every later stage reads what extraction writes. A
+pass of `make gate` seeds every record at once, and ``--full`` ignores
+them. The commands start the way the Makefile's ``PY``, ``TY``, ``RUFF``,
+and ``PYTEST`` say, passed in as ``--py`` and friends, so ``make
+gate-fast PY=python`` runs the same interpreter ``make gate`` would.
+The run ends with the time it saved, which is how long each skipped or
+narrowed stage took the last time it ran in full:
+
+    gate-fast passed in 9.8s: 8 skipped, 3 narrowed, 2 in full;
+    about 51.0s saved against the last full run of each stage
+
+`gate` stays the authority before a commit. The records assume a
+chapter's listings depend only on that chapter and ``utils/``, which is
+how extraction lays out the tree but is not something it enforces.
+
 Usage:
     python tools/gate_stamp.py --write gate   # record a pass
     python tools/gate_stamp.py                # report
+    python tools/gate_stamp.py --run          # the incremental gate
+    python tools/gate_stamp.py --run --plan   # what it would do, no run
+    python tools/gate_stamp.py --run --full   # every stage, in full
 """
 
 import argparse
 import hashlib
 import json
+import shlex
 import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
-from tools_config import BUILD_DIR, ROOT
+import check_all
+import tools_trace
+from tools_cache import JsonCache, cache_file, digest
+from tools_config import BUILD_DIR, EXAMPLES_TREE, ROOT
+from tools_repo import ty_extra_paths
 
 STAMP = BUILD_DIR / "gate-stamp.json"
 SOURCES = ("Chapters", "Solutions")
 MAX_LISTED = 6
 
 
-def digests() -> dict[str, str]:
-    """A hash per Markdown file the gate checks."""
+# What every stage's verdict rests on besides the files it checks: the
+# tools and the pinned toolchain. A change here runs every stage in full.
+HARNESS = ("tools/*.py", "tools/data/*", "pyproject.toml", "uv.lock",
+           ".python-version")
+CHAPTERS = "Chapters/*.md"
+# Any chapter's listings can import the extracted utils/ helpers, so a
+# change there runs the examples stages in full rather than narrowed.
+UTILS = "build/examples/utils/**/*"
+# What ty resolves imports against: utils/ and the chapter directories
+# other chapters import by bare name. An edit to any of them can break a
+# chapter that did not change, so ty, ruff, and pytest run in full.
+IMPORT_ROOTS = tuple(f"{path.relative_to(ROOT).as_posix()}/**/*"
+                     for path in ty_extra_paths())
+EXAMPLES = EXAMPLES_TREE.relative_to(ROOT).as_posix()
+# The Markdown outside Chapters/ that gets an anchors pass, as the
+# Makefile's GATE_DOCS; `make gate-fast` passes its value in.
+GATE_DOCS = ("tools/README.md", "Solutions")
+
+type Commands = Callable[[list[str] | None], list[list[str]]]
+
+
+@dataclass(frozen=True)
+class Toolchain:
+    """The commands the stages start, as the Makefile's PY, TY, RUFF,
+    and PYTEST; `make gate-fast` passes its values in."""
+
+    py: list[str] = field(default_factory=lambda: [sys.executable])
+    ty: list[str] = field(default_factory=lambda: ["uv", "run", "ty"])
+    ruff: list[str] = field(default_factory=lambda: ["uv", "run", "ruff"])
+    pytest: list[str] = field(
+        default_factory=lambda: ["uv", "run", "pytest"])
+
+
+def hash_files(patterns: Iterable[str], root: Path = ROOT) -> dict[str, str]:
+    """A hash per file the glob patterns match, keyed by its path under root.
+
+    Bytecode is left out: running a listing writes it, and a hash that
+    changed on every run would never let a stage be skipped.
+    """
     out: dict[str, str] = {}
-    for folder in SOURCES:
-        for md in sorted((ROOT / folder).glob("*.md")):
-            data = md.read_bytes()
-            out[f"{folder}/{md.name}"] = hashlib.sha256(data).hexdigest()
+    for pattern in patterns:
+        for path in sorted(root.glob(pattern)):
+            if path.is_file() and "__pycache__" not in path.parts:
+                name = path.relative_to(root).as_posix()
+                out[name] = hashlib.sha256(path.read_bytes()).hexdigest()
     return out
 
 
+def digests() -> dict[str, str]:
+    """A hash per Markdown file the gate checks."""
+    return hash_files(f"{folder}/*.md" for folder in SOURCES)
+
+
 def head() -> str:
     try:
         proc = subprocess.run(
@@ -115,14 +208,272 @@ def report() -> int:
     return 0
 
 
+@dataclass(frozen=True)
+class Stage:
+    """One step of the gate, and the files its verdict depends on."""
+
+    name: str
+    commands: Commands
+    """The commands to run: over everything for None, else narrowed to
+    the changed files named. An empty list means nothing to do."""
+    inputs: tuple[str, ...] = ()
+    """Globs, under the root, of the files the stage checks. A stage with
+    none has nothing to compare against and always runs."""
+    shared: tuple[str, ...] = ()
+    """Globs that, like HARNESS, run the stage in full when they change."""
+    narrows: bool = False
+    """Whether the stage checks each input file independently of the rest."""
+    ok: tuple[int, ...] = (0,)
+
+
+def fixed(*commands: list[str]) -> Commands:
+    """The same commands whatever changed: the stage cannot be narrowed."""
+    return lambda changed: [list(c) for c in commands]
+
+
+def scoped(*prefix: str, whole: Iterable[str] = (),
+           args: Callable[[list[str]], list[str]] = list) -> Commands:
+    """`prefix` over `whole`, or over `args(changed)` when narrowed."""
+    whole = list(whole)
+
+    def commands(changed: list[str] | None) -> list[list[str]]:
+        if changed is None:
+            return [[*prefix, *whole]]
+        narrowed = args(changed)
+        return [[*prefix, *narrowed]] if narrowed else []
+    return commands
+
+
+def chapter_dirs(changed: list[str]) -> list[str]:
+    """The extracted directories of the changed chapters that have one."""
+    dirs = [EXAMPLES_TREE / Path(name).stem for name in changed]
+    return [d.relative_to(ROOT).as_posix() for d in dirs if d.is_dir()]
+
+
+def gate_stages(checks: list[str], docs: Iterable[str],
+                tools: Toolchain | None = None) -> list[Stage]:
+    """The stages of `make gate`, in its order, solutions-gate first."""
+    tools = tools or Toolchain()
+    py, ty, ruff = tools.py, tools.ty, tools.ruff
+    selected = check_all.select(checks)
+    local = [c.name for c in selected if not c.cross_file]
+    cross = [c.name for c in selected if c.cross_file]
+    docs = list(docs)
+    doc_globs = tuple(f"{d}/*.md" if (ROOT / d).is_dir() else d for d in docs)
+    stages = [
+        Stage("solutions", fixed(
+            [*py, "tools/check_solutions.py"],
+            [*py, "tools/extract_solutions.py"],
+            [*py, "tools/extract_solutions.py", "--write"],
+            [*py, "tools/validate_output.py", "--update",
+             "--tree", str(BUILD_DIR / "solutions"), "Solutions"],
+            [*ty, "check", "build/solutions"],
+            [*ruff, "check", "build/solutions"],
+            [*py, "tools/pytest_examples.py", "build/solutions"]),
+            inputs=("Solutions/*.md", "SolutionsCode/**/*", CHAPTERS)),
+        Stage("tools-test", fixed([*tools.pytest, "tools/tests"]),
+              inputs=("tools/tests/*.py",)),
+        Stage("eol", fixed([*py, "tools/check_line_endings.py"])),
+    ]
+    if local:
+        stages.append(Stage(
+            "checks",
+            scoped(*py, "tools/check_all.py", *local, "--paths",
+                   whole=["Chapters"]),
+            inputs=(CHAPTERS,), narrows=True))
+    anchors = [[*py, "tools/check_all.py", *cross]] if cross else []
+    stages += [
+        Stage("anchors", fixed(
+            *anchors,
+            [*py, "tools/check_all.py", "anchors", "--paths", *docs]),
+            inputs=(CHAPTERS, *doc_globs)),
+        Stage("reflow-check", scoped(*py, "tools/reflow_prose.py"),
+              inputs=(CHAPTERS,), narrows=True),
+        Stage("slugs", fixed([*py, "tools/check_unique_slugs.py"]),
+              inputs=(CHAPTERS, "Solutions/*.md")),
+        Stage("extract", fixed(
+            [*py, "tools/extract_examples.py"],
+            [*py, "tools/extract_examples.py", "--write"])),
+        Stage("output",
+              scoped(*py, "tools/validate_output.py", "--update",
+                     whole=["Chapters"]),
+              inputs=(CHAPTERS,), shared=(UTILS,), narrows=True),
+        Stage("ty", scoped(*ty, "check", whole=[EXAMPLES],
+                           args=chapter_dirs),
+              inputs=(CHAPTERS,), shared=IMPORT_ROOTS, narrows=True),
+        Stage("ruff", scoped(*ruff, "check", whole=[EXAMPLES],
+                             args=chapter_dirs),
+              inputs=(CHAPTERS,), shared=IMPORT_ROOTS, narrows=True),
+        Stage("run", fixed([*py, "tools/run_examples.py"]),
+              inputs=(CHAPTERS,), shared=(UTILS,)),
+        # pytest_examples.py already reruns only the test directories
+        # whose files changed, so the stage runs it whole rather than
+        # narrowing it to chapters.
+        Stage("pytest", fixed([*py, "tools/pytest_examples.py", EXAMPLES]),
+              inputs=(CHAPTERS,), shared=IMPORT_ROOTS),
+    ]
+    return stages
+
+
+def stage_key(stage: Stage, root: Path = ROOT) -> str:
+    """What a recorded pass is only valid under: commands and harness."""
+    parts = [" ".join(command) for command in stage.commands(None)]
+    for name, h in hash_files((*HARNESS, *stage.shared), root).items():
+        parts += [name, h]
+    return digest(*parts)
+
+
+def decide(stage: Stage, record: dict[str, Any] | None, key: str,
+           files: dict[str, str]) -> tuple[str, list[str]]:
+    """"skip", "narrow", or "full", and the inputs changed since the pass."""
+    if not stage.inputs or not record or record.get("key") != key:
+        return "full", []
+    passed: dict[str, str] = record.get("files", {})
+    changed = [name for name, h in files.items() if passed.get(name) != h]
+    if not changed and passed.keys() == files.keys():
+        return "skip", []
+    if stage.narrows and passed.keys() <= files.keys():
+        return "narrow", changed
+    return "full", changed
+
+
+def stage_store() -> JsonCache:
+    return JsonCache(cache_file("gate_stages"))
+
+
+def remember(records: dict[str, Any], stage: Stage, root: Path,
+             seconds: float | None) -> None:
+    """Record that `stage` passed over the files as they are now.
+
+    `seconds` is the length of a full run, kept for the time-saved
+    report; None keeps whatever the last full run recorded.
+    """
+    if not stage.inputs:
+        return
+    last = records.get(stage.name, {}).get("seconds")
+    records[stage.name] = {
+        "key": stage_key(stage, root),
+        "files": hash_files(stage.inputs, root),
+        "seconds": last if seconds is None else seconds,
+    }
+
+
+def seed(stages: list[Stage], root: Path = ROOT) -> None:
+    """Record every stage as passed: `make gate` just ran all of them."""
+    store = stage_store()
+    for stage in stages:
+        remember(store.data, stage, root, None)
+    store.save()
+
+
+def run_commands(commands: list[list[str]], ok: tuple[int, ...],
+                 root: Path) -> int:
+    """Run each command until one fails. 0, or the failing exit code."""
+    for command in commands:
+        try:
+            code = tools_trace.run(command, cwd=root).returncode
+        except OSError as e:
+            print(f"{command[0]}: {e}")
+            code = 127
+        if code not in ok:
+            return code or 1
+    return 0
+
+
+def run_gate(stages: list[Stage], target: str, *, full: bool = False,
+             plan: bool = False, root: Path = ROOT) -> int:
+    """Run each stage unless its recorded pass still holds.
+
+    Stops at the first failure, as `make gate` does. A stage's record is
+    saved as soon as it passes, so a fix-and-rerun after a failure skips
+    everything before the stage that failed.
+    """
+    store = stage_store()
+    records = store.data
+    counts = {"skip": 0, "narrow": 0, "full": 0}
+    saved = 0.0
+    start = time.perf_counter()
+    for stage in stages:
+        record = records.get(stage.name)
+        files = hash_files(stage.inputs, root)
+        how, changed = decide(stage, None if full else record,
+                              stage_key(stage, root), files)
+        counts[how] += 1
+        last = (record or {}).get("seconds") or 0.0
+        if how == "skip":
+            saved += last
+            print(f"skip    {stage.name} (unchanged since it passed)")
+            continue
+        if how == "narrow":
+            print(f"narrow  {stage.name} ({len(changed)} changed file(s))")
+        else:
+            print(f"full    {stage.name}")
+        if plan:
+            continue
+        began = time.perf_counter()
+        with tools_trace.span(stage.name, "gate", how=how):
+            code = run_commands(
+                stage.commands(changed if how == "narrow" else None),
+                stage.ok, root)
+        if code:
+            print(f"\n{stage.name} failed (exit {code}); stopping.")
+            return code
+        seconds = time.perf_counter() - began
+        if how == "narrow":
+            saved += max(last - seconds, 0.0)
+        remember(records, stage, root, seconds if how == "full" else None)
+        store.save()
+
+    if plan:
+        return 0
+    elapsed = time.perf_counter() - start
+    print(f"\n{target} passed in {elapsed:.1f}s: {counts['skip']} skipped, "
+          f"{counts['narrow']} narrowed, {counts['full']} in full")
+    if saved:
+        print(f"about {saved:.1f}s saved against the last full run "
+              "of each stage")
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
-    ap = argparse.ArgumentParser(description=__doc__)
+    ap = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
     ap.add_argument("--write", metavar="TARGET",
                     help="record that TARGET passed, instead of reporting")
+    ap.add_argument("--run", action="store_true",
+                    help="run the gate, skipping or narrowing each stage "
+                         "whose inputs are unchanged since it passed")
+    ap.add_argument("--full", action="store_true",
+                    help="with --run, run every stage in full")
+    ap.add_argument("--plan", action="store_true",
+                    help="with --run, print what each stage would do "
+                         "and run nothing")
+    ap.add_argument("--checks", nargs="+", default=[], metavar="CHECK",
+                    help="the check_all.py checks the gate runs "
+                         "(default: all of them)")
+    ap.add_argument("--docs", nargs="+", default=list(GATE_DOCS),
+                    metavar="PATH",
+                    help="Markdown outside Chapters/ to check anchors in "
+                         f"(default: {' '.join(GATE_DOCS)})")
+    for name, default in vars(Toolchain()).items():
+        ap.add_argument(f"--{name}", type=shlex.split, default=default,
+                        metavar="COMMAND",
+                        help=f"how to start {name}, as the Makefile's "
+                             f"{name.upper()} "
+                             f"(default: {shlex.join(default)})")
     args = ap.parse_args(argv)
+    tools = Toolchain(args.py, args.ty, args.ruff, args.pytest)
     if args.write:
         write(args.write)
+        seed(gate_stages(args.checks, args.docs, tools))
         return 0
+    if args.run:
+        stages = gate_stages(args.checks, args.docs, tools)
+        code = run_gate(stages, "gate-fast", full=args.full, plan=args.plan)
+        if code == 0 and not args.plan:
+            write("gate-fast")
+        return code
     return report()
 
 
@@ -128,6 +128,7 @@ CHECK = Check(
     clean="Anchor links OK.",
     problem="{n} broken anchor link(s). Fix the anchor, or give the "
             "target heading an explicit {{#id}}.",
+    cross_file=True,
 )
 
 
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Run an example tree's pytest files: only what changed, shards balanced.
+
+``make test`` and ``make solutions-test`` run the ``test_*.py`` listings
+in ``build/examples/`` and ``build/solutions/``. Running pytest over the
+whole tree every time repeats every test of every chapter after an edit
+to one of them. So this wraps the pytest run:
+
+* A directory's tests that all passed are recorded in
+  ``build/cache/pytest_<tree>.json`` under a hash of everything they
+  could read: every file in that directory (subdirectories included),
+  the ``conftest.py`` files above it, and ``utils/``. A directory whose
+  hash still matches is not run again, so an edit re-runs only the tests
+  beside it. A directory is recorded only when every test file in it
+  reported and every test passed, in a run that finished (exit 0 or 1)
+  over the whole selection: arguments after ``--`` that narrow it, such
+  as ``-x``, ``-k`` or ``-m``, record nothing. ``--no-cache`` runs
+  everything.
+* ``-n N`` runs the tests on N pytest-xdist workers, dealt into shards of
+  nearly equal total time by the tools_pytest.py plugin, going by each
+  test's time last run (``build/cache/pytest_<tree>.durations.json``)
+  rather than by file order.
+* ``--slowest N`` prints the N slowest tests of each chapter that ran.
+
+Arguments after ``--`` go to pytest unchanged.
+
+Usage:
+    python tools/pytest_examples.py                      # build/examples
+    python tools/pytest_examples.py build/solutions
+    python tools/pytest_examples.py -n auto --slowest 3
+    python tools/pytest_examples.py --no-cache -- -x     # all, stop at first
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from tools_cache import (
+    Durations,
+    JsonCache,
+    cache_file,
+    digest,
+    interpreter_tag,
+)
+from tools_config import EXAMPLES_TREE as DEFAULT_TREE
+from tools_config import ROOT, TOOLS_DIR
+from tools_repo import jobs_arg
+
+NO_TESTS_COLLECTED = 5  # pytest's exit code when nothing was collected
+# The exit codes of a run that got through every test it selected: all
+# passed, or some failed. Anything else (interrupted, an internal or
+# usage error, a crash) says nothing about the tests that did not run.
+FINISHED = {0, 1}
+# pytest options that run less than every collected test.
+NARROWING = {"--exitfirst", "--maxfail", "--deselect", "--last-failed",
+             "--lf", "--stepwise", "--sw", "--stepwise-skip", "--sw-skip",
+             "--ignore", "--ignore-glob", "--co", "--collect-only"}
+
+
+def tree_files(folder: Path) -> list[Path]:
+    if not folder.is_dir():
+        return []
+    return sorted(p for p in folder.rglob("*")
+                  if p.is_file() and "__pycache__" not in p.parts)
+
+
+def directory_key(folder: Path, tree: Path) -> str:
+    """The hash a recorded pass of `folder`'s tests is valid for."""
+    parts: list[str | bytes] = [interpreter_tag()]
+    conftests = [parent / "conftest.py" for parent in folder.parents
+                 if parent == tree or tree in parent.parents]
+    for path in [*tree_files(folder), *tree_files(tree / "utils"),
+                 *(c for c in conftests if c.is_file())]:
+        parts += [path.relative_to(tree).as_posix(), path.read_bytes()]
+    return digest(*parts)
+
+
+def pytest_command(files: list[Path], workers: int, durations: Path,
+                   report: Path, extra: list[str]) -> list[str]:
+    command = [sys.executable, "-m", "pytest", "-p", "tools_pytest",
+               "--balance-from", str(durations), "--report-to", str(report)]
+    if workers > 1:
+        command += ["-n", str(workers), "--dist", "loadgroup"]
+    return [*command, *extra, *map(str, files)]
+
+
+def narrows(extra: list[str]) -> bool:
+    """Whether pytest arguments would run only part of the selection."""
+    for arg in extra:
+        if arg.startswith("--"):
+            if arg.split("=", 1)[0] in NARROWING:
+                return True
+        elif arg.startswith("-") and len(arg) > 1:
+            # -x, -k EXPR, -m EXPR, or a cluster of flags such as -qx
+            if arg[1] in "xkm" or (arg[1:].isalpha() and "x" in arg):
+                return True
+        elif "::" in arg or arg.endswith(".py") or Path(arg).is_dir():
+            return True  # A test or file named outright
+    return False
+
+
+def passed_folders(folders: dict[Path, list[Path]],
+                   tests: dict[str, dict]) -> list[Path]:
+    """The folders each of whose test files reported, every test passing.
+
+    A file with no entry in the report never ran, so its folder is not
+    known to pass, whatever the others did.
+    """
+    outcomes: dict[Path, set[str]] = {}
+    for test in tests.values():
+        outcomes.setdefault(Path(test["file"]).resolve(), set()).add(
+            test["outcome"])
+    return [folder for folder, files in folders.items()
+            if all(outcomes.get(f.resolve()) == {"passed"} for f in files)]
+
+
+def print_slowest(tests: dict[str, dict], tree: Path, top: int) -> None:
+    """The `top` slowest tests of each chapter, chapters slowest first."""
+    chapters: dict[str, list[tuple[float, str]]] = {}
+    for nodeid, test in tests.items():
+        rel = Path(test["file"]).resolve().relative_to(tree.resolve())
+        name = f"{rel.as_posix()}::{nodeid.split('::', 1)[-1]}"
+        chapters.setdefault(rel.parts[0], []).append((test["seconds"], name))
+    print(f"\nSlowest {top} test(s) per chapter:")
+    for chapter, timed in sorted(chapters.items(),
+                                 key=lambda kv: -sum(s for s, _ in kv[1])):
+        total = sum(s for s, _ in timed)
+        print(f"  {chapter}: {total:.2f}s over {len(timed)} test(s)")
+        for seconds, name in sorted(timed, reverse=True)[:top]:
+            print(f"    {seconds:6.2f}s  {name}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    extra: list[str] = []
+    if "--" in argv:
+        at = argv.index("--")
+        argv, extra = argv[:at], argv[at + 1:]
+    ap = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("tree", nargs="?", type=Path, default=DEFAULT_TREE,
+                    help=f"extracted tree to test (default: {DEFAULT_TREE})")
+    ap.add_argument("-n", "--numprocesses", type=jobs_arg, default=1,
+                    metavar="N",
+                    help="pytest-xdist workers: an int or 'auto' for all "
+                         "cores (default: 1, no xdist)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="run every test, ignoring recorded passes")
+    ap.add_argument("--slowest", type=int, default=0, metavar="N",
+                    help="print the N slowest tests of each chapter")
+    args = ap.parse_args(argv)
+
+    tree = args.tree.resolve()
+    if not tree.is_dir():
+        print(f"No example tree at {args.tree}. Extract it first.")
+        return 2
+
+    tool = f"pytest_{tree.name}"
+    store = JsonCache(cache_file(tool), enabled=not args.no_cache)
+    durations = Durations(tool)
+    folders: dict[Path, list[Path]] = {}
+    for path in sorted(tree.rglob("test_*.py")):
+        if "__pycache__" not in path.parts:
+            folders.setdefault(path.parent, []).append(path)
+    keys = {folder: directory_key(folder, tree) for folder in folders}
+    stale = {folder: files for folder, files in folders.items()
+             if store.data.get(str(folder)) != keys[folder]}
+    cached = len(folders) - len(stale)
+    if not stale:
+        print(f"All {len(folders)} test folder(s) in {args.tree} passed "
+              "before, and nothing they read has changed.")
+        return 0
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(TOOLS_DIR), env.get("PYTHONPATH")]))
+    files = [f for group in stale.values() for f in group]
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "report.json"
+        code = subprocess.run(
+            pytest_command(files, args.numprocesses, durations.store.path,
+                           report, extra),
+            cwd=ROOT, env=env).returncode
+        try:
+            tests = json.loads(report.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            tests = {}
+
+    for nodeid, test in tests.items():
+        if "::" in nodeid:
+            durations.record(nodeid, test["seconds"])
+    durations.save()
+    if code in FINISHED and not narrows(extra):
+        passed = set(passed_folders(stale, tests))
+        for folder in stale:
+            if folder in passed:
+                store.data[str(folder)] = keys[folder]
+            else:
+                store.data.pop(str(folder), None)
+        store.save()
+
+    if args.slowest > 0 and tests:
+        print_slowest(tests, tree, args.slowest)
+    if cached:
+        print(f"\n{cached} of {len(folders)} test folder(s) skipped: they "
+              "passed before, and nothing they read has changed.")
+    return 0 if code == NO_TESTS_COLLECTED else code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -25,6 +25,15 @@ Safety: a file is rewritten only if its whitespace-normalized text is unchanged.
 The tool only moves newlines; it never adds, drops, or alters a word. If that
 invariant ever fails the file is left untouched and reported.
 
+Incremental: the gate runs the check over the whole book every time, and
+most chapters are already reflowed. A file found settled is recorded under
+a key of its text, the width, and the source of the rules (this file and
+`tools_prose.py`), and skipped while that key holds. In a file that did
+change, each paragraph's reflowed lines are remembered under a fingerprint
+of its text, so only the edited paragraphs are split and wrapped again.
+The files that must be read go to a process pool (`-j`). Both records live
+in `build/cache/`; `--no-cache` ignores them.
+
 Usage:
     uv run python tools/reflow_prose.py                  # check all Chapters/, no write
     uv run python tools/reflow_prose.py --write           # rewrite all Chapters/
@@ -32,6 +41,7 @@ Usage:
     uv run python tools/reflow_prose.py --diff Tour       # diff a chapter by name part
     uv run python tools/reflow_prose.py --write FILE...   # rewrite specific files
     uv run python tools/reflow_prose.py --width 100       # change the wrap width
+    uv run python tools/reflow_prose.py --no-cache        # reflow every paragraph
 
 A positional argument may be a file path or a chapter selector matched against
 Chapters/: a number or stem prefix ("02", "02_A_Python") or a substring ("Tour").
@@ -41,8 +51,12 @@ import argparse
 import difflib
 import re
 import sys
+from collections.abc import Callable
+from itertools import repeat
 from pathlib import Path
 
+import tools_prose
+from tools_cache import JsonCache, cache_file, digest
 from tools_config import CHAPTERS_DIR
 from tools_prose import (
     BLOCKQUOTE,
@@ -59,7 +73,7 @@ from tools_prose import (
     mask,
     unmask,
 )
-from tools_repo import md_files, write_text_lf
+from tools_repo import add_jobs_arg, md_files, write_text_lf
 
 # Sentences wider than this are broken at clause punctuation. Roughly the
 # column at which an editor would otherwise soft-wrap the line.
@@ -272,8 +286,36 @@ def _reflow_text(joined: str, width: int) -> list[str]:
     return result
 
 
-def reflow(text: str, width: int = _DEFAULT_WIDTH) -> tuple[str, int]:
+class Memo:
+    """Each paragraph's reflowed lines, by a fingerprint of its text.
+
+    `known` comes from the file's last run. `used` collects the entries
+    this run needed, found or computed, and replaces `known` when saved,
+    so a paragraph that was edited away does not linger. The fingerprint
+    covers the text and the width it is wrapped to, which is narrower
+    inside a list item or an indented block than at the top level; the
+    caller keeps a memo per --width and rules.
+    """
+
+    def __init__(self, known: dict[str, list[str]] | None = None) -> None:
+        self.known = known or {}
+        self.used: dict[str, list[str]] = {}
+
+    def lines(self, joined: str, width: int,
+              compute: Callable[[str, int], list[str]]) -> list[str]:
+        key = digest(joined, str(width))
+        found = self.known.get(key)
+        if found is None:
+            found = compute(joined, width)
+        self.used[key] = found
+        return found
+
+
+def reflow(text: str, width: int = _DEFAULT_WIDTH,
+           memo: Memo | None = None) -> tuple[str, int]:
     """Return (reflowed_text, paragraphs_reflowed)."""
+    reflow_text = _reflow_text if memo is None else (
+        lambda joined, w: memo.lines(joined, w, _reflow_text))
     lines = text.splitlines(keepends=False)
     out: list[str] = []
     i = 0
@@ -339,7 +381,7 @@ def reflow(text: str, width: int = _DEFAULT_WIDTH) -> tuple[str, int]:
             # Leave items with a hard line break, or with no text, untouched.
             if first_text.strip() and not any(b.endswith("  ") for b in block):
                 joined = " ".join(s.strip() for s in [first_text, *cont] if s.strip())
-                text_lines = _reflow_text(joined, max(20, width - content_col))
+                text_lines = reflow_text(joined, max(20, width - content_col))
                 if text_lines:
                     prefix = indent + bullet + gap
                     pad = " " * content_col
@@ -375,7 +417,7 @@ def reflow(text: str, width: int = _DEFAULT_WIDTH) -> tuple[str, int]:
         pad_len = min(len(pl) - len(pl.lstrip(" ")) for pl in para_lines)
         pad = " " * pad_len
         joined = " ".join(pl.strip() for pl in para_lines)
-        wrapped = _reflow_text(joined, max(20, width - pad_len))
+        wrapped = reflow_text(joined, max(20, width - pad_len))
         new_lines = [pad + w for w in wrapped] or para_lines
         if new_lines != para_lines:
             reflowed += 1
@@ -391,10 +433,27 @@ def _normalize(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
-def process(path: Path, write: bool, show_diff: bool, width: int) -> tuple[bool, int, bool]:
-    """Returns (changed, paragraphs_reflowed, roundtrip_ok)."""
+def rules_key(width: int) -> str:
+    """Everything besides a file's text that decides how it reflows."""
+    return digest(Path(__file__).read_bytes(),
+                  Path(tools_prose.__file__).read_bytes(), str(width))
+
+
+def reflow_file(path: Path, width: int, known: dict[str, list[str]],
+                ) -> tuple[str, str, int, dict[str, list[str]]]:
+    """(original, reflowed, paragraphs reflowed, the paragraph memo used).
+
+    A top-level function, so a process pool can run it.
+    """
     original = path.read_text(encoding="utf-8")
-    reflowed, count = reflow(original, width)
+    memo = Memo(known)
+    reflowed, count = reflow(original, width, memo)
+    return original, reflowed, count, memo.used
+
+
+def process(path: Path, original: str, reflowed: str, write: bool,
+            show_diff: bool) -> tuple[bool, bool]:
+    """Diff or write one reflowed file. Returns (changed, roundtrip_ok)."""
     roundtrip_ok = _normalize(original) == _normalize(reflowed)
     changed = reflowed != original
 
@@ -410,7 +469,80 @@ def process(path: Path, write: bool, show_diff: bool, width: int) -> tuple[bool,
     if write and changed and roundtrip_ok:
         write_text_lf(path, reflowed)
 
-    return changed, count, roundtrip_ok
+    return changed, roundtrip_ok
+
+
+class Records:
+    """The files found settled last time, and each file's paragraph memo.
+
+    Two stores, so the common case (every file settled) never loads the
+    larger one. A file is recorded settled only when reflowing it changed
+    nothing; a file that would change is reflowed again next run, from its
+    memo.
+    """
+
+    def __init__(self, width: int, *, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.rules = rules_key(width)
+        self.settled = JsonCache(cache_file("reflow_prose"), enabled=enabled)
+        self._memos: JsonCache | None = None
+
+    @property
+    def memos(self) -> JsonCache:
+        if self._memos is None:
+            self._memos = JsonCache(cache_file("reflow_prose.paragraphs"),
+                                    enabled=self.enabled)
+        return self._memos
+
+    def file_key(self, path: Path) -> str:
+        return digest(self.rules, path.read_bytes())
+
+    def is_settled(self, path: Path) -> bool:
+        key = self.settled.data.get(str(path.resolve()))
+        return key is not None and key == self.file_key(path)
+
+    def known(self, path: Path) -> dict[str, list[str]]:
+        entry = self.memos.data.get(str(path.resolve()))
+        if not isinstance(entry, dict) or entry.get("rules") != self.rules:
+            return {}
+        return entry["paragraphs"]
+
+    def remember(self, path: Path, used: dict[str, list[str]],
+                 settled: bool) -> None:
+        name = str(path.resolve())
+        self.memos.data[name] = {"rules": self.rules, "paragraphs": used}
+        if settled:
+            self.settled.data[name] = self.file_key(path)
+        else:
+            self.settled.data.pop(name, None)
+
+    def save(self) -> None:
+        self.settled.save()
+        if self._memos is not None:
+            self._memos.save()
+
+
+def reflow_files(files: list[Path], width: int, jobs: int, records: Records,
+                 ) -> list[tuple[Path, str, str, int]]:
+    """Reflow every file not recorded settled, in a pool when several.
+
+    Returns (path, original, reflowed, paragraphs reflowed) per file read.
+    """
+    stale = [p for p in files if not records.is_settled(p)]
+    known = [records.known(p) for p in stale]
+    if len(stale) > 1 and jobs > 1:
+        # Imported here: a settled book or a single chapter never needs it.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as pool:
+            results = list(pool.map(reflow_file, stale, repeat(width), known))
+    else:
+        results = list(map(reflow_file, stale, repeat(width), known))
+    out: list[tuple[Path, str, str, int]] = []
+    for path, (original, reflowed, count, used) in zip(stale, results):
+        records.remember(path, used, reflowed == original)
+        out.append((path, original, reflowed, count))
+    return out
 
 
 def _resolve(selector: str) -> list[Path]:
@@ -432,7 +564,7 @@ def _resolve(selector: str) -> list[Path]:
     return matches
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("paths", nargs="*",
                         help="files or chapter selectors like '02' or 'Tour' "
@@ -441,7 +573,10 @@ def main() -> int:
     parser.add_argument("--diff", action="store_true", help="print a unified diff")
     parser.add_argument("--width", type=int, default=_DEFAULT_WIDTH,
                         help=f"clause-break sentences wider than this (default {_DEFAULT_WIDTH})")
-    args = parser.parse_args()
+    parser.add_argument("--no-cache", action="store_true",
+                        help="reflow every paragraph, ignoring the last run's records")
+    add_jobs_arg(parser, "files")
+    args = parser.parse_args(argv)
 
     if args.paths:
         files = []
@@ -457,8 +592,11 @@ def main() -> int:
     total_changed = 0
     total_paras = 0
     failures: list[Path] = []
-    for path in files:
-        changed, count, ok = process(path, args.write, args.diff, args.width)
+    records = Records(args.width, enabled=not args.no_cache)
+    results = reflow_files(files, args.width, args.jobs, records)
+    records.save()
+    for path, original, reflowed, count in results:
+        changed, ok = process(path, original, reflowed, args.write, args.diff)
         if not ok:
             failures.append(path)
             print(f"SKIP (round-trip failed): {path}")
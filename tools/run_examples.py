@@ -29,6 +29,19 @@ so this script also supports a *baseline* of currently-known failures:
 That makes CI green today and red the moment a change breaks something that
 currently works.
 
+An example that passes is recorded in ``build/cache/run_examples.json`` with
+a hash of its source and of everything it reaches: the sibling modules and
+packages it imports (followed transitively), ``utils/`` helpers, and data
+files it names (``amaze.txt``, ``trash.dat``). The next run skips an example
+whose hash still matches and reports it under "Passed (cached)", so after an
+edit only the examples that could have changed execute. Failures are always
+re-run. ``--no-cache`` runs everything.
+
+Each example's run time is kept in ``build/cache/run_examples.durations.json``
+and the next run starts the slowest ones first, so a long example cannot
+begin last and hold the whole run open by itself. ``--durations N`` prints
+the N slowest at the end, with how far the run was from the best possible.
+
 Usage:
     python tools/run_examples.py                 # run everything (all cores)
     python tools/run_examples.py StateMachine    # only that subtree
@@ -37,16 +50,22 @@ Usage:
     python tools/run_examples.py -j 8            # run 8 examples at once
     python tools/run_examples.py --baseline      # fail only on regressions
     python tools/run_examples.py --write-baseline
+    python tools/run_examples.py --no-cache      # ignore recorded passes
+    python tools/run_examples.py --durations 10  # show the 10 slowest
 """
 
 import argparse
 import fnmatch
+import functools
 import os
 import subprocess
 import sys
+import time
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import tools_trace
+from tools_cache import Durations, JsonCache, cache_file, source_key
 from tools_config import DATA_DIR, INLINE_NORUN_MARKER, NORUN_FILE
 from tools_config import EXAMPLES_TREE as DEFAULT_TREE
 from tools_repo import jobs_arg, load_glob_list, write_text_lf
@@ -81,14 +100,23 @@ def write_baseline(failing: list[str]) -> None:
     write_text_lf(BASELINE_FILE, header + body)
 
 
+def example_key(text: str, path: Path, utils_dir: Path) -> str:
+    """The hash a recorded pass of `path` is valid for.
+
+    Covers the example's own text and every file its import graph reaches
+    in its directory and utils/, so editing a helper re-runs every example
+    that uses it and no other.
+    """
+    return source_key(text, [path.parent, utils_dir])
 
 
 def run_one(
     path: Path, rel: str, timeout: float, utils_dir: Path
-) -> tuple[str, str, str]:
-    """Execute one example as a subprocess. Returns (status, rel, last_stderr).
+) -> tuple[str, str, str, float]:
+    """Execute one example as a subprocess.
 
-    status is "passed", "failed", or "timeout". Examples are independent
+    Returns (status, rel, last_stderr, seconds), where status is "passed",
+    "failed", or "timeout". Examples are independent
     subprocesses with their own cwd, so this is safe to call concurrently. The
     tree's utils/ directory is put on PYTHONPATH so examples can import
     shared helpers (such as display.py) that live there.
@@ -97,8 +125,9 @@ def run_one(
     pythonpath = (str(utils_dir) if not existing
                   else f"{utils_dir}{os.pathsep}{existing}")
     env = {**os.environ, "PYTHONPATH": pythonpath}
+    start = time.perf_counter()
     try:
-        proc = subprocess.run(
+        proc = tools_trace.run(
             [sys.executable, path.name],
             cwd=path.parent,
             env=env,
@@ -108,11 +137,12 @@ def run_one(
             timeout=timeout,
         )
     except subprocess.TimeoutExpired:
-        return ("timeout", rel, "")
+        return ("timeout", rel, "", timeout)
+    seconds = time.perf_counter() - start
     if proc.returncode == 0:
-        return ("passed", rel, "")
+        return ("passed", rel, "", seconds)
     tail = (proc.stderr.strip().splitlines() or ["(no stderr)"])[-1]
-    return ("failed", rel, tail)
+    return ("failed", rel, tail, seconds)
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -131,6 +161,10 @@ def main(argv: list[str] | None = None) -> int:
                     help="fail only on examples not already in the baseline")
     ap.add_argument("--write-baseline", action="store_true",
                     help="record current failures as the baseline and exit 0")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="run every example, ignoring recorded passes")
+    ap.add_argument("--durations", type=int, default=0, metavar="N",
+                    help="print the N slowest examples at the end")
     args = ap.parse_args(argv)
 
     if not args.tree.exists():
@@ -139,8 +173,13 @@ def main(argv: list[str] | None = None) -> int:
         return 2
 
     skips = load_glob_list(NORUN_FILE)
+    store = JsonCache(cache_file("run_examples"), enabled=not args.no_cache)
+    durations = Durations("run_examples")
+    utils_dir = args.tree / "utils"
     py_files = sorted(args.tree.rglob("*.py"))
     passed: list[str] = []
+    cached: list[str] = []
+    keys: dict[str, str] = {}
     failed: list[tuple[str, str]] = []
     pytest_files: list[str] = []
     unattended: list[str] = []
@@ -160,28 +199,48 @@ def main(argv: list[str] | None = None) -> int:
         if is_skipped(rel, text, skips):
             unattended.append(rel)  # GUI/interactive/infinite-loop: norun.txt
             continue
+        if store.enabled:
+            keys[rel] = example_key(text, f, utils_dir)
+            if store.data.get(rel) == keys[rel]:
+                cached.append(rel)  # passed before, nothing it reads changed
+                continue
         to_run.append((f, rel))
 
+    # Longest expected first; results are sorted below, so the order the
+    # examples run in never shows in the report.
+    order = durations.longest_first([rel for _, rel in to_run])
+    to_run = [to_run[i] for i in order]
+
     # Each example is its own subprocess, so threads parallelize cleanly: the
     # work happens in child processes, not under the GIL.
     jobs = max(1, args.jobs)
-    utils_dir = args.tree / "utils"
+    work = functools.partial(run_one, timeout=args.timeout,
+                             utils_dir=utils_dir)
+    paths = [f for f, _ in to_run]
+    rels = [rel for _, rel in to_run]
     if jobs == 1:
-        results = [run_one(f, rel, args.timeout, utils_dir)
-                   for f, rel in to_run]
+        results = list(map(tools_trace.traced(work, "run_examples"),
+                           paths, rels))
     else:
         with ThreadPoolExecutor(max_workers=jobs) as pool:
             results = list(pool.map(
-                lambda fr: run_one(fr[0], fr[1], args.timeout, utils_dir),
-                to_run))
+                tools_trace.traced(work, "run_examples"), paths, rels))
 
-    for status, rel, tail in results:
+    for status, rel, tail, seconds in results:
+        durations.record(rel, seconds)
         if status == "passed":
             passed.append(rel)
         elif status == "timeout":
             timed_out.append(rel)
         else:
             failed.append((rel, tail))
+        if store.enabled:
+            if status == "passed":
+                store.data[rel] = keys[rel]
+            else:
+                store.data.pop(rel, None)
+    store.save()
+    durations.save()
     passed.sort()
     timed_out.sort()
     failed.sort()
@@ -189,6 +248,7 @@ def main(argv: list[str] | None = None) -> int:
     print()
     for label, count in (
         ("Passed:", len(passed)),
+        ("Passed (cached):", len(cached)),
         ("Tested via pytest:", len(pytest_files)),
         ("Can't run unattended:", len(unattended)),
         ("Timeout:", len(timed_out)),
@@ -203,6 +263,7 @@ def main(argv: list[str] | None = None) -> int:
         print("\nFailures (last stderr line):")
         for rel, tail in failed:
             print(f"  F {rel}\n      {tail}")
+    durations.report(jobs, args.durations)
 
     failing = [rel for rel, _ in failed] + timed_out
 
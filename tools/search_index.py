@@ -31,14 +31,22 @@ Usage:
     python tools/search_index.py            # write to build/site/
     python tools/search_index.py -o DIR     # write somewhere else
     python tools/search_index.py --stats    # report size, write nothing
+    python tools/search_index.py --inverted # also write the sharded form
+
+The flat index costs every reader its whole size before the first result.
+`search_inverted.py` builds the alternative, a term dictionary with
+compressed posting lists in shards a client fetches per query, and checks
+it returns exactly what the flat scan does; `--stats` reports both.
 """
 
 import argparse
+import gzip
 import json
 import re
 from pathlib import Path
 from typing import NamedTuple
 
+import search_inverted
 from heading_links import ATTR_BLOCK, EXPLICIT_ID, pandoc_anchor
 from tools_config import BUILD_SITE_DIR as DEFAULT_OUT
 from tools_config import FENCE_ANY_RE as FENCE
@@ -153,14 +161,39 @@ def build(sources: list[Source]) -> list[dict[str, str]]:
 
 
 def write(sources: list[Source], out_dir: Path) -> int:
-    """Write the index; return the number of sections it holds."""
+    """Write the index; return the number of sections it holds.
+
+    A gzipped copy goes beside it for servers that send a `.gz` sibling
+    as-is, as `serve.py` does: the JSON compresses to about a third, and
+    compressing once here beats compressing on every request.
+    """
     records = build(sources)
-    (out_dir / INDEX_NAME).write_text(
-        json.dumps(records, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8")
+    data = json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+    (out_dir / INDEX_NAME).write_text(data, encoding="utf-8")
+    # mtime=0 keeps the bytes identical between builds of the same text.
+    (out_dir / f"{INDEX_NAME}.gz").write_bytes(
+        gzip.compress(data.encode("utf-8"), mtime=0))
     return len(records)
 
 
+def print_inverted_stats(records: list[dict[str, str]]) -> None:
+    """The sharded index's size, by kind of file, for `--stats`."""
+    files = search_inverted.build(records)
+    meta = files["meta.json"]
+    assert isinstance(meta, dict)
+    kinds: dict[str, list[int]] = {}
+    for name, content in files.items():
+        size = len(search_inverted.dumps(content).encode("utf-8"))
+        kinds.setdefault(name.split("-")[0].removesuffix(".json"),
+                         []).append(size)
+    print(f"inverted: {len(meta['terms']):,} terms, "
+          f"{sum(map(sum, kinds.values())) / 1024:.0f} KB in "
+          f"{sum(map(len, kinds.values()))} files")
+    for kind, sizes in kinds.items():
+        print(f"  {kind:<5} {len(sizes):>4} file(s) {sum(sizes) / 1024:>6.0f} KB"
+              f"  (largest {max(sizes) / 1024:.0f} KB)")
+
+
 def default_sources() -> list[Source]:
     """Every chapter, labeled the way `build_site.py` labels it."""
     sources: list[Source] = []
@@ -188,6 +221,10 @@ def main(argv: list[str] | None = None) -> int:
                     help=f"output directory (default: {DEFAULT_OUT})")
     ap.add_argument("--stats", action="store_true",
                     help="report the index size without writing it")
+    ap.add_argument("--inverted", action="store_true",
+                    help=f"also write the sharded inverted index to "
+                         f"{search_inverted.DIR_NAME}/ (see "
+                         f"search_inverted.py)")
     args = ap.parse_args(argv)
     sources = default_sources()
     if args.stats:
@@ -197,12 +234,16 @@ def main(argv: list[str] | None = None) -> int:
         print(f"{len(records)} sections from {len(sources)} chapters")
         print(f"{chars:,} characters of text, "
               f"{len(raw.encode('utf-8')) / 1024:.0f} KB of JSON")
+        print_inverted_stats(records)
         return 0
     if not args.out.is_dir():
         raise SystemExit(f"error: no such directory: {args.out}")
     count = write(sources, args.out)
     print(f"Wrote {INDEX_NAME}: {count} sections "
           f"({(args.out / INDEX_NAME).stat().st_size / 1024:.0f} KB)")
+    if args.inverted:
+        size = search_inverted.write(build(sources), args.out)
+        print(f"Wrote {search_inverted.DIR_NAME}/: {size / 1024:.0f} KB")
     return 0
 
 
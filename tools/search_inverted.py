@@ -0,0 +1,469 @@
+#!/usr/bin/env python
+r"""An inverted, sharded form of the search index, and a query engine for it.
+
+`search_index.py` writes one flat JSON list of sections, and `search.js`
+scans every section's text on each keystroke. That costs the reader the
+whole index up front (1.3 MB today) and a linear scan per query, and both
+grow with every chapter. This module builds the alternative: a term
+dictionary, compressed posting lists, and the section text split out so a
+client fetches only what a query touches.
+
+The layout, under `search/` beside the pages:
+
+    meta.json         every section's url/anchor/label/chapter/heading,
+                      and the sorted term dictionary
+    post-XY.json      {term: postings} for the terms starting with XY
+                      (letters or digits; post-_.json holds the rest)
+    text-NN.json      the body text of chapter NN's sections, for
+                      snippets and for checking what postings cannot
+
+A *term* is a maximal run of word characters (`\w+`) in a section's
+lowercased body. A posting list holds, per section containing the term,
+the section id, the number of times the term occurs there, and a slot
+for each: the term's position among the section's terms, times two,
+plus one when a single space joins it to the next term. Ids and slots
+are delta-encoded and written as unsigned LEB128 varints, base64'd to
+stay JSON: most numbers take one byte.
+
+Results stay identical to the substring scan `search.js` does, which
+matches a query word anywhere, "init" inside "__post_init__" included:
+
+* A query word made of word characters can only occur inside one term,
+  so it occurs in a body exactly when it is a substring of one of the
+  body's terms, and as often as it occurs in those terms. The engine
+  finds the dictionary terms containing it (a binary search when it is
+  a prefix, a scan of the dictionary otherwise; a few thousand short
+  strings either way) and reads only their postings.
+* A phrase of words and single spaces ("frozen data") occurs where a
+  term ending in its first word is joined by a space to one starting
+  with its last, which the slots answer without any text.
+* Anything with punctuation in it ("asyncio.run") narrows to the
+  sections holding all its word pieces, then is checked against those
+  sections' text.
+
+`Engine` is the Python reference for a client; `scan()` is a line-by-line
+port of `search.js`'s scoring over the flat records. `--bench` checks the
+two agree on a list of queries and shows what each query would fetch:
+
+    python tools/search_index.py --inverted      # also write search/
+    python tools/search_index.py --stats         # sizes of both formats
+    python tools/search_inverted.py --bench      # compare with the scan
+"""
+
+import argparse
+import base64
+import bisect
+import json
+import re
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+
+DIR_NAME = "search"
+SHARD_KEYS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+MAX_RESULTS = 40  # search.js's MAX_RESULTS
+
+Record = dict[str, str]
+
+
+# ── encoding ──────────────────────────────────────────────────────────────────
+
+def encode(numbers: Iterable[int]) -> str:
+    """Unsigned LEB128 varints, base64'd: small numbers take one byte."""
+    out = bytearray()
+    for n in numbers:
+        while n >= 0x80:
+            out.append((n & 0x7F) | 0x80)
+            n >>= 7
+        out.append(n)
+    return base64.b64encode(bytes(out)).decode("ascii")
+
+
+def decode(text: str) -> list[int]:
+    numbers: list[int] = []
+    n = shift = 0
+    for byte in base64.b64decode(text):
+        n |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            numbers.append(n)
+            n = shift = 0
+    return numbers
+
+
+def shard_of(term: str) -> str:
+    """Which post-*.json holds `term`: its first two letters or digits.
+
+    Sharding on the leading characters keeps a prefix query to one file,
+    and an as-you-type client grows its query one prefix at a time. A
+    term starting any other way ("_", "é") goes to post-_.json.
+    """
+    key = term[:2]
+    return key if all(c in SHARD_KEYS for c in key) else "_"
+
+
+# ── building ──────────────────────────────────────────────────────────────────
+
+WORD_RE = re.compile(r"\w+")
+
+
+def slots_of(text: str) -> list[tuple[int, str]]:
+    """A body's terms in order, each with its slot.
+
+    A slot is the term's position times two, plus one if exactly one
+    space separates it from the next term.
+    """
+    lowered = text.lower()
+    words = list(WORD_RE.finditer(lowered))
+    slots = []
+    for pos, (word, after) in enumerate(zip(words, [*words[1:], None])):
+        spaced = after is not None and (
+            lowered[word.end():after.start()] == " ")
+        slots.append((2 * pos + spaced, word.group()))
+    return slots
+
+
+def build(records: list[Record]) -> dict[str, object]:
+    """The inverted index of `records`, as {file name: JSON-able content}."""
+    postings: dict[str, dict[int, list[int]]] = defaultdict(dict)
+    for sid, record in enumerate(records):
+        for slot, term in slots_of(record["t"]):
+            postings[term].setdefault(sid, []).append(slot)
+
+    shards: dict[str, dict[str, str]] = defaultdict(dict)
+    for term, by_section in postings.items():
+        numbers: list[int] = []
+        last_sid = 0
+        for sid in sorted(by_section):
+            slots = by_section[sid]
+            numbers += [sid - last_sid, len(slots)]
+            numbers += [b - a for a, b in zip([0, *slots], slots)]
+            last_sid = sid
+        shards[shard_of(term)][term] = encode(numbers)
+
+    # Text shards follow the pages: the hits a reader sees cluster there.
+    pages: dict[str, list[str]] = {}
+    sections = []
+    for record in records:
+        texts = pages.setdefault(record["u"], [])
+        sections.append([record["u"], record["a"], record["l"],
+                         record["c"], record["s"],
+                         list(pages).index(record["u"]), len(texts)])
+        texts.append(record["t"])
+
+    files: dict[str, object] = {
+        "meta.json": {"sections": sections, "terms": sorted(postings)},
+    }
+    for key in sorted(shards):
+        files[f"post-{key}.json"] = shards[key]
+    for n, texts in enumerate(pages.values()):
+        files[f"text-{n:02}.json"] = texts
+    return files
+
+
+def dumps(content: object) -> str:
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+
+
+def write(records: list[Record], out_dir: Path) -> int:
+    """Write the sharded index under out_dir/search/. Returns bytes written."""
+    target = out_dir / DIR_NAME
+    target.mkdir(parents=True, exist_ok=True)
+    total = 0
+    for name, content in build(records).items():
+        data = dumps(content).encode("utf-8")
+        (target / name).write_bytes(data)
+        total += len(data)
+    return total
+
+
+# ── querying: the flat scan search.js does ────────────────────────────────────
+
+def stem(term: str) -> str:
+    """search.js's stem(): drop a plural "s" from a longer term."""
+    if len(term) > 3 and term.endswith("s") and term[-2] != "s":
+        return term[:-1]
+    return term
+
+
+def query_terms(query: str) -> list[str]:
+    return [stem(t) for t in query.lower().split()]
+
+
+def occurrences(haystack: str, needle: str) -> int:
+    """Non-overlapping occurrences, counted only as far as 6, as search.js."""
+    n, at = 0, haystack.find(needle)
+    while at != -1 and n < 6:
+        n += 1
+        at = haystack.find(needle, at + len(needle))
+    return n
+
+
+def scan(records: list[Record], query: str) -> list[int]:
+    """The section ids search.js shows for `query`, best first."""
+    terms = query_terms(query)
+    if not terms:
+        return []
+    phrase = query.lower().strip()
+    hits = []
+    for sid, record in enumerate(records):
+        heading, chapter = record["s"].lower(), record["c"].lower()
+        body = record["t"].lower()
+        total = 0
+        for term in terms:
+            in_body = term in body
+            in_heading, in_chapter = term in heading, term in chapter
+            if not (in_body or in_heading or in_chapter):
+                total = 0
+                break
+            total += 12 * in_heading + 6 * in_chapter
+            if in_body:
+                total += 1 + min(occurrences(body, term), 5)
+        if total and (len(terms) > 1 or len(phrase) > 2):
+            total += 40 * (phrase in heading) + 20 * (phrase in body)
+        if total:
+            hits.append((total, sid))
+    # A stable sort on points alone, as Array.prototype.sort is.
+    hits.sort(key=lambda hit: -hit[0])
+    return [sid for _, sid in hits[:MAX_RESULTS]]
+
+
+# ── querying: the inverted index ──────────────────────────────────────────────
+
+class Engine:
+    """Answers queries from the sharded files, reading shards on demand.
+
+    `loaded` names the files read so far: what a browser client would
+    have fetched. meta.json always, then only the posting shards of
+    candidate terms and the text shards of sections that need checking.
+    """
+
+    def __init__(self, files: dict[str, object]) -> None:
+        self.files = files
+        meta = files["meta.json"]
+        assert isinstance(meta, dict)
+        self.sections: list[list] = meta["sections"]
+        self.terms: list[str] = meta["terms"]
+        self.known = set(self.terms)
+        self.lowered = [(s[4].lower(), s[3].lower()) for s in self.sections]
+        self.loaded: set[str] = {"meta.json"}
+        self._postings: dict[str, dict[int, list[int]]] = {}
+
+    @classmethod
+    def from_dir(cls, out_dir: Path) -> "Engine":
+        target = out_dir / DIR_NAME
+        return cls({p.name: json.loads(p.read_text(encoding="utf-8"))
+                    for p in target.glob("*.json")})
+
+    def _read(self, name: str) -> object:
+        self.loaded.add(name)
+        return self.files[name]
+
+    def body(self, sid: int) -> str:
+        """Section `sid`'s lowercased body text, from its text shard."""
+        page, index = self.sections[sid][5:7]
+        texts = self._read(f"text-{page:02}.json")
+        assert isinstance(texts, list)
+        return texts[index].lower()
+
+    def postings(self, term: str) -> dict[int, list[int]]:
+        """{section id: slots} for one dictionary term, in order."""
+        cached = self._postings.get(term)
+        if cached is not None:
+            return cached
+        shard = self._read(f"post-{shard_of(term)}.json")
+        assert isinstance(shard, dict)
+        numbers = decode(shard[term])
+        result: dict[int, list[int]] = {}
+        i = sid = 0
+        while i < len(numbers):
+            sid += numbers[i]
+            count = numbers[i + 1]
+            slot, slots = 0, []
+            for delta in numbers[i + 2:i + 2 + count]:
+                slot += delta
+                slots.append(slot)
+            result[sid] = slots
+            i += 2 + count
+        self._postings[term] = result
+        return result
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """Dictionary terms starting with `prefix`, by binary search."""
+        lo = hi = bisect.bisect_left(self.terms, prefix)
+        while hi < len(self.terms) and self.terms[hi].startswith(prefix):
+            hi += 1
+        return self.terms[lo:hi]
+
+    def containing(self, fragment: str) -> list[str]:
+        """Dictionary terms with `fragment` anywhere in them."""
+        return [t for t in self.terms if fragment in t]
+
+    def sections_with(self, fragment: str) -> set[int]:
+        """Sections with a term containing the word-character `fragment`."""
+        found: set[int] = set()
+        for term in self.containing(fragment):
+            found.update(self.postings(term))
+        return found
+
+    def narrow(self, text: str, among: set[int]) -> set[int]:
+        """Those of `among` holding every word piece of `text`."""
+        for piece in WORD_RE.findall(text):
+            among = among & self.sections_with(piece)
+        return among
+
+    def body_counts(self, term: str) -> dict[int, int]:
+        """{section id: occurrences of `term` in its body, as far as 6}."""
+        counts: dict[int, int] = {}
+        if WORD_RE.fullmatch(term):
+            for word in self.containing(term):
+                per_word = occurrences(word, term)
+                for sid, slots in self.postings(word).items():
+                    n = counts.get(sid, 0) + per_word * len(slots)
+                    counts[sid] = min(6, n)
+            return counts
+        for sid in sorted(self.narrow(term, set(range(len(self.sections))))):
+            if n := occurrences(self.body(sid), term):
+                counts[sid] = n
+        return counts
+
+    def adjacent(self, words: list[str], among: set[int]) -> set[int]:
+        """Those of `among` whose body has `words` joined by single spaces.
+
+        That is a term ending with words[0], then terms equal to any
+        middle words, then one starting with words[-1], each but the
+        last followed by exactly one space: its slot's low bit.
+        """
+        first, *middle, last = words
+        if any(word not in self.known for word in middle):
+            return set()
+        steps = [[t for t in self.terms if t.endswith(first)],
+                 *([word] for word in middle), self.with_prefix(last)]
+        runs: dict[int, set[int]] = {sid: set() for sid in among}
+        for offset, terms in enumerate(steps):
+            spaced = offset < len(steps) - 1
+            at: dict[int, set[int]] = defaultdict(set)
+            for term in terms:
+                for sid, slots in self.postings(term).items():
+                    if sid in runs:
+                        at[sid].update(
+                            slot >> 1 for slot in slots
+                            if slot & 1 or not spaced)
+            if offset == 0:
+                runs = dict(at)
+                continue
+            runs = {sid: starts for sid in at
+                    if (starts := {p for p in runs[sid]
+                                   if p + offset in at[sid]})}
+        return set(runs)
+
+    def phrase_sections(self, phrase: str, among: set[int]) -> set[int]:
+        """Those of `among` whose body contains `phrase`."""
+        if re.fullmatch(r"\w+(?: \w+)+", phrase):
+            return self.adjacent(phrase.split(" "), among)
+        if WORD_RE.fullmatch(phrase):
+            return set(self.body_counts(phrase)) & among
+        else:
+            among = self.narrow(phrase, among)
+        return {sid for sid in among if phrase in self.body(sid)}
+
+    def search(self, query: str) -> list[int]:
+        """The section ids for `query`, best first, exactly as `scan()`."""
+        terms = query_terms(query)
+        if not terms:
+            return []
+        phrase = query.lower().strip()
+        totals: dict[int, int] | None = None
+        for term in terms:
+            body = self.body_counts(term)
+            scores: dict[int, int] = {}
+            for sid, (heading, chapter) in enumerate(self.lowered):
+                in_heading, in_chapter = term in heading, term in chapter
+                if sid in body or in_heading or in_chapter:
+                    scores[sid] = (12 * in_heading + 6 * in_chapter
+                                   + (1 + min(body[sid], 5) if sid in body
+                                      else 0))
+            if totals is None:
+                totals = scores
+            else:
+                totals = {sid: totals[sid] + points
+                          for sid, points in scores.items() if sid in totals}
+        assert totals is not None
+        if totals and (len(terms) > 1 or len(phrase) > 2):
+            in_body = self.phrase_sections(phrase, set(totals))
+            for sid in totals:
+                totals[sid] += (40 * (phrase in self.lowered[sid][0])
+                                + 20 * (sid in in_body))
+        # Ties keep index order, as Array.prototype.sort is stable.
+        hits = sorted(totals.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [sid for sid, _ in hits[:MAX_RESULTS]]
+
+
+# ── benchmark ─────────────────────────────────────────────────────────────────
+
+QUERIES = [
+    "dataclass", "frozen", "post_init", "__post_init__", "init",
+    "singleton", "factory method", "frozen dataclass", "protocol",
+    "generators", "yield from", "asyncio.run", "x", "the", "str",
+    "immutab", "type hint", "pattern matching", "match case",
+    "class Foo", "a b", "functools", "lru_cache", "decorators",
+]
+
+
+def bench(records: list[Record], queries: list[str]) -> int:
+    """Check each query against the scan; show time and bytes fetched.
+
+    Each query gets a fresh Engine, so "fetched" is what a client with an
+    empty cache downloads to answer it: meta.json plus the posting shards
+    read. The flat index costs its whole size for every one of them.
+    Returns 1 if any query's results differ from the scan's.
+    """
+    files = build(records)
+    sizes = {name: len(dumps(content).encode("utf-8"))
+             for name, content in files.items()}
+    flat = len(dumps(records).encode("utf-8"))
+    print(f"{'query':<20} {'hits':>4} {'scan ms':>8} {'index ms':>8} "
+          f"{'fetched':>9}")
+    mismatches = []
+    for query in queries:
+        start = time.perf_counter()
+        expected = scan(records, query)
+        scan_ms = (time.perf_counter() - start) * 1000
+        engine = Engine(files)
+        start = time.perf_counter()
+        got = engine.search(query)
+        index_ms = (time.perf_counter() - start) * 1000
+        fetched = sum(sizes[name] for name in engine.loaded)
+        flag = "" if got == expected else "  ! differs from the scan"
+        if flag:
+            mismatches.append(query)
+        print(f"{query[:20]:<20} {len(expected):>4} {scan_ms:>8.1f} "
+              f"{index_ms:>8.1f} {fetched // 1024:>6} KB{flag}")
+    print(f"\n{len(queries) - len(mismatches)} of {len(queries)} queries "
+          f"identical to the substring scan; the flat index is "
+          f"{flat // 1024} KB for every query.")
+    return 1 if mismatches else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    import search_index
+
+    ap = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--bench", action="store_true",
+                    help="compare every query with the substring scan")
+    ap.add_argument("queries", nargs="*",
+                    help="queries for --bench (default: a built-in list)")
+    args = ap.parse_args(argv)
+    records = search_index.build(search_index.default_sources())
+    if not args.bench:
+        ap.print_help()
+        return 0
+    return bench(records, args.queries or QUERIES)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,14 +4,22 @@
 `make serve` serves the existing `build/site/`. `make local` builds
 it first, then runs this with `--open --watch`.
 
-With `--watch`, a background thread polls `Chapters/*.md` (and the few
-files the whole site is rendered from: `template.html`, the static
-assets, `build_site.py`, `search_index.py`). A changed chapter takes
+With `--watch`, a background thread watches `Chapters/*.md` (and the
+few files the whole site is rendered from: `template.html`, the static
+assets, `build_site.py`, `search_index.py`). On Linux it sleeps on
+inotify until one of their directories changes; elsewhere, or if inotify
+is unavailable, it polls. A changed chapter takes
 `build_site.rebuild_chapter()`'s incremental path, one pandoc run rather
 than the ~46 of a full build; a changed template or tool rebuilds
-everything. Each served page carries a small script that polls
-`/__reload` and reloads once the rebuild lands, so an edit in the editor
-becomes a refreshed browser page with nothing to press.
+everything. Each served page carries a small script that listens on
+`/__reload`, a server-sent event stream, and reloads the moment a
+rebuild lands, so an edit in the editor becomes a refreshed browser page
+with nothing to press.
+
+Files are served with an ETag, so a reload revalidates unchanged assets
+with a 304 instead of resending them, and a file with a pre-compressed
+`.gz` sibling (`search-index.json.gz`) is sent compressed to a browser
+that accepts gzip.
 
 Usage:
     python tools/serve.py             # serve build/site/ at :8000
@@ -22,9 +30,12 @@ Usage:
 
 import argparse
 import contextlib
+import ctypes
 import functools
 import http.server
 import os
+import select
+import sys
 import threading
 import time
 import webbrowser
@@ -36,6 +47,12 @@ from tools_config import ROOT
 from tools_repo import md_files
 
 POLL_SECONDS = 1.0
+# After the first inotify event, how long to let a burst settle: an
+# editor's save is often a write, a rename, and a chmod.
+SETTLE_SECONDS = 0.1
+# How often an idle reload stream sends a comment, so a dropped
+# connection is noticed and its thread freed.
+KEEPALIVE_SECONDS = 15.0
 RELOAD_PATH = "/__reload"
 
 # Changing one of these rebuilds every page, not one: they are inputs to
@@ -48,22 +65,20 @@ GLOBAL_INPUTS = (
     ROOT / "tools" / "search_index.py",
 )
 
+# EventSource reconnects on its own when the server restarts; the first
+# token it hears on each connection is the baseline to compare against.
 RELOAD_SCRIPT = """
 <script>
 (() => {
   let current = null;
-  const poll = async () => {
-    try {
-      const response = await fetch("%s", {cache: "no-store"});
-      const token = await response.text();
-      if (current === null) current = token;
-      else if (token !== current) location.reload();
-    } catch (error) { /* server restarting; try again next tick */ }
+  const source = new EventSource("%s");
+  source.onmessage = (event) => {
+    if (current === null) current = event.data;
+    else if (event.data !== current) location.reload();
   };
-  setInterval(poll, %d);
 })();
 </script>
-""" % (RELOAD_PATH, int(POLL_SECONDS * 1000))
+""" % RELOAD_PATH
 
 
 def snapshot() -> dict[Path, float]:
@@ -76,30 +91,105 @@ def snapshot() -> dict[Path, float]:
     return out
 
 
+class Inotify:
+    """Linux inotify through ctypes: a blocking wait for directory changes.
+
+    Directories rather than files are watched, since most editors save
+    by writing a new file and renaming it over the old one. Events only
+    wake the watcher; `snapshot()` still decides what changed, so an
+    event for an unrelated file costs one round of stat() calls and
+    nothing more.
+    """
+
+    # From <sys/inotify.h>.
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM
+            | IN_MOVED_TO | IN_CREATE | IN_DELETE)
+
+    def __init__(self, fd: int) -> None:
+        self.fd = fd
+
+    @classmethod
+    def open(cls, dirs: set[Path]) -> "Inotify | None":
+        """Watch `dirs`, or None where inotify is not available."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(cls.IN_NONBLOCK | cls.IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        for folder in sorted(dirs):
+            if libc.inotify_add_watch(fd, os.fsencode(folder),
+                                      cls.MASK) < 0:
+                os.close(fd)
+                return None
+        return cls(fd)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until an event arrives; False if `timeout` ran out first."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(ready)
+
+    def drain(self) -> None:
+        """Discard every pending event."""
+        with contextlib.suppress(BlockingIOError):
+            while os.read(self.fd, 65536):
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
 class Watcher:
-    """Polls the sources and rebuilds, holding a token pages compare against.
+    """Watches the sources and rebuilds, holding a token pages compare against.
 
     `lock` is held across a rebuild so the handler cannot serve a page from
     a directory a full build is in the middle of deleting and rewriting.
+    `changed` is notified whenever the token moves, waking every open
+    reload stream.
     """
 
     def __init__(self, out_dir: Path, chapter_toc: bool) -> None:
         self.out_dir = out_dir
         self.chapter_toc = chapter_toc
         self.lock = threading.RLock()
+        self.changed = threading.Condition()
         self.token = "0"
         self._counter = 0
         self._seen = snapshot()
+        self.events = Inotify.open({p.parent for p in self._seen})
 
     def start(self) -> None:
         threading.Thread(target=self._loop, daemon=True).start()
 
     def _loop(self) -> None:
         while True:
-            time.sleep(POLL_SECONDS)
+            if self.events is not None:
+                self.events.wait()
+                time.sleep(SETTLE_SECONDS)
+                self.events.drain()
+            else:
+                time.sleep(POLL_SECONDS)
             with contextlib.suppress(Exception):
                 self._check()
 
+    def wait_for_change(self, token: str, timeout: float) -> str:
+        """Block until the token differs from `token`, or `timeout` runs out."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.token != token, timeout)
+            return self.token
+
     def _check(self) -> None:
         now = snapshot()
         changed = [p for p, m in now.items() if self._seen.get(p) != m]
@@ -120,20 +210,29 @@ class Watcher:
                         build_site.build(self.out_dir, self.chapter_toc)
                         break
                     print(f"Rebuilt {md.name}")
-            self._counter += 1
-            self.token = str(self._counter)
+            with self.changed:
+                self._counter += 1
+                self.token = str(self._counter)
+                self.changed.notify_all()
         # A rebuild's own writes must not look like a new edit.
         self._seen = snapshot()
 
 
+def etag_of(path: str) -> str:
+    """A validator that changes whenever the file is rewritten."""
+    st = os.stat(path)
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
 class Handler(http.server.SimpleHTTPRequestHandler):
-    """Serves the site, answering /__reload and injecting the poll script."""
+    """Serves the site, streaming /__reload and injecting the reload script."""
 
     watcher: Watcher | None = None
+    etag: str | None = None
 
     def do_GET(self) -> None:  # noqa: N802 (BaseHTTPRequestHandler's name)
         if self.path.split("?")[0] == RELOAD_PATH:
-            self.reply_token()
+            self.reply_events()
             return
         watcher = type(self).watcher
         if watcher is None:
@@ -148,15 +247,87 @@ class Handler(http.server.SimpleHTTPRequestHandler):
             else:
                 super().do_GET()
 
-    def reply_token(self) -> None:
+    def reply_events(self) -> None:
+        """Stream the rebuild token as server-sent events.
+
+        The current token goes out at once, then each new one as a rebuild
+        lands. The request holds its thread until the browser goes away,
+        which the next write after a keepalive interval discovers.
+        """
         watcher = type(self).watcher
-        body = (watcher.token if watcher else "0").encode()
         self.send_response(200)
-        self.send_header("Content-Type", "text/plain; charset=utf-8")
-        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Type", "text/event-stream")
         self.send_header("Cache-Control", "no-store")
         self.end_headers()
-        self.wfile.write(body)
+        token = watcher.token if watcher else "0"
+        with contextlib.suppress(OSError):
+            self.wfile.write(f"data: {token}\n\n".encode())
+            self.wfile.flush()
+            while watcher is not None:
+                latest = watcher.wait_for_change(token, KEEPALIVE_SECONDS)
+                if latest == token:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    token = latest
+                    self.wfile.write(f"data: {token}\n\n".encode())
+                self.wfile.flush()
+
+    def send_head(self):
+        """Add an ETag and the `.gz` variant to the base class's file reply.
+
+        A request whose If-None-Match names the current ETag gets a bare
+        304. Directories, redirects, and missing files are left to the
+        base class.
+        """
+        self.etag = None
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().send_head()
+        gz = f"{path}.gz"
+        if (self.accepts_gzip() and os.path.isfile(gz)
+                and os.stat(gz).st_mtime_ns >= os.stat(path).st_mtime_ns):
+            return self.send_gzipped(path, gz)
+        self.etag = etag_of(path)
+        if self.not_modified():
+            return None
+        return super().send_head()
+
+    def accepts_gzip(self) -> bool:
+        accepted = self.headers.get("Accept-Encoding", "")
+        return "gzip" in {part.split(";")[0].strip()
+                          for part in accepted.split(",")}
+
+    def not_modified(self) -> bool:
+        """Answer 304 if the client already holds this ETag."""
+        held = self.headers.get("If-None-Match")
+        if held is None or self.etag is None:
+            return False
+        if held.strip() != "*" and self.etag not in {
+                tag.strip() for tag in held.split(",")}:
+            return False
+        self.send_response(304)
+        self.end_headers()
+        return True
+
+    def send_gzipped(self, path: str, gz: str):
+        """Send the pre-compressed `gz` as the body of `path`."""
+        # Its own tag: a cache must not confuse the two encodings.
+        self.etag = etag_of(gz).replace('"', '"gz-', 1)
+        if self.not_modified():
+            return None
+        f = open(gz, "rb")  # noqa: SIM115 (the base class closes it)
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        return f
+
+    def end_headers(self) -> None:
+        if self.etag is not None:
+            self.send_header("ETag", self.etag)
+        super().end_headers()
 
     def reply_page(self, path: str) -> None:
         html = Path(path).read_text(encoding="utf-8")
@@ -175,7 +346,7 @@ class Handler(http.server.SimpleHTTPRequestHandler):
         self.wfile.write(body)
 
     def log_message(self, format: str, *args) -> None:
-        # The reload poll would otherwise print a line every second.
+        # One line per open page's reload stream is noise.
         if RELOAD_PATH not in str(args[0] if args else ""):
             super().log_message(format, *args)
 
@@ -201,17 +372,20 @@ def main(argv: list[str] | None = None) -> int:
             f"error: {SITE} not found. Build the site first "
             "(make site, or python tools/build_site.py).")
 
+    watcher = None
     if args.watch:
         build_site.check_pandoc()
-        Handler.watcher = Watcher(SITE, args.chapter_toc)
-        Handler.watcher.start()
+        watcher = Handler.watcher = Watcher(SITE, args.chapter_toc)
+        watcher.start()
 
     handler = functools.partial(Handler, directory=str(SITE))
     server = http.server.ThreadingHTTPServer(("", args.port), handler)
     url = f"http://localhost:{args.port}/"
     print(f"Serving {SITE} at {url}  (Ctrl+C to stop)")
-    if args.watch:
-        print("Watching Chapters/ for edits; pages reload after a rebuild.")
+    if watcher is not None:
+        how = "inotify" if watcher.events else "polling"
+        print(f"Watching Chapters/ for edits ({how}); pages reload after "
+              "a rebuild.")
     if args.open:
         # The server socket is already bound, so the browser will
         # connect even if it loads before serve_forever() runs.
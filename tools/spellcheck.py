@@ -23,6 +23,17 @@ unique unknown word, one per line, sorted, with no locations or counts, so
 the list can be pasted straight into tools/data/wordlist.txt after a quick skim
 for real typos.
 
+The dictionary is not rebuilt on every run. pyspellchecker decompresses
+and counts 160,000 words on construction, about a quarter of a second,
+so the first run writes the known words (dictionary plus wordlist) as
+one sorted file under build/cache/spell/, named for a hash of both.
+Later runs binary-search it in place through mmap, paying only for the
+lookups. A new pyspellchecker or an edited wordlist changes the hash, and
+the next run writes a fresh snapshot. Each chapter's set of prose words
+is cached too, keyed by its text. So a run over one edited chapter
+tokenizes that chapter alone, and a full run fans any stale chapters out
+over a process pool (`-j`).
+
 --add skips that paste step and writes the words into the wordlist file
 directly (merged with what's already there, deduplicated, resorted). It
 still exits 0 either way, since after --add the wordlist is caught up by
@@ -35,23 +46,32 @@ Usage:
     python tools/spellcheck.py --summary     # unique unknowns, by count
     python tools/spellcheck.py --add         # accept every unknown word
     python tools/spellcheck.py Chapters/09_Testing.md
+    python tools/spellcheck.py --no-cache    # rebuild and re-tokenize all
 """
 import argparse
+import importlib.util
+import mmap
 import re
 from collections import Counter
 from pathlib import Path
 
-from spellchecker import SpellChecker
-
+import tools_cache
+import tools_prose
+from tools_cache import JsonCache, cache_file, digest
 from tools_config import DATA_DIR
 from tools_prose import (
     FENCE, HEADING, HTML_COMMENT_CLOSE, HTML_COMMENT_OPEN, LIST_ITEM,
     is_prose_line, mask,
 )
-from tools_repo import add_paths_arg, md_files, write_text_lf
+from tools_repo import add_jobs_arg, add_paths_arg, md_files, write_text_lf
 
 WORDLIST = DATA_DIR / "wordlist.txt"
 
+# What a chapter's cached words depend on besides its own text: the
+# tokenizing code here and the prose classifier it leans on.
+TOKENIZER_TAG = digest(
+    Path(__file__).read_bytes(), Path(tools_prose.__file__).read_bytes())
+
 _ANCHOR = re.compile(r"\{#[^}]*\}")              # a heading's explicit id
 _LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")   # [text](url) -> text
 _URL = re.compile(r"(?:https?://|www\.)\S+")
@@ -128,12 +148,16 @@ def tokens(text: str) -> list[str]:
 
 def collect(path: Path) -> list[tuple[int, str]]:
     """(line_number, word) for every prose word in a file."""
+    return collect_text(path.read_text(encoding="utf-8"))
+
+
+def collect_text(source: str) -> list[tuple[int, str]]:
+    """(line_number, word) for every prose word in a file's text."""
     found: list[tuple[int, str]] = []
     in_fence = False
     in_comment = False
     marker = ""
-    for lineno, line in enumerate(
-            path.read_text(encoding="utf-8").splitlines(), 1):
+    for lineno, line in enumerate(source.splitlines(), 1):
         if in_fence:
             if FENCE.match(line) and line.strip().startswith(marker):
                 in_fence = False
@@ -155,6 +179,151 @@ def collect(path: Path) -> list[tuple[int, str]]:
     return found
 
 
+# ── the dictionary snapshot ──────────────────────────────────────────────────
+
+class WordSet:
+    """A snapshot file: the longest word's length, then sorted words.
+
+    Lookups binary-search the mapped bytes, so opening it costs nothing
+    however large the dictionary. Words are sorted as UTF-8 bytes, the
+    order the search compares in.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.name = path.stem
+        first = self.data.find(b"\n")
+        self.longest = int(self.data[:first])
+        self.start = first + 1
+
+    def __contains__(self, word: str) -> bool:
+        key = word.encode("utf-8")
+        data = self.data
+        lo, hi = self.start, len(data)   # lo always starts a line
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line_start = data.rfind(b"\n", lo, mid) + 1 or lo
+            line_end = data.find(b"\n", line_start)
+            line = data[line_start:line_end]
+            if line == key:
+                return True
+            if line < key:
+                lo = line_end + 1
+            else:
+                hi = line_start
+        return False
+
+    def unknown(self, words: set[str]) -> set[str]:
+        """What `SpellChecker.unknown()` returns for lowercase letter words.
+
+        It never reports a word more than three letters longer than its
+        longest, on the theory that such a word is not one.
+        """
+        return {w for w in words
+                if len(w) <= self.longest + 3 and w not in self}
+
+
+def dictionary_files() -> list[Path]:
+    """pyspellchecker's code and English data, found without importing it."""
+    spec = importlib.util.find_spec("spellchecker")
+    if spec is None or spec.origin is None:
+        raise SystemExit("error: pyspellchecker is not installed (uv sync)")
+    package = Path(spec.origin).parent
+    return [package / "spellchecker.py", package / "resources" / "en.json.gz"]
+
+
+def snapshot_path(wordlist: Path) -> Path:
+    """Where the snapshot for this dictionary and wordlist lives."""
+    parts: list[str | bytes] = [p.read_bytes() for p in dictionary_files()]
+    if wordlist.exists():
+        parts.append(wordlist.read_bytes())
+    return tools_cache.CACHE_DIR / "spell" / f"words-{digest(*parts)}.txt"
+
+
+def write_snapshot(path: Path, accepted: set[str]) -> None:
+    """Build the dictionary the slow way, once, and write what it knows.
+
+    Older snapshots are removed: the wordlist's history is of no use.
+    """
+    from spellchecker import SpellChecker
+
+    spell = SpellChecker()
+    if accepted:
+        spell.word_frequency.load_words(accepted)
+    words = sorted(w.encode("utf-8") for w in spell.word_frequency.dictionary)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for old in path.parent.glob("words-*.txt"):
+        old.unlink()
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(
+        b"%d\n" % spell.word_frequency.longest_word_length
+        + b"\n".join(words) + b"\n")
+    tmp.replace(path)
+
+
+def load_words(wordlist: Path, accepted: set[str],
+               use_cache: bool = True) -> WordSet:
+    """The snapshot for `wordlist`, written first if it is missing."""
+    path = snapshot_path(wordlist)
+    if not use_cache or not path.is_file():
+        write_snapshot(path, accepted)
+    return WordSet(path)
+
+
+# ── per-chapter words ─────────────────────────────────────────────────────────
+
+def chapter_unknowns(paths: list[Path], known: WordSet, jobs: int,
+                     use_cache: bool = True,
+                     ) -> tuple[dict[Path, set[str]],
+                                dict[Path, list[tuple[int, str]]]]:
+    """Each file's unknown words, and the full hits of the files read.
+
+    The cache keeps, per file, its text's key, its distinct prose words,
+    and which of them the snapshot did not know. An unchanged file under
+    an unchanged snapshot costs no tokenizing and no lookups; under a new
+    snapshot (an edited wordlist) it costs lookups only. Files that must
+    be tokenized go to a process pool when there are several.
+    """
+    store = JsonCache(cache_file("spellcheck"), enabled=use_cache)
+    unknown: dict[Path, set[str]] = {}
+    words: dict[Path, set[str]] = {}
+    stale: list[Path] = []
+    keys: dict[Path, str] = {}
+    for path in paths:
+        keys[path] = digest(TOKENIZER_TAG, path.read_bytes())
+        entry = store.data.get(str(path.resolve()))
+        if not isinstance(entry, dict) or entry.get("key") != keys[path]:
+            stale.append(path)
+        elif entry["snapshot"] == known.name:
+            unknown[path] = set(entry["unknown"])
+        else:
+            words[path] = set(entry["words"])
+
+    hits: dict[Path, list[tuple[int, str]]] = {}
+    if len(stale) > 1 and jobs > 1:
+        # Imported here: a one-chapter run never needs it, and it costs
+        # more to import than that run costs to check.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as pool:
+            hits = dict(zip(stale, pool.map(collect, stale)))
+    else:
+        hits = {path: collect(path) for path in stale}
+    for path, found in hits.items():
+        words[path] = {w for _, w in found}
+
+    for path, distinct in words.items():
+        unknown[path] = known.unknown(distinct)
+        store.data[str(path.resolve())] = {
+            "key": keys[path], "snapshot": known.name,
+            "words": sorted(distinct), "unknown": sorted(unknown[path]),
+        }
+    if words:
+        store.save()
+    return unknown, hits
+
+
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(
         description=__doc__,
@@ -167,16 +336,23 @@ def main(argv: list[str] | None = None) -> int:
     ap.add_argument("--add", action="store_true",
                     help="write every unknown word into --wordlist "
                          "(sorted, deduplicated) instead of reporting them")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="rebuild the dictionary snapshot and re-tokenize "
+                         "every file")
+    add_jobs_arg(ap, "files")
     args = ap.parse_args(argv)
 
-    spell = SpellChecker()
     accepted = load_wordlist(args.wordlist)
-    if accepted:
-        spell.word_frequency.load_words(accepted)
+    known = load_words(args.wordlist, accepted, not args.no_cache)
 
-    per_file = {p: collect(p) for p in md_files(args.paths)}
-    every_word = {w for hits in per_file.values() for _, w in hits}
-    unknown = spell.unknown(every_word) - accepted
+    paths = md_files(args.paths)
+    per_path, read = chapter_unknowns(paths, known, args.jobs,
+                                      not args.no_cache)
+    unknown = set().union(*per_path.values()) - accepted
+    # Line numbers are needed only where an unknown word is; a file
+    # answered from the cache is read again just for those.
+    per_file = {p: read[p] if p in read else collect(p)
+                for p in paths if per_path[p] & unknown}
 
     if args.add:
         if not unknown:
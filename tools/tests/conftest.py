@@ -18,4 +18,20 @@ exists to prevent (see tools_repo.py's docstring).
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(autouse=True)
+def private_cache_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Point tools_cache at a per-test directory.
+
+    A test that runs a cached tool must neither read a pass recorded by
+    a real run under build/cache/ nor leave its own behind there.
+    """
+    import tools_cache
+
+    monkeypatch.setattr(tools_cache, "CACHE_DIR", tmp_path / "cache")
@@ -0,0 +1,102 @@
+"""Tests for tools/benchmark_history.py and its runner, tools_benchmark.py."""
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+import benchmark_history
+from benchmark_history import baseline, change, on_version
+from tools_config import ROOT
+
+# Reports whatever value.txt beside it holds, as the book's listings do.
+LISTING = """\
+from pathlib import Path
+
+from benchmark import report
+
+report(cost=float(Path("value.txt").read_text()))
+print("claim holds: True")
+"""
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    root = tmp_path / "examples"
+    (root / "utils").mkdir(parents=True)
+    shutil.copy(ROOT / "Examples" / "utils" / "benchmark.py", root / "utils")
+    (root / "18_Perf").mkdir()
+    (root / "18_Perf" / "timed.py").write_text(LISTING, encoding="utf-8")
+    (root / "18_Perf" / "plain.py").write_text("print(1)\n", encoding="utf-8")
+    return root
+
+
+def measure(tree: Path, value: float, *extra: str) -> int:
+    (tree / "18_Perf" / "value.txt").write_text(str(value), encoding="utf-8")
+    return benchmark_history.main(
+        ["--tree", str(tree), "--repeat", "2",
+         "--history", str(tree.parent / "history.jsonl"), *extra])
+
+
+def test_only_a_clean_shift_past_the_threshold_is_flagged() -> None:
+    assert change([1.0, 1.1], [1.3, 1.4], 0.1) == pytest.approx((0.2857, True),
+                                                                rel=1e-3)
+    assert change([1.0, 1.4], [1.3, 1.4], 0.1)[1] is False  # Overlapping
+    assert change([1.0, 1.0], [1.05, 1.05], 0.1)[1] is False  # Too small
+    assert change([2.0, 2.0], [1.0, 1.0], 0.1) == (-0.5, True)
+
+
+def test_measurements_are_recorded_and_compared(tree: Path) -> None:
+    assert measure(tree, 1.0) == 0
+    history = tree.parent / "history.jsonl"
+    records = [json.loads(line) for line in history.read_text().splitlines()]
+    assert [(r["listing"], r["metric"], r["run"], r["value"])
+            for r in records] == [("18_Perf/timed.py", "cost", 0, 1.0),
+                                  ("18_Perf/timed.py", "cost", 1, 1.0)]
+    assert {"python", "build", "machine", "cpus"} <= records[0].keys()
+    assert measure(tree, 1.0) == 0
+    assert measure(tree, 2.0, "--no-record") == 1
+    assert len(history.read_text().splitlines()) == 4
+    assert measure(tree, 2.0, "--against", "2.7") == 0  # Nothing to compare
+
+
+def test_a_failing_listing_fails_the_run(tree: Path) -> None:
+    assert measure(tree, 1.0, "--no-record") == 0
+    (tree / "18_Perf" / "value.txt").unlink()
+    assert benchmark_history.main(
+        ["--tree", str(tree), "--repeat", "1", "--no-record",
+         "--history", str(tree.parent / "history.jsonl")]) == 1
+
+
+def record(session: str, python: str, value: float, **host: object) -> dict:
+    return {"session": session, "listing": "a.py", "metric": "t",
+            "value": value, "python": python, "build": f"{python} (main)",
+            "machine": "x86_64", "cpus": 8, **host}
+
+
+def test_against_matches_whole_version_components() -> None:
+    assert on_version(record("s", "3.14.0", 1.0), "3.14")
+    assert on_version(record("s", "3.14.0", 1.0), "3")
+    assert not on_version(record("s", "3.140.0", 1.0), "3.14")
+    free = record("s", "3.14.0", 1.0, build="3.14.0 (main) free-threading")
+    assert not on_version(free, "3.14")
+    assert on_version(free, "3.14t")
+
+
+def test_baseline_takes_only_sessions_on_the_same_host() -> None:
+    records = [record("1", "3.14.0", 1.0),
+               record("2", "3.14.0", 5.0, machine="arm64"),
+               record("3", "3.14.0", 9.0, cpus=2)]
+    here = {"machine": "x86_64", "cpus": 8}
+    assert baseline(records, None, here) == {("a.py", "t"): [1.0]}
+    assert baseline(records, None) == {("a.py", "t"): [9.0]}
+
+
+def test_another_machines_history_is_not_compared(tree: Path) -> None:
+    assert measure(tree, 1.0) == 0
+    history = tree.parent / "history.jsonl"
+    moved = [{**json.loads(line), "machine": "elsewhere"}
+             for line in history.read_text().splitlines()]
+    history.write_text("".join(json.dumps(r) + "\n" for r in moved))
+    assert measure(tree, 2.0, "--no-record") == 0
+    assert measure(tree, 2.0, "--no-record", "--any-machine") == 1
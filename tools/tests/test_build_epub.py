@@ -6,8 +6,13 @@ built file looks wrong when that goes bad, the link just opens the wrong
 chapter, so the namespacing and relinking are covered here rather than
 left to a reader to notice.
 """
+import os
+import sys
 from pathlib import Path
 
+import pytest
+
+import build_epub
 from build_epub import (
     MAX_HANG_INDENT,
     Ids,
@@ -19,6 +24,7 @@ from build_epub import (
     listing_html,
     namespace_headings,
     outside_code,
+    rasterize_svgs,
     relink,
     title_anchor,
 )
@@ -244,3 +250,89 @@ def test_a_text_fence_is_converted_too() -> None:
 
 def test_text_with_no_fence_is_returned_unchanged() -> None:
     assert hang_listings("Just prose.\n") == "Just prose.\n"
+
+# ── cached SVG rasterization ──────────────────────────────────────────────────
+
+posix_only = pytest.mark.skipif(
+    sys.platform == "win32", reason="the rsvg-convert stub is a POSIX script")
+
+# Stands in for rsvg-convert: "converts" by copying, logs each call, and
+# fails on a file whose text asks it to.
+RSVG_STUB = f"""#!{sys.executable}
+import os, shutil, sys
+src, dst = sys.argv[-1], sys.argv[sys.argv.index("-o") + 1]
+with open(os.environ["RSVG_STUB_LOG"], "a") as log:
+    log.write(src + "\\n")
+if "broken" in open(src).read():
+    raise SystemExit(1)
+shutil.copyfile(src, dst)
+"""
+
+@pytest.fixture
+def svg_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Two diagrams and a stub rsvg-convert first on PATH."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "rsvg-convert"
+    stub.write_text(RSVG_STUB, encoding="utf-8")
+    stub.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("RSVG_STUB_LOG", str(tmp_path / "rsvg.log"))
+    images = tmp_path / "_images"
+    images.mkdir()
+    for stem in ("a", "b"):
+        (images / f"{stem}.svg").write_text(f"<svg>{stem}</svg>",
+                                            encoding="utf-8")
+    monkeypatch.setattr(build_epub, "IMAGES_SRC", images)
+    return images
+
+def conversions(images: Path) -> int:
+    log = images.parent / "rsvg.log"
+    count = len(log.read_text(encoding="utf-8").splitlines()) \
+        if log.exists() else 0
+    log.unlink(missing_ok=True)
+    return count
+
+@posix_only
+def test_a_rebuild_converts_nothing(svg_dir: Path, tmp_path: Path) -> None:
+    img_map = {"a": "a.svg", "b": "b.svg"}
+    out, notes = rasterize_svgs(img_map, tmp_path / "s1", jobs=2)
+    assert out == {"a": "a.png", "b": "b.png"}
+    assert conversions(svg_dir) == 2
+    out, notes = rasterize_svgs(img_map, tmp_path / "s2", jobs=2)
+    assert out == {"a": "a.png", "b": "b.png"}
+    assert (tmp_path / "s2" / "b.png").read_text() == "<svg>b</svg>"
+    assert conversions(svg_dir) == 0
+    assert "2 cached, 0 converted" in notes[0]
+
+@posix_only
+def test_an_edited_diagram_is_converted_again(
+        svg_dir: Path, tmp_path: Path) -> None:
+    img_map = {"a": "a.svg", "b": "b.svg"}
+    rasterize_svgs(img_map, tmp_path / "s1")
+    conversions(svg_dir)
+    (svg_dir / "b.svg").write_text("<svg>b2</svg>", encoding="utf-8")
+    _, notes = rasterize_svgs(img_map, tmp_path / "s2")
+    assert conversions(svg_dir) == 1
+    assert "1 cached, 1 converted" in notes[0]
+
+@posix_only
+def test_a_shared_conversion_is_not_counted_as_cached(
+        svg_dir: Path, tmp_path: Path) -> None:
+    (svg_dir / "c.svg").write_text("<svg>a</svg>", encoding="utf-8")
+    img_map = {"a": "a.svg", "b": "b.svg", "c": "c.svg"}
+    _, notes = rasterize_svgs(img_map, tmp_path / "s1")
+    assert conversions(svg_dir) == 2
+    assert "0 cached, 2 converted" in notes[0]
+
+@posix_only
+def test_a_failed_conversion_stays_svg_and_is_not_cached(
+        svg_dir: Path, tmp_path: Path) -> None:
+    (svg_dir / "b.svg").write_text("<svg>broken</svg>", encoding="utf-8")
+    img_map = {"a": "a.svg", "b": "b.svg"}
+    out, notes = rasterize_svgs(img_map, tmp_path / "s1")
+    assert out == {"a": "a.png", "b": "b.svg"}
+    assert "stay SVG: b.svg" in notes[-1]
+    conversions(svg_dir)
+    rasterize_svgs(img_map, tmp_path / "s2")
+    assert conversions(svg_dir) == 1  # only the failure is retried
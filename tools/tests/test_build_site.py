@@ -0,0 +1,99 @@
+"""Tests for tools/build_site.py (the incremental, parallel page build).
+
+pandoc is replaced by a stub script on PATH that logs each render, so the
+tests can count how many pages a build actually sent through pandoc.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+import build_site
+from tools_config import CHAPTERS_DIR
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="the pandoc stub is a POSIX script"
+)
+
+STUB = f"""#!{sys.executable}
+import os, sys
+if "--version" in sys.argv:
+    print("pandoc 0.0-stub")
+    raise SystemExit
+body = sys.stdin.read()
+with open(os.environ["PANDOC_STUB_LOG"], "a") as log:
+    log.write("render\\n")
+print("<html>" + body[:40] + "</html>")
+"""
+
+
+@pytest.fixture
+def stub_pandoc(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> Path:
+    """Put the stub first on PATH; return the file it logs renders to."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    pandoc = bin_dir / "pandoc"
+    pandoc.write_text(STUB, encoding="utf-8")
+    pandoc.chmod(0o755)
+    log = tmp_path / "renders.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("PANDOC_STUB_LOG", str(log))
+    # Three chapters keep the test quick; the logic is per page.
+    chapters = sorted(CHAPTERS_DIR.glob("*.md"))[:3]
+    monkeypatch.setattr(build_site, "md_files", lambda: chapters)
+    return log
+
+
+def renders(log: Path) -> int:
+    count = len(log.read_text(encoding="utf-8").splitlines())
+    log.write_text("", encoding="utf-8")
+    return count
+
+
+def test_unchanged_pages_are_not_rendered_again(
+    tmp_path: Path, stub_pandoc: Path,
+) -> None:
+    out = tmp_path / "site"
+    assert build_site.build(out, jobs=2) == 0
+    assert renders(stub_pandoc) == 3
+    assert build_site.build(out, jobs=2) == 0
+    assert renders(stub_pandoc) == 0
+    assert build_site.build(out, jobs=2, force=True) == 0
+    assert renders(stub_pandoc) == 3
+
+
+def test_a_deleted_page_is_rendered_again(
+    tmp_path: Path, stub_pandoc: Path,
+) -> None:
+    out = tmp_path / "site"
+    build_site.build(out, jobs=2)
+    renders(stub_pandoc)
+    next(out.glob("0*.html")).unlink()
+    build_site.build(out, jobs=2)
+    assert renders(stub_pandoc) == 1
+
+
+def test_toc_setting_is_part_of_the_key(
+    tmp_path: Path, stub_pandoc: Path,
+) -> None:
+    out = tmp_path / "site"
+    build_site.build(out, chapter_toc=True, jobs=2)
+    renders(stub_pandoc)
+    build_site.build(out, chapter_toc=False, jobs=2)
+    assert renders(stub_pandoc) == 3
+
+
+def test_pages_no_chapter_produces_are_removed(
+    tmp_path: Path, stub_pandoc: Path,
+) -> None:
+    out = tmp_path / "site"
+    build_site.build(out, jobs=2)
+    stray = out / "99_Renamed_Away.html"
+    stray.write_text("old", encoding="utf-8")
+    build_site.build(out, jobs=2)
+    assert not stray.exists()
+    assert (out / "index.html").exists()
@@ -113,6 +113,18 @@ def test_main_selects_a_single_check(
     assert main(["listings", "--paths", str(tmp_path)]) == 1
     assert "from 1 check(s)." in capsys.readouterr().out
 
+def test_main_profile_times_each_selected_check(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    (tmp_path / "ch.md").write_text("Fine.\n", encoding="utf-8")
+    assert main(["listings", "banned", "--profile",
+                 "--paths", str(tmp_path)]) == 0
+    out = capsys.readouterr().out
+    profile = out[out.index("Profile ("):]
+    for name in ("listings", "banned", "(parse)"):
+        assert f"  {name} " in profile
+    assert "prose-lint" not in profile
+
 # ── the three later conversions ───────────────────────────────────────────────
 
 def test_anchors_check_finds_a_dangling_link(tmp_path: Path) -> None:
@@ -0,0 +1,60 @@
+"""Tests for tools/check_chapter.py's temporary per-chapter tree."""
+import tomllib
+from pathlib import Path
+
+import check_chapter
+from extract_examples import extract
+from pytest_examples import directory_key
+from tools_extract import ExtractedFile, ExtractResult
+
+
+def extracted(*paths: str) -> ExtractResult:
+    result = ExtractResult()
+    for rel in paths:
+        result.files[rel] = ExtractedFile(rel, f"# {rel}\n", "x.md", "python")
+    return result
+
+
+def test_the_tree_holds_only_the_chapter_and_utils(tmp_path: Path) -> None:
+    result = extracted("12_Twelve/a.py", "12_Twelve/sub/test_b.py",
+                       "13_Thirteen/c.py", "utils/u.py")
+    assert check_chapter.chapter_tree(result, "12_Twelve", tmp_path)
+    written = sorted(p.relative_to(tmp_path).as_posix()
+                     for p in tmp_path.rglob("*") if p.is_file())
+    assert written == ["12_Twelve/a.py", "12_Twelve/sub/test_b.py",
+                       "utils/u.py"]
+    assert not check_chapter.chapter_tree(result, "01_Prose", tmp_path / "x")
+
+
+def test_test_keys_match_what_make_test_records(tmp_path: Path) -> None:
+    # The same files in the temp tree and in build/examples/ hash alike,
+    # so a pass recorded by either counts for the other.
+    result = extracted("12_Twelve/test_a.py", "12_Twelve/a.py", "utils/u.py")
+    for root in (tmp_path / "tmp", tmp_path / "examples"):
+        check_chapter.chapter_tree(result, "12_Twelve", root)
+    (record,) = check_chapter.test_keys(tmp_path / "tmp", "12_Twelve").items()
+    name, key = record
+    assert name == str(check_chapter.EXAMPLES_TREE.resolve() / "12_Twelve")
+    examples = tmp_path / "examples"
+    assert key == directory_key(examples / "12_Twelve", examples)
+
+
+def test_toml_lines_round_trip() -> None:
+    table = {"environment": {"extra-paths": ["a", "b"],
+                             "python-version": "3.15"},
+             "rules": {"x": "warn"},
+             "overrides": [{"include": ["t/"], "rules": {"y": "ignore"}}]}
+    assert tomllib.loads("\n".join(check_chapter.toml_lines(table))) == table
+
+
+def test_ty_resolves_chapter_6s_package_in_the_temp_tree(
+        tmp_path: Path) -> None:
+    # a_package/module4.py imports `.module1`, which resolves only when
+    # the chapter's own directory is an import root in the temp tree.
+    chapter = "06_Modules_and_Packages"
+    result = extract()
+    assert check_chapter.chapter_tree(result, chapter, tmp_path,
+                                      check_chapter.shared_roots())
+    passed, output, _ = check_chapter.run_tool(
+        check_chapter.ty_command(tmp_path, chapter))
+    assert passed, output
@@ -0,0 +1,152 @@
+"""Tests for tools/check_links.py, end to end against a local server.
+
+The stand-in answers the ways real sites do: 200, 404, 405 to HEAD only,
+a redirect, and a response slower than the timeout. It speaks HTTP/1.1
+keep-alive and counts connections and concurrent requests, so connection
+reuse and the per-host limit are observable. It also answers a request
+for an absolute URL, the way a forward proxy is asked, and records it.
+"""
+import http.server
+import threading
+import time
+from collections.abc import Iterator
+from urllib.parse import urlsplit
+
+import pytest
+
+from check_links import check
+from tools_cache import JsonCache, cache_file
+
+
+class StandIn(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    in_flight = 0
+    most_in_flight = 0
+    targets: list[str] = []
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with StandIn.lock:
+            StandIn.connections += 1
+
+    def reply(self, status: int, body: bytes = b"",
+              **headers: str) -> None:
+        if urlsplit(self.path).path.startswith("/slow"):
+            time.sleep(0.5)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def busy(self) -> None:
+        """A short request that records how many overlap it."""
+        with StandIn.lock:
+            StandIn.in_flight += 1
+            StandIn.most_in_flight = max(StandIn.most_in_flight,
+                                         StandIn.in_flight)
+        time.sleep(0.05)
+        with StandIn.lock:
+            StandIn.in_flight -= 1
+        self.reply(200)
+
+    def route(self) -> None:
+        StandIn.targets.append(self.path)
+        match urlsplit(self.path).path:
+            case "/missing":
+                self.reply(404, b"gone")
+            case "/no-head" if self.command == "HEAD":
+                self.reply(405)
+            case "/moved":
+                self.reply(301, Location="/ok")
+            case "/moved-dead":
+                self.reply(302, Location="/missing")
+            case "/loop":
+                self.reply(302, Location="/loop")
+            case busy if busy.startswith("/busy"):
+                self.busy()
+            case _:
+                self.reply(200, b"<html>fine</html>")
+
+    do_HEAD = do_GET = route  # noqa: N815 (BaseHTTPRequestHandler's names)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def base() -> Iterator[str]:
+    StandIn.connections = StandIn.in_flight = StandIn.most_in_flight = 0
+    StandIn.targets = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, args=(0.05,),
+                     daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def run(urls: list[str], per_host: int = 4,
+        timeout: float = 2.0) -> dict[str, str | None]:
+    store = JsonCache(cache_file("check_links"))
+    outcomes, _, _ = check(urls, timeout, per_host, store, ttl_days=7)
+    return outcomes
+
+
+def test_statuses_redirects_and_head_fallback(base: str) -> None:
+    outcomes = run([f"{base}{p}" for p in (
+        "/ok", "/missing", "/no-head", "/moved", "/moved-dead", "/loop")])
+    assert outcomes == {
+        f"{base}/ok": None,
+        f"{base}/missing": "HTTP 404",
+        f"{base}/no-head": None,
+        f"{base}/moved": None,
+        f"{base}/moved-dead": "HTTP 404",
+        f"{base}/loop": "TooManyRedirects",
+    }
+
+
+def test_a_slow_response_times_out(base: str) -> None:
+    assert run([f"{base}/slow"], timeout=0.2) == {
+        f"{base}/slow": "TimeoutError"}
+
+
+def test_waiting_for_a_host_slot_does_not_count_against_the_timeout(
+        base: str) -> None:
+    # One at a time, four 0.5s responses take 2s; each is within 0.8s.
+    urls = [f"{base}/slow{n}" for n in range(4)]
+    assert run(urls, per_host=1, timeout=0.8) == dict.fromkeys(urls)
+
+
+def test_plain_http_goes_through_the_proxy_named_in_the_environment(
+        base: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("HTTP_PROXY", "NO_PROXY", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("http_proxy", base)
+    assert run(["http://links.invalid/missing"]) == {
+        "http://links.invalid/missing": "HTTP 404"}
+    assert StandIn.targets == ["http://links.invalid/missing"] * 2
+
+
+def test_connections_are_kept_alive_and_limited_per_host(base: str) -> None:
+    urls = [f"{base}/busy{n}" for n in range(12)]
+    store = JsonCache(cache_file("check_links"))
+    outcomes, _, opened = check(urls, 2.0, 2, store, ttl_days=7)
+    assert set(outcomes.values()) == {None}
+    assert StandIn.most_in_flight <= 2
+    assert opened == StandIn.connections == 2
+
+
+def test_only_stale_and_failing_urls_are_probed_again(base: str) -> None:
+    urls = [f"{base}/ok", f"{base}/missing"]
+    run(urls)
+    store = JsonCache(cache_file("check_links"))
+    outcomes, cached, opened = check(urls, 2.0, 4, store, ttl_days=7)
+    assert cached == 1 and opened == 1
+    assert outcomes[f"{base}/missing"] == "HTTP 404"
+    _, cached, _ = check(urls, 2.0, 4, store, ttl_days=0)
+    assert cached == 0
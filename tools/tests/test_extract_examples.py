@@ -0,0 +1,88 @@
+"""Tests for tools/extract_examples.py (incremental --write and manifest)."""
+from pathlib import Path
+
+import pytest
+
+import extract_examples
+from extract_examples import (
+    changed_files,
+    manifest_path,
+    prune_tree,
+    write_tree_incremental,
+)
+from tools_extract import ExtractResult, extract
+from tools_markdown import Block, Document
+
+
+def chapter_route(doc: Document, block: Block) -> str | None:
+    slug = block.slug
+    return None if slug is None else f"{doc.path.stem}/{slug}"
+
+
+def result_of(text: str) -> ExtractResult:
+    doc = Document.from_text(text, Path("08_Decorators.md"))
+    return extract([doc], [chapter_route])
+
+
+def test_prune_tree_deletes_only_unproduced_files(tmp_path: Path) -> None:
+    result = result_of("```python\n# a.py\nx = 1\n```\n")
+    chapter = tmp_path / "08_Decorators"
+    (chapter / "__pycache__").mkdir(parents=True)
+    (chapter / "a.py").write_text("x = 1\n", encoding="utf-8")
+    (chapter / "__pycache__" / "a.pyc").write_bytes(b"")
+    (tmp_path / "gone").mkdir()
+    (tmp_path / "gone" / "old.py").write_text("", encoding="utf-8")
+
+    assert prune_tree(result, tmp_path) == ["gone/old.py"]
+    assert not (tmp_path / "gone").exists()
+    assert (chapter / "__pycache__" / "a.pyc").exists()
+
+
+def test_manifest_lists_written_and_deleted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Only a tree under build/ is derived, and so pruned.
+    monkeypatch.setattr(extract_examples, "BUILD_DIR", tmp_path / "build")
+    out = tmp_path / "build" / "examples"
+    write_tree_incremental(result_of("```python\n# a.py\nx = 1\n```\n"), out)
+    (out / "08_Decorators" / "stray.py").write_text("", encoding="utf-8")
+    write_tree_incremental(result_of("```python\n# b.py\ny = 1\n```\n"), out)
+
+    lines = manifest_path(out).read_text(encoding="utf-8").splitlines()
+    assert lines == [
+        "M 08_Decorators/b.py",
+        "D 08_Decorators/a.py",
+        "D 08_Decorators/stray.py",
+    ]
+    assert changed_files(out) == [out / "08_Decorators" / "b.py"]
+
+
+def test_changed_files_without_a_manifest_is_unknown(tmp_path: Path) -> None:
+    assert changed_files(tmp_path / "examples") is None
+
+
+def test_manifest_accumulates_until_cleared(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(extract_examples, "BUILD_DIR", tmp_path / "build")
+    out = tmp_path / "build" / "examples"
+    chapter = out / "08_Decorators"
+    write_tree_incremental(result_of("```python\n# a.py\nx = 1\n```\n"), out)
+    write_tree_incremental(result_of(
+        "```python\n# a.py\nx = 1\n```\n```python\n# b.py\ny = 1\n```\n"),
+        out)
+    assert changed_files(out) == [chapter / "a.py", chapter / "b.py"]
+
+    assert extract_examples.main(["--clear", "-o", str(out)]) == 0
+    assert changed_files(out) == []
+
+
+def test_a_tree_outside_build_gets_no_manifest(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(extract_examples, "BUILD_DIR", tmp_path / "build")
+    out = tmp_path / "Examples"
+    write_tree_incremental(result_of("```python\n# a.py\nx = 1\n```\n"), out)
+    assert extract_examples.main(["--clear", "-o", str(out)]) == 0
+    assert (out / "08_Decorators" / "a.py").exists()
+    assert not manifest_path(out).exists()
@@ -1,6 +1,10 @@
-"""Tests for tools/fix_imports.py (the pure splicing logic)."""
+"""Tests for tools/fix_imports.py (the splicing logic and its records)."""
+import sys
 from pathlib import Path
 
+import pytest
+
+import fix_imports
 from fix_imports import block_slug, collect_markdown, splice_markdown
 
 
@@ -115,3 +119,74 @@ def test_collect_markdown_directory(tmp_path: Path) -> None:
     a.write_text("", encoding="utf-8")
     b.write_text("", encoding="utf-8")
     assert set(collect_markdown([tmp_path])) == {a, b}
+
+
+# ── main: only changed listings reach ruff ────────────────────────────────────
+
+# Stands in for ruff: "sorts" `import b, a` in every file it is given,
+# logging how many it was given.
+FAKE_RUFF = """\
+import sys
+from pathlib import Path
+log, command = sys.argv[1], sys.argv[2:]
+targets = [Path(a) for a in command[command.index('I,F401') + 1:]]
+with open(log, 'a') as f:
+    f.write(f"{len(targets)}\\n")
+for t in targets:
+    t.write_text(t.read_text().replace('import b, a', 'import a, b'))
+"""
+
+
+@pytest.fixture
+def book(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    script = tmp_path / "ruff.py"
+    script.write_text(FAKE_RUFF, encoding="utf-8")
+    log = tmp_path / "ruff.log"
+    monkeypatch.setattr(fix_imports, "find_ruff",
+                        lambda: [sys.executable, str(script), str(log)])
+    (tmp_path / "Chapters").mkdir()
+    for chapter in ("01_One", "02_Two"):
+        (tmp_path / "tree" / chapter).mkdir(parents=True)
+        write_chapter(tmp_path, chapter, "import a, b")
+    return tmp_path
+
+
+def write_chapter(root: Path, chapter: str, imports: str) -> None:
+    block = f"# {chapter[3:].lower()}.py\n{imports}\n"
+    (root / "Chapters" / f"{chapter}.md").write_text(
+        f"```python\n{block}```\n", encoding="utf-8")
+    (root / "tree" / chapter / f"{chapter[3:].lower()}.py").write_text(
+        block, encoding="utf-8")
+
+
+def ruff_runs(root: Path) -> list[str]:
+    log = root / "ruff.log"
+    return log.read_text().split() if log.exists() else []
+
+
+def run(root: Path, *extra: str) -> int:
+    return fix_imports.main([str(root / "Chapters"), "--tree",
+                             str(root / "tree"), *extra])
+
+
+def test_an_unchanged_book_never_reaches_ruff(book: Path) -> None:
+    assert run(book) == 0
+    assert run(book) == 0
+    assert ruff_runs(book) == ["2"]
+
+
+def test_only_the_edited_listing_is_rechecked_and_spliced(book: Path) -> None:
+    run(book)
+    write_chapter(book, "02_Two", "import b, a")
+    assert run(book) == 1  # report only
+    assert run(book, "--fix") == 0
+    assert ruff_runs(book) == ["2", "1", "1"]
+    assert "import a, b" in (book / "Chapters" / "02_Two.md").read_text()
+    assert run(book) == 0
+    assert ruff_runs(book) == ["2", "1", "1"]
+
+
+def test_no_cache_rechecks_everything(book: Path) -> None:
+    run(book)
+    run(book, "--no-cache")
+    assert ruff_runs(book) == ["2", "2"]
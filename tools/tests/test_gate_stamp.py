@@ -0,0 +1,140 @@
+"""Tests for tools/gate_stamp.py (the stage records behind gate-fast)."""
+import sys
+from pathlib import Path
+
+import pytest
+
+from gate_stamp import (
+    GATE_DOCS,
+    UTILS,
+    Stage,
+    Toolchain,
+    fixed,
+    gate_stages,
+    run_gate,
+    scoped,
+    seed,
+)
+
+# Appends its arguments to ./log, one line per run.
+LOG = "import sys; open('log', 'a').write(' '.join(sys.argv[1:]) + '\\n')"
+
+
+def logging_stage(name: str = "lint", narrows: bool = True) -> Stage:
+    return Stage(name, scoped(sys.executable, "-c", LOG, name, whole=["ALL"]),
+                 inputs=("*.md",), shared=("shared.txt",), narrows=narrows)
+
+
+def runs(root: Path) -> list[str]:
+    log = root / "log"
+    return log.read_text(encoding="utf-8").splitlines() if log.exists() else []
+
+
+@pytest.fixture
+def book(tmp_path: Path) -> Path:
+    root = tmp_path / "book"
+    root.mkdir()
+    for name in ("a.md", "b.md", "shared.txt"):
+        (root / name).write_text(name, encoding="utf-8")
+    return root
+
+
+def test_an_unchanged_stage_is_skipped(
+        book: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    stages = [logging_stage()]
+    assert run_gate(stages, "gate-fast", root=book) == 0
+    assert run_gate(stages, "gate-fast", root=book) == 0
+    assert runs(book) == ["lint ALL"]
+    assert "skip    lint" in capsys.readouterr().out
+
+
+def test_an_edit_narrows_the_stage_to_the_changed_file(book: Path) -> None:
+    stages = [logging_stage()]
+    run_gate(stages, "gate-fast", root=book)
+    (book / "b.md").write_text("edited", encoding="utf-8")
+    (book / "c.md").write_text("new", encoding="utf-8")
+    run_gate(stages, "gate-fast", root=book)
+    assert runs(book) == ["lint ALL", "lint b.md c.md"]
+
+
+def test_a_stage_that_cannot_narrow_runs_in_full(book: Path) -> None:
+    stages = [logging_stage(narrows=False)]
+    run_gate(stages, "gate-fast", root=book)
+    (book / "a.md").write_text("edited", encoding="utf-8")
+    run_gate(stages, "gate-fast", root=book)
+    assert runs(book) == ["lint ALL", "lint ALL"]
+
+
+@pytest.mark.parametrize("change", ["shared", "delete"])
+def test_a_shared_change_or_a_deleted_input_runs_in_full(
+        book: Path, change: str) -> None:
+    stages = [logging_stage()]
+    run_gate(stages, "gate-fast", root=book)
+    if change == "shared":
+        (book / "shared.txt").write_text("edited", encoding="utf-8")
+    else:
+        (book / "b.md").unlink()
+    run_gate(stages, "gate-fast", root=book)
+    assert runs(book) == ["lint ALL", "lint ALL"]
+
+
+def test_full_ignores_the_records(book: Path) -> None:
+    stages = [logging_stage()]
+    run_gate(stages, "gate-fast", root=book)
+    run_gate(stages, "gate-fast", root=book, full=True)
+    assert runs(book) == ["lint ALL", "lint ALL"]
+
+
+def test_a_failure_stops_the_run_and_is_not_recorded(book: Path) -> None:
+    flaky = Stage("flaky", fixed([sys.executable, "-c",
+                                  "import os, sys; "
+                                  "sys.exit(os.path.exists('broken'))"]),
+                  inputs=("*.md",))
+    stages = [logging_stage(), flaky, logging_stage("after")]
+    (book / "broken").touch()
+    assert run_gate(stages, "gate-fast", root=book) == 1
+    assert runs(book) == ["lint ALL"]
+    (book / "broken").unlink()
+    assert run_gate(stages, "gate-fast", root=book) == 0
+    assert runs(book) == ["lint ALL", "after ALL"]
+
+
+def test_seeded_records_skip_every_stage(book: Path) -> None:
+    stages = [logging_stage(), logging_stage("after")]
+    seed(stages, root=book)
+    run_gate(stages, "gate-fast", root=book)
+    assert runs(book) == []
+
+
+def test_plan_runs_nothing(book: Path) -> None:
+    assert run_gate([logging_stage()], "gate-fast", plan=True, root=book) == 0
+    assert runs(book) == []
+
+
+def test_anchors_is_never_narrowed() -> None:
+    stages = {stage.name: stage for stage in gate_stages([], GATE_DOCS)}
+    narrowed = stages["checks"].commands(["Chapters/02_Tour.md"])
+    assert narrowed and all("anchors" not in cmd for cmd in narrowed)
+    assert not stages["anchors"].narrows
+    assert [n for n, s in stages.items() if s.narrows] == [
+        "checks", "reflow-check", "output", "ty", "ruff"]
+
+
+def test_stages_start_the_makefiles_tools() -> None:
+    tools = Toolchain(["python3"], ["ty"], ["ruff"], ["pytest", "-q"])
+    stages = {stage.name: stage
+              for stage in gate_stages([], GATE_DOCS, tools)}
+    assert stages["ty"].commands(None) == [["ty", "check", "build/examples"]]
+    assert stages["tools-test"].commands(None) == [
+        ["pytest", "-q", "tools/tests"]]
+    assert stages["pytest"].commands(None) == [
+        ["python3", "tools/pytest_examples.py", "build/examples"]]
+    assert stages["solutions"].commands(None)[-1] == [
+        "python3", "tools/pytest_examples.py", "build/solutions"]
+
+
+def test_an_edit_to_another_import_root_runs_ty_in_full() -> None:
+    stages = {stage.name: stage for stage in gate_stages([], GATE_DOCS)}
+    for name in ("ty", "ruff", "pytest"):
+        assert {UTILS, "build/examples/06_Modules_and_Packages/**/*"} <= set(
+            stages[name].shared)
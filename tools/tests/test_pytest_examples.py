@@ -0,0 +1,95 @@
+"""Tests for tools/pytest_examples.py and its plugin, tools_pytest.py."""
+from pathlib import Path
+
+import pytest
+
+import pytest_examples
+from tools_pytest import base_id, shards
+
+# Each test appends its folder's name to ../ran.log when it runs.
+TEST = """\
+from pathlib import Path
+
+def test_it():
+    with open(Path(__file__).parents[2] / "ran.log", "a") as log:
+        log.write(Path(__file__).parent.name + "\\n")
+    assert {ok}
+"""
+
+
+def test_shards_put_the_longest_first_on_the_least_loaded() -> None:
+    costs = [3.0, 3.0, 2.0, 2.0, 2.0]
+    assigned = shards(costs, 2)
+    totals = [sum(c for c, s in zip(costs, assigned) if s == shard)
+              for shard in range(2)]
+    assert sorted(totals) == [5.0, 7.0]
+    assert shards([1.0], 3) == [0]
+
+
+def test_base_id_drops_the_shard_suffix() -> None:
+    assert base_id("a/test_x.py::test_y[1]@shard2") == "a/test_x.py::test_y[1]"
+
+
+@pytest.fixture
+def tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(pytest_examples, "ROOT", tmp_path)
+    (tmp_path / "pytest.ini").write_text("[pytest]\n", encoding="utf-8")
+    root = tmp_path / "examples"
+    for chapter in ("01_One", "02_Two"):
+        write_test(root, chapter, ok=True)
+    return root
+
+
+def write_test(root: Path, chapter: str, ok: bool) -> None:
+    (root / chapter).mkdir(parents=True, exist_ok=True)
+    (root / chapter / f"test_{chapter[3:].lower()}.py").write_text(
+        TEST.format(ok=ok), encoding="utf-8")
+
+
+def ran(tree: Path) -> list[str]:
+    log = tree.parent / "ran.log"
+    runs = log.read_text().split() if log.exists() else []
+    log.unlink(missing_ok=True)
+    return sorted(runs)
+
+
+def test_only_the_changed_folder_runs_again(tree: Path) -> None:
+    assert pytest_examples.main([str(tree), "--", "-q"]) == 0
+    assert ran(tree) == ["01_One", "02_Two"]
+    assert pytest_examples.main([str(tree)]) == 0
+    assert ran(tree) == []
+    (tree / "02_Two" / "data.txt").write_text("new", encoding="utf-8")
+    assert pytest_examples.main([str(tree), "--", "-q"]) == 0
+    assert ran(tree) == ["02_Two"]
+
+
+def test_a_failing_folder_is_not_recorded(tree: Path) -> None:
+    write_test(tree, "02_Two", ok=False)
+    assert pytest_examples.main([str(tree), "--", "-q"]) == 1
+    assert ran(tree) == ["01_One", "02_Two"]
+    assert pytest_examples.main([str(tree), "--", "-q"]) == 1
+    assert ran(tree) == ["02_Two"]
+
+
+@pytest.mark.parametrize("extra", [["-x"], ["-k", "nothing"], ["-qx"],
+                                   ["--maxfail=1"]])
+def test_a_narrowed_run_records_nothing(tree: Path, extra: list[str]) -> None:
+    pytest_examples.main([str(tree), "--", *extra])
+    ran(tree)
+    assert pytest_examples.main([str(tree)]) == 0
+    assert ran(tree) == ["01_One", "02_Two"]
+
+
+def test_a_folder_missing_from_the_report_is_not_recorded() -> None:
+    folders = {Path("a"): [Path("a/test_a.py")],
+               Path("b"): [Path("b/test_b.py")]}
+    tests = {"a/test_a.py::test_it": {"file": "a/test_a.py",
+                                      "outcome": "passed", "seconds": 0.1}}
+    assert pytest_examples.passed_folders(folders, tests) == [Path("a")]
+    assert pytest_examples.passed_folders(folders, {}) == []
+
+
+def test_narrows_leaves_plain_options_alone() -> None:
+    assert not pytest_examples.narrows(["-q", "-p", "no:cacheprovider",
+                                        "--tb=short"])
+    assert pytest_examples.narrows(["a/test_a.py::test_it"])
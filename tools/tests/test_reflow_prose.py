@@ -1,6 +1,19 @@
 """Tests for tools/reflow_prose.py (Semantic Line Breaks for prose)."""
-
-from reflow_prose import _DEFAULT_WIDTH, reflow, split_sentences
+from pathlib import Path
+
+import pytest
+
+import reflow_prose
+from reflow_prose import (
+    _DEFAULT_WIDTH,
+    Memo,
+    Records,
+    _reflow_text,
+    main,
+    reflow,
+    reflow_files,
+    split_sentences,
+)
 
 # ── sentence splitting ────────────────────────────────────────────────────────
 
@@ -115,3 +128,56 @@ def test_reflow_is_idempotent() -> None:
     twice, count = reflow(once)
     assert twice == once
     assert count == 0
+
+# ── the paragraph memo and the settled-file records ───────────────────────────
+
+BOOK = (
+    "# Heading\n\n"
+    "One. Two.\n\n"
+    "- A list item. With two sentences.\n\n"
+    "Three. Four.\n"
+)
+
+def test_a_memo_changes_nothing_but_the_work() -> None:
+    memo = Memo()
+    assert reflow(BOOK, memo=memo) == reflow(BOOK)
+    calls: list[str] = []
+
+    def compute(joined: str, width: int) -> list[str]:
+        calls.append(joined)
+        return _reflow_text(joined, width)
+
+    again = Memo(memo.used)
+    again.lines("One. Two.", _DEFAULT_WIDTH, compute)
+    again.lines("Three. Five.", _DEFAULT_WIDTH, compute)
+    assert calls == ["Three. Five."]
+    assert len(again.used) == 2  # the paragraphs edited away are dropped
+
+def test_a_paragraph_moved_into_a_list_item_is_wrapped_again() -> None:
+    # Fits the full width on one line, but not the width left beside "- ".
+    sentence = ("This sentence runs to just under the full line width, "
+                "and it has one comma too.")
+    assert len(sentence) == _DEFAULT_WIDTH - 1
+    memo = Memo()
+    top = reflow(f"{sentence}\n", memo=memo)[0]
+    assert top == f"{sentence}\n"
+    item = f"- {sentence}\n"
+    assert reflow(item, memo=Memo(memo.used)) == reflow(item)
+    assert len(reflow(item)[0].splitlines()) == 2
+
+def test_a_settled_file_is_not_read_again(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    settled = tmp_path / "settled.md"
+    settled.write_text(reflow(BOOK)[0], encoding="utf-8")
+    drifted = tmp_path / "drifted.md"
+    drifted.write_text(BOOK, encoding="utf-8")
+    files = [settled, drifted]
+    records = Records(_DEFAULT_WIDTH)
+    assert [r[0] for r in reflow_files(files, _DEFAULT_WIDTH, 1, records)] == files
+    records.save()
+    assert main([str(settled), str(drifted), "-j", "1"]) == 1
+    records = Records(_DEFAULT_WIDTH)
+    read = reflow_files(files, _DEFAULT_WIDTH, 1, records)
+    assert [r[0] for r in read] == [drifted]
+    monkeypatch.setattr(reflow_prose, "_reflow_text", None)  # all from memo
+    assert reflow_files([drifted], _DEFAULT_WIDTH, 1, records) == read
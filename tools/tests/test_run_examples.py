@@ -0,0 +1,56 @@
+"""Tests for tools/run_examples.py (the recorded-pass cache)."""
+from pathlib import Path
+
+import pytest
+
+from run_examples import main
+
+
+def make_tree(tmp_path: Path) -> Path:
+    tree = tmp_path / "tree"
+    chapter = tree / "ch"
+    chapter.mkdir(parents=True)
+    (tree / "utils").mkdir()
+    (chapter / "helper.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (chapter / "uses_helper.py").write_text(
+        "from helper import VALUE\nassert VALUE == 1\n", encoding="utf-8"
+    )
+    (chapter / "standalone.py").write_text("print('hi')\n", encoding="utf-8")
+    return tree
+
+
+def test_second_run_reports_cached_passes(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    tree = make_tree(tmp_path)
+    assert main(["--tree", str(tree), "-j", "1"]) == 0
+    assert "Passed (cached):      0" in capsys.readouterr().out
+    assert main(["--tree", str(tree), "-j", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "Passed:               0" in out
+    assert "Passed (cached):      3" in out
+
+
+def test_changing_a_dependency_reruns_only_its_importers(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    tree = make_tree(tmp_path)
+    assert main(["--tree", str(tree), "-j", "1"]) == 0
+    (tree / "ch" / "helper.py").write_text("VALUE = 2\n", encoding="utf-8")
+    capsys.readouterr()
+    assert main(["--tree", str(tree), "-j", "1"]) == 1
+    out = capsys.readouterr().out
+    assert "F ch/uses_helper.py" in out
+    # helper.py itself re-runs too, since its own text changed.
+    assert "Passed:               1" in out
+    assert "Passed (cached):      1" in out
+
+
+def test_no_cache_runs_everything(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    tree = make_tree(tmp_path)
+    assert main(["--tree", str(tree), "-j", "1"]) == 0
+    capsys.readouterr()
+    assert main(["--tree", str(tree), "-j", "1", "--no-cache"]) == 0
+    assert "Passed:               3" in capsys.readouterr().out
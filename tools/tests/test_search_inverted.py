@@ -0,0 +1,60 @@
+"""Tests for tools/search_inverted.py (the sharded index and its engine)."""
+from pathlib import Path
+
+import pytest
+
+import search_index
+from search_inverted import QUERIES, Engine, build, decode, encode, scan, write
+
+
+def record(heading: str, text: str, chapter: str = "Shapes") -> dict[str, str]:
+    return {"u": f"{chapter}.html", "a": heading.lower(), "l": "Chapter 1",
+            "c": chapter, "s": heading, "t": text}
+
+
+RECORDS = [
+    record("Frozen", "passing frozen=True makes a dataclass immutable."),
+    record("Init", "__post_init__ runs after __init__, the init hook."),
+    record("Phrases", "a frozen dataclass; frozen  data, frozendata x"),
+    record("Plurals", "classes and class; dataclasses too. asyncio.run(main)"),
+    record("Empty", "", chapter="Dataclass Basics"),
+]
+
+
+def test_varints_round_trip() -> None:
+    numbers = [0, 1, 127, 128, 300, 2**21, 5]
+    assert decode(encode(numbers)) == numbers
+
+
+def test_small_numbers_take_one_byte() -> None:
+    assert len(encode(range(100))) == len(encode([200] * 50))
+
+
+@pytest.mark.parametrize("query", [
+    "init", "post_init", "__init__", "frozen", "frozen dataclass",
+    "frozen data", "zen data", "dataclasses", "classes", "class",
+    "asyncio.run", "run(", "=true", "x", "a dataclass;", "frozen  data",
+    "dataclass basics", "missing", "   ",
+])
+def test_engine_matches_the_scan(query: str) -> None:
+    assert Engine(build(RECORDS)).search(query) == scan(RECORDS, query)
+
+
+def test_a_prefix_query_reads_one_posting_shard() -> None:
+    engine = Engine(build(RECORDS))
+    engine.search("frozen")
+    assert sorted(engine.loaded) == ["meta.json", "post-fr.json"]
+
+
+def test_written_shards_load_back(tmp_path: Path) -> None:
+    write(RECORDS, tmp_path)
+    engine = Engine.from_dir(tmp_path)
+    assert engine.search("frozen dataclass") == scan(
+        RECORDS, "frozen dataclass")
+
+
+def test_engine_matches_the_scan_on_the_book() -> None:
+    records = search_index.build(search_index.default_sources())
+    engine = Engine(build(records))
+    for query in QUERIES:
+        assert engine.search(query) == scan(records, query), query
@@ -0,0 +1,121 @@
+"""Tests for tools/serve.py (conditional and gzip replies, reload stream)."""
+import functools
+import gzip
+import http.client
+import http.server
+import sys
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import serve
+from serve import Handler, Inotify, Watcher
+
+
+@pytest.fixture
+def site(tmp_path: Path) -> Iterator[tuple[Path, int]]:
+    """A served directory and the port it is on."""
+    root = tmp_path / "site"
+    root.mkdir()
+    handler = functools.partial(Handler, directory=str(root))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, args=(0.05,),
+                     daemon=True).start()
+    yield root, server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def get(port: int, path: str,
+        **headers: str) -> tuple[int, dict[str, str], bytes]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", path, headers={
+        k.replace("_", "-"): v for k, v in headers.items()})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response.status, dict(response.getheaders()), body
+
+
+def test_an_unchanged_file_revalidates_with_304(
+        site: tuple[Path, int]) -> None:
+    root, port = site
+    (root / "search.css").write_text("body {}", encoding="utf-8")
+    status, headers, body = get(port, "/search.css")
+    assert status == 200 and body == b"body {}"
+    status, _, body = get(port, "/search.css",
+                          If_None_Match=headers["ETag"])
+    assert status == 304 and body == b""
+
+
+def test_a_rewritten_file_gets_a_new_etag(site: tuple[Path, int]) -> None:
+    root, port = site
+    css = root / "search.css"
+    css.write_text("a {}", encoding="utf-8")
+    _, headers, _ = get(port, "/search.css")
+    css.write_text("b {} ", encoding="utf-8")
+    status, _, body = get(port, "/search.css",
+                          If_None_Match=headers["ETag"])
+    assert status == 200 and body == b"b {} "
+
+
+def test_a_gz_sibling_is_sent_to_a_client_that_accepts_it(
+        site: tuple[Path, int]) -> None:
+    root, port = site
+    data = b'[{"t": "text"}]'
+    (root / "search-index.json").write_bytes(data)
+    (root / "search-index.json.gz").write_bytes(gzip.compress(data))
+    status, headers, body = get(port, "/search-index.json",
+                                Accept_Encoding="br, gzip")
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Content-Type"] == "application/json"
+    assert gzip.decompress(body) == data
+    _, headers, body = get(port, "/search-index.json")
+    assert "Content-Encoding" not in headers and body == data
+
+
+def test_a_stale_gz_sibling_is_ignored(site: tuple[Path, int]) -> None:
+    root, port = site
+    (root / "search-index.json.gz").write_bytes(gzip.compress(b"old"))
+    (root / "search-index.json").write_bytes(b"new")
+    _, headers, body = get(port, "/search-index.json",
+                           Accept_Encoding="gzip")
+    assert "Content-Encoding" not in headers and body == b"new"
+
+
+def test_the_reload_stream_sends_each_new_token(
+        site: tuple[Path, int], monkeypatch: pytest.MonkeyPatch) -> None:
+    _, port = site
+    monkeypatch.setattr(serve, "snapshot", dict)
+    watcher = Watcher(Path("unused"), chapter_toc=False)
+    monkeypatch.setattr(Handler, "watcher", watcher)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", serve.RELOAD_PATH)
+    response = conn.getresponse()
+    assert response.getheader("Content-Type") == "text/event-stream"
+    assert response.fp.readline() == b"data: 0\n"
+    assert response.fp.readline() == b"\n"
+    with watcher.changed:
+        watcher.token = "1"
+        watcher.changed.notify_all()
+    assert response.fp.readline() == b"data: 1\n"
+    conn.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"),
+                    reason="inotify is Linux-only")
+def test_inotify_wakes_on_a_save_in_a_watched_directory(
+        tmp_path: Path) -> None:
+    events = Inotify.open({tmp_path})
+    assert events is not None
+    try:
+        assert not events.wait(timeout=0)
+        (tmp_path / "01_Chapter.md").write_text("# A\n", encoding="utf-8")
+        assert events.wait(timeout=5)
+        events.drain()
+        assert not events.wait(timeout=0)
+    finally:
+        events.close()
@@ -1,14 +1,26 @@
-"""Tests for tools/spellcheck.py's prose extraction.
+"""Tests for tools/spellcheck.py's prose extraction and its caches.
 
 Whether a word is in the dictionary is pyspellchecker's business. What
 these cover is which text reaches it, since the misses that wasted the
 most time were not words at all: a heading's `{#anchor}` slug, and the
-unindented continuation lines of a multi-line HTML comment.
+unindented continuation lines of a multi-line HTML comment. The snapshot
+tests check it answers exactly as the SpellChecker it replaces.
 """
 
 from pathlib import Path
 
-from spellcheck import collect, prose_text, tokens
+import pytest
+
+import spellcheck
+from spellcheck import (
+    WordSet,
+    chapter_unknowns,
+    collect,
+    load_words,
+    prose_text,
+    tokens,
+    write_snapshot,
+)
 
 
 def words(line: str) -> list[str]:
@@ -57,3 +69,57 @@ def test_one_line_comment_does_not_swallow_what_follows(tmp_path: Path) -> None:
 def test_fenced_code_is_still_skipped(tmp_path: Path) -> None:
     md = write(tmp_path, "Prose.\n\n```python\nzzzq = 1\n```\n")
     assert "zzzq" not in [word for _, word in collect(md)]
+
+# ── the dictionary snapshot ──────────────────────────────────────────────────
+
+def test_snapshot_lookup_finds_every_word_and_nothing_else(
+        tmp_path: Path) -> None:
+    path = tmp_path / "words-x.txt"
+    words = ["a", "ab", "abc", "b", "façade", "zebra", "été"]
+    path.write_bytes(b"5\n" + b"\n".join(
+        sorted(w.encode() for w in words)) + b"\n")
+    known = WordSet(path)
+    assert all(w in known for w in words)
+    assert not any(w in known for w in ["", "aa", "abcd", "c", "zz", "fa"])
+
+def test_snapshot_agrees_with_spellchecker(tmp_path: Path) -> None:
+    from spellchecker import SpellChecker
+
+    candidates = {"the", "fixted", "dataclass", "zzzq", "façade",
+                  "proxying", "x" * 60, "colour", "pythonic"}
+    path = tmp_path / "words-x.txt"
+    write_snapshot(path, {"pythonic"})
+    spell = SpellChecker()
+    spell.word_frequency.load_words(["pythonic"])
+    assert WordSet(path).unknown(candidates) == spell.unknown(candidates)
+
+def test_an_edited_wordlist_gets_a_new_snapshot(tmp_path: Path) -> None:
+    wordlist = tmp_path / "wordlist.txt"
+    wordlist.write_text("zzzq\n", encoding="utf-8")
+    first = load_words(wordlist, {"zzzq"})
+    assert "zzzq" in first
+    wordlist.write_text("zzzq\nqqqz\n", encoding="utf-8")
+    second = load_words(wordlist, {"zzzq", "qqqz"})
+    assert second.name != first.name and "qqqz" in second
+
+# ── per-chapter cache ─────────────────────────────────────────────────────────
+
+def test_an_unchanged_chapter_is_not_tokenized_again(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    wordlist = tmp_path / "wordlist.txt"
+    wordlist.write_text("", encoding="utf-8")
+    known = load_words(wordlist, set())
+    a = write(tmp_path, "Fixted prose.\n")
+    b = tmp_path / "other.md"
+    b.write_text("Clean prose.\n", encoding="utf-8")
+    unknown, read = chapter_unknowns([a, b], known, jobs=1)
+    assert unknown == {a: {"fixted"}, b: set()} and set(read) == {a, b}
+
+    calls: list[Path] = []
+    real = spellcheck.collect
+    monkeypatch.setattr(spellcheck, "collect",
+                        lambda p: calls.append(p) or real(p))
+    b.write_text("Clean prose, edted.\n", encoding="utf-8")
+    unknown, _ = chapter_unknowns([a, b], known, jobs=1)
+    assert calls == [b]
+    assert unknown == {a: {"fixted"}, b: {"edted"}}
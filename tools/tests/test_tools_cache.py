@@ -0,0 +1,138 @@
+"""Tests for tools/tools_cache.py (keys, dependency scan, JSON store)."""
+from pathlib import Path
+
+import pytest
+
+from tools_cache import (
+    Durations,
+    JsonCache,
+    digest,
+    imported_names,
+    local_deps,
+    source_key,
+)
+
+# ── digest ────────────────────────────────────────────────────────────────────
+
+def test_digest_parts_do_not_run_together() -> None:
+    assert digest("ab", "c") != digest("a", "bc")
+
+def test_digest_str_and_bytes_agree() -> None:
+    assert digest("é") == digest("é".encode())
+
+# ── imported_names ────────────────────────────────────────────────────────────
+
+def test_imported_names_forms() -> None:
+    source = (
+        "import os, json\n"
+        "from shapes import Circle\n"
+        "lazy import plugins\n"
+        "def f():\n"
+        "    import helper\n"
+    )
+    assert imported_names(source) == {
+        "os", "json", "shapes", "plugins", "helper",
+    }
+
+# ── local_deps ────────────────────────────────────────────────────────────────
+
+def test_local_deps_follows_imports_and_data_files(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("import b\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text(
+        "open('maze.txt')\n", encoding="utf-8"
+    )
+    (tmp_path / "maze.txt").write_text("#\n", encoding="utf-8")
+    (tmp_path / "unused.py").write_text("", encoding="utf-8")
+    deps = local_deps("import a\nimport os\n", [tmp_path])
+    assert [p.name for p in deps] == ["a.py", "b.py", "maze.txt"]
+
+def test_local_deps_includes_a_whole_package(tmp_path: Path) -> None:
+    pkg = tmp_path / "plugins"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "circle.py").write_text("", encoding="utf-8")
+    deps = local_deps("from plugins import circle\n", [tmp_path])
+    assert [p.name for p in deps] == ["__init__.py", "circle.py"]
+
+def test_source_key_changes_with_a_dependency(tmp_path: Path) -> None:
+    dep = tmp_path / "helper.py"
+    dep.write_text("X = 1\n", encoding="utf-8")
+    before = source_key("import helper\n", [tmp_path])
+    dep.write_text("X = 2\n", encoding="utf-8")
+    assert source_key("import helper\n", [tmp_path]) != before
+
+# ── JsonCache ─────────────────────────────────────────────────────────────────
+
+def test_json_cache_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "tool.json"
+    store = JsonCache(path)
+    store.data["k"] = ["v"]
+    store.save()
+    assert JsonCache(path).data == {"k": ["v"]}
+
+def test_json_cache_treats_a_corrupt_file_as_empty(tmp_path: Path) -> None:
+    path = tmp_path / "tool.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert JsonCache(path).data == {}
+
+def test_json_cache_disabled_neither_reads_nor_writes(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "tool.json"
+    path.write_text('{"k": 1}', encoding="utf-8")
+    store = JsonCache(path, enabled=False)
+    assert store.data == {}
+    store.data["k"] = 2
+    store.save()
+    assert path.read_text(encoding="utf-8") == '{"k": 1}'
+
+def test_json_cache_save_replaces_the_file_whole(tmp_path: Path) -> None:
+    path = tmp_path / "tool.json"
+    store = JsonCache(path)
+    store.data["k"] = 1
+    store.save()
+    before = path.stat().st_ino
+    store.data["k"] = object()
+    with pytest.raises(TypeError):
+        store.save()
+    assert path.read_text(encoding="utf-8") == '{"k": 1}'
+    store.data["k"] = 2
+    store.save()
+    assert path.stat().st_ino != before
+    assert [p.name for p in tmp_path.iterdir()] == ["tool.json"]
+
+# ── Durations ─────────────────────────────────────────────────────────────────
+
+def test_longest_first_puts_unknown_then_slowest_first() -> None:
+    durations = Durations("tool")
+    durations.record("quick", 0.1)
+    durations.record("slow", 9.0)
+    order = durations.longest_first(["quick", "new", "slow"])
+    assert order == [1, 2, 0]
+
+def test_durations_persist_between_runs() -> None:
+    first = Durations("tool")
+    first.record("a", 1.5)
+    first.save()
+    assert Durations("tool").longest_first(["b", "a"]) == [0, 1]
+    assert Durations("tool").store.data == {"a": 1.5}
+
+def test_report_lists_the_slowest(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    durations = Durations("tool")
+    for name, seconds in [("a", 1.0), ("b", 3.0), ("c", 2.0)]:
+        durations.record(name, seconds)
+    durations.report(jobs=2, top=2)
+    out = capsys.readouterr().out
+    assert "Slowest 2 of 3:" in out
+    assert "3.0s ideal for 6.0s of work on 2 worker(s)" in out
+    assert out.index("b") < out.index("  2.00s  c")
+    assert "Critical path, 3.0s longest-first: c -> a" in out
+
+def test_critical_path_is_the_lane_that_finishes_last() -> None:
+    durations = Durations("tool")
+    for name, seconds in [("a", 4.0), ("b", 3.0), ("c", 2.0), ("d", 2.0)]:
+        durations.record(name, seconds)
+    assert durations.critical_path(jobs=2) == (6.0, ["a", "d"])
+    assert durations.critical_path(jobs=1) == (11.0, ["a", "b", "c", "d"])
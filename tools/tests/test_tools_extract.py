@@ -5,6 +5,7 @@ from tools_extract import (
     block_content,
     check_against,
     extract,
+    write_changed,
     write_tree,
 )
 from tools_markdown import Block, Document
@@ -96,6 +97,15 @@ def test_write_tree_skips_unchanged_files(tmp_path: Path) -> None:
     assert write_tree(result, tmp_path) == 1
     assert write_tree(result, tmp_path) == 0
 
+def test_write_changed_names_only_the_edited_file(tmp_path: Path) -> None:
+    before = doc_of("```python\n# a.py\nx = 1\n```\n"
+                    "```python\n# b.py\ny = 1\n```\n")
+    write_changed(extract([before], [chapter_route]), tmp_path)
+    after = doc_of("```python\n# a.py\nx = 1\n```\n"
+                   "```python\n# b.py\ny = 2\n```\n")
+    result = extract([after], [chapter_route])
+    assert write_changed(result, tmp_path) == ["08_Decorators/b.py"]
+
 def test_check_against_reports_missing(tmp_path: Path) -> None:
     doc = doc_of("```python\n# a.py\nx = 1\n```\n")
     result = extract([doc], [chapter_route])
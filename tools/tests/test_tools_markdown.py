@@ -1,6 +1,7 @@
 """Tests for tools/tools_markdown.py (the parsed-Markdown Document)."""
 from pathlib import Path
 
+import tools_cache
 from tools_markdown import Block, Document
 
 # ── parsing ───────────────────────────────────────────────────────────────────
@@ -139,6 +140,37 @@ def test_parse_reads_the_file(tmp_path: Path) -> None:
     assert doc.path == p
     assert doc.blocks[0].slug == "a.py"
 
+def test_a_cached_parse_matches_a_fresh_one(tmp_path: Path) -> None:
+    p = tmp_path / "ch.md"
+    p.write_text(
+        "# Title\n\nProse here.\n\n```python\n# a.py\nx = 1\n```\n"
+        "- a list\n\nMore prose.\n", encoding="utf-8",
+    )
+    fresh = Document.parse(p)  # parses and stores
+    cached = Document.parse(p)  # restores
+    assert cached == fresh
+    assert list(cached.prose_lines()) == list(fresh.prose_lines())
+    assert list(cached.headings()) == list(fresh.headings())
+
+def test_an_edited_file_is_not_answered_from_the_cache(
+    tmp_path: Path,
+) -> None:
+    p = tmp_path / "ch.md"
+    p.write_text("Prose.\n", encoding="utf-8")
+    Document.parse(p)
+    p.write_text("Prose.\n```python\nx\n```\n", encoding="utf-8")
+    assert len(Document.parse(p).blocks) == 1
+
+def test_an_edit_replaces_the_files_cached_parse(tmp_path: Path) -> None:
+    store = tools_cache.CACHE_DIR / "documents"
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    b.write_text("Other.\n", encoding="utf-8")
+    Document.parse(b)
+    for n in range(3):
+        a.write_text(f"Prose {n}.\n", encoding="utf-8")
+        Document.parse(a)
+    assert len(list(store.glob("*.json"))) == 2
+
 def test_block_is_frozen() -> None:
     block = Document.from_text("```python\nx\n```\n").blocks[0]
     assert isinstance(block, Block)
@@ -0,0 +1,93 @@
+"""Tests for tools/tools_trace.py and the make wrapper in trace_make.py."""
+import multiprocessing
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import tools_trace
+import trace_make
+from tools_config import TOOLS_DIR
+
+
+@pytest.fixture
+def trace_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    folder = tmp_path / "trace"
+    monkeypatch.setenv(tools_trace.TRACE_ENV, str(folder))
+    return folder
+
+
+def spans(folder: Path, out: Path) -> list[dict]:
+    return [e for e in tools_trace.merge(folder, out) if e["ph"] == "X"]
+
+
+def test_nothing_is_written_when_tracing_is_off(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(tools_trace.TRACE_ENV, raising=False)
+    with tools_trace.span("stage"):
+        tools_trace.run([sys.executable, "-c", "pass"])
+    assert tools_trace.traced(abs, "pool") is abs
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_a_subprocess_nests_inside_its_span(
+        trace_dir: Path, tmp_path: Path) -> None:
+    with tools_trace.span("stage", "tool", files=2):
+        tools_trace.run([sys.executable, "-c", "pass"], cwd=tmp_path)
+    inner, outer = sorted(spans(trace_dir, tmp_path / "t.json"),
+                          key=lambda e: e["dur"])
+    assert outer["name"] == "stage" and outer["args"] == {"files": 2}
+    assert inner["cat"] == "subprocess"
+    assert inner["name"] == f"{Path(sys.executable).name} -c"
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_pool_workers_write_their_own_events(
+        trace_dir: Path, tmp_path: Path) -> None:
+    # spawn, as on Windows and macOS: the test runner has threads to fork.
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=2, mp_context=spawn) as pool:
+        assert list(pool.map(tools_trace.traced(abs, "pool"),
+                             [-1, -2])) == [1, 2]
+    events = tools_trace.merge(trace_dir, tmp_path / "t.json")
+    calls = [e for e in events if e.get("cat") == "pool"]
+    waits = [e for e in events if e.get("cat") == "queue"]
+    assert sorted(e["name"] for e in calls) == ["-1", "-2"]
+    assert sorted(e["args"]["item"] for e in waits) == ["-1", "-2"]
+    names = [e["args"]["name"] for e in events if e["ph"] == "M"]
+    assert names and all(n.startswith("worker of ") for n in names)
+
+
+def test_the_trace_file_is_closed_at_exit(trace_dir: Path) -> None:
+    # Interpreter shutdown hides an unclosed file's ResourceWarning, so
+    # run the exit handlers early and look at the file itself.
+    code = ("import atexit, tools_trace\n"
+            "with tools_trace.span('stage'):\n    pass\n"
+            "events = tools_trace._out[1]\n"
+            "atexit._run_exitfuncs()\n"
+            "print(events.closed)")
+    proc = subprocess.run([sys.executable, "-c", code], cwd=TOOLS_DIR,
+                          capture_output=True, text=True)
+    assert proc.stdout.strip() == "True", proc.stderr
+    assert len(list(trace_dir.glob("*.jsonl"))) == 1
+
+
+def test_a_torn_last_line_is_dropped(trace_dir: Path, tmp_path: Path) -> None:
+    with tools_trace.span("kept"):
+        pass
+    part = next(trace_dir.glob("*.jsonl"))
+    with part.open("a", encoding="utf-8") as f:
+        f.write('{"name": "torn", "ph": "X"')
+    assert [e["name"] for e in spans(trace_dir, tmp_path / "t.json")] == [
+        "kept"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs /bin/sh")
+def test_the_shell_wrapper_keeps_the_exit_code_and_times_the_line(
+        trace_dir: Path, tmp_path: Path) -> None:
+    assert trace_make.main(["--shell", "-c", "exit 3"]) == 3
+    (line,) = spans(trace_dir, tmp_path / "t.json")
+    assert line["cat"] == "make" and line["args"]["command"] == "exit 3"
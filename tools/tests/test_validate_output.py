@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from tools_cache import Durations
 from validate_output import (
     block_slug,
     collect_files,
@@ -729,10 +730,118 @@ def test_parallel_and_serial_agree(
     write(tmp_path, "b_bad.md", "```python\nprint('b')\n#: wrong\n```\n")
     write(tmp_path, "c_none.md", "```python\nprint('c')\n```\n")
 
-    assert main([str(tmp_path), "-j", "1"]) == 1
+    # --no-cache, or the second run would skip the block the first passed.
+    assert main([str(tmp_path), "-j", "1", "--no-cache"]) == 1
     serial = capsys.readouterr().out
-    assert main([str(tmp_path), "-j", "3"]) == 1
+    assert main([str(tmp_path), "-j", "3", "--no-cache"]) == 1
     parallel = capsys.readouterr().out
 
     assert serial == parallel
     assert "1 ok, 1 failed, 1 skipped (no markers)." in serial
+
+
+def test_warm_workers_agree_with_cold_ones(
+    tmp_path: Path, capsys: pytest.CaptureFixture,
+) -> None:
+    write(tmp_path, "a_ok.md", "```python\nprint('a')\n#: a\n```\n")
+    write(tmp_path, "b_bad.md", "```python\nprint('b')\n#: wrong\n```\n")
+
+    assert main([str(tmp_path), "-j", "2", "--no-cache"]) == 1
+    cold = capsys.readouterr().out
+    assert main([str(tmp_path), "-j", "2", "--no-cache", "--warm"]) == 1
+    assert capsys.readouterr().out == cold
+
+
+# ── the pass cache ────────────────────────────────────────────────────────────
+
+def test_cache_skips_a_block_that_already_passed(
+    tmp_path: Path, capsys: pytest.CaptureFixture,
+) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    write(src, "a.md", "```python\nprint('a')\n#: a\n```\n")
+
+    assert main([str(src), "-j", "1"]) == 0
+    assert "cache: 0 block(s) skipped, 1 run." in capsys.readouterr().out
+    assert main([str(src), "-j", "1"]) == 0
+    assert "cache: 1 block(s) skipped, 0 run." in capsys.readouterr().out
+
+
+def test_cache_reruns_a_block_whose_import_changed(
+    tmp_path: Path, capsys: pytest.CaptureFixture,
+) -> None:
+    chapter = tmp_path / "tree" / "ch"
+    chapter.mkdir(parents=True)
+    helper = write(chapter, "helper.py", "VALUE = 1\n")
+    src = tmp_path / "src"
+    src.mkdir()
+    write(src, "ch.md", (
+        "```python\n# run.py\nfrom helper import VALUE\n"
+        "print(VALUE)\n#: 1\n```\n"
+    ))
+    args = [str(src), "-j", "1", "--tree", str(tmp_path / "tree")]
+
+    assert main(args) == 0
+    helper.write_text("VALUE = 2\n", encoding="utf-8")
+    assert main(args) == 1
+    assert "cache: 0 block(s) skipped, 1 run." in capsys.readouterr().out
+
+
+def test_cache_never_records_a_failure(
+    tmp_path: Path, capsys: pytest.CaptureFixture,
+) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    write(src, "bad.md", "```python\nprint('b')\n#: wrong\n```\n")
+
+    assert main([str(src), "-j", "1"]) == 1
+    assert main([str(src), "-j", "1"]) == 1
+    assert "cache: 0 block(s) skipped, 1 run." in capsys.readouterr().out
+
+
+def test_cache_keys_an_updated_block_by_its_new_text(
+    tmp_path: Path, capsys: pytest.CaptureFixture,
+) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    write(src, "a.md", "```python\nprint('a')\n#: stale\n```\n")
+
+    assert main([str(src), "-j", "1", "--update"]) == 0
+    assert main([str(src), "-j", "1"]) == 0
+    assert "cache: 1 block(s) skipped, 0 run." in capsys.readouterr().out
+
+
+def test_a_fully_cached_file_keeps_its_last_run_time(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    path = write(src, "a.md", "```python\nprint('a')\n#: a\n```\n")
+
+    assert main([str(src), "-j", "1"]) == 0
+    durations = Durations("validate_output")
+    assert str(path) in durations.store.data
+    durations.record(str(path), 9.0)
+    durations.save()
+    assert main([str(src), "-j", "1"]) == 0
+    assert Durations("validate_output").store.data[str(path)] == 9.0
+
+
+def test_an_edited_utils_helper_reruns_a_py_file(
+    tmp_path: Path, capsys: pytest.CaptureFixture,
+) -> None:
+    tree = tmp_path / "tree"
+    chapter = tmp_path / "ch"
+    for folder in (tree / "utils", chapter):
+        folder.mkdir(parents=True)
+    helper = write(tree / "utils", "helper.py", "VALUE = 1\n")
+    write(chapter, "run.py", "from helper import VALUE\nprint(VALUE)\n#: 1\n")
+    args = [str(chapter), "-j", "1", "--tree", str(tree)]
+    sys.path.insert(0, str(tree / "utils"))
+    try:
+        assert main(args) == 0
+        helper.write_text("VALUE = 2\n", encoding="utf-8")
+        sys.modules.pop("helper", None)
+        assert main(args) == 1
+    finally:
+        sys.path.remove(str(tree / "utils"))
+        sys.modules.pop("helper", None)
+    assert "cache: 0 block(s) skipped, 1 run." in capsys.readouterr().out
@@ -0,0 +1,72 @@
+"""Tests for tools/verify_targets.py (the prerequisite graph and scheduler)."""
+import threading
+import time
+
+from tools_cache import Durations
+from verify_targets import SERIAL, Result, prerequisites, schedule, upstream
+
+MAKEFILE = """\
+PY ?= uv run python
+.PHONY: extract ty lint ci
+# gate: not a rule, just a comment
+extract:  ## Extract
+\t$(PY) tools/extract_examples.py --write
+ty: extract  ## Type-check
+lint: extract  ## Lint
+gate: solutions-gate  ## The gate
+ci: gate site  ## CI
+"""
+
+
+def test_prerequisites_reads_rule_lines_only() -> None:
+    assert prerequisites(MAKEFILE) == {
+        "extract": [], "ty": ["extract"], "lint": ["extract"],
+        "gate": ["solutions-gate"], "ci": ["gate", "site"],
+    }
+
+
+def test_upstream_looks_through_untested_targets() -> None:
+    prereqs = prerequisites(MAKEFILE)
+    assert upstream("ci", prereqs, {"ci", "solutions-gate", "site"}) == {
+        "solutions-gate", "site"}
+    assert upstream("ty", prereqs, {"ty"}) == set()
+
+
+def fake_runner(fail: set[str], log: list[str]):
+    lock = threading.Lock()
+
+    def run_one(name: str, done: dict[str, Result]) -> Result:
+        with lock:
+            log.append(f"start {name}")
+        time.sleep(0.05)
+        with lock:
+            log.append(f"end {name}")
+        return Result(name, name not in fail, 0.05, "")
+    return run_one
+
+
+def test_a_target_starts_only_after_what_it_waits_on() -> None:
+    waits = {"extract": set(), "ty": {"extract"}, "lint": {"extract"},
+             "help": set()}
+    log: list[str] = []
+    done: dict[str, Result] = {}
+    schedule(list(waits), waits, 3, fake_runner(set(), log),
+             Durations("verify_targets"), done)
+    assert done.keys() == waits.keys()
+    ended = log.index("end extract")
+    assert log.index("start ty") > ended and log.index("start lint") > ended
+    assert log.index("start help") < ended
+
+
+def test_the_slowest_last_time_starts_first() -> None:
+    durations = Durations("verify_targets")
+    durations.record("slow", 9.0)
+    durations.record("quick", 0.1)
+    log: list[str] = []
+    schedule(["quick", "slow"], {"quick": set(), "slow": set()}, 1,
+             fake_runner(set(), log), durations, {})
+    assert log[0] == "start slow"
+
+
+def test_targets_that_rewrite_shared_trees_run_alone() -> None:
+    assert {"solutions-gate", "sweep", "gate", "ci"} <= SERIAL
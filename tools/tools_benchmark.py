@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Run one measured listing, keeping what it hands to report().
+
+benchmark_history.py starts each run of a listing as
+
+    python -m tools_benchmark OUT listing.py
+
+from the listing's own directory, with tools/ and the tree's utils/ on
+PYTHONPATH. This sets ``--numbers`` in sys.argv, wraps
+``benchmark.report`` before the listing can import it, runs the listing as
+``__main__``, and writes every measurement the listing reported to OUT as
+a JSON list of ``[name, value]`` pairs. The listing itself is unchanged
+and prints exactly what it prints under ``--numbers``, so the book's
+report() stays the few lines the chapter teaches.
+
+Named tools_benchmark for the same reason as the other tools_* modules:
+it runs in the process that imports a book listing, so it must never
+collide with a listing's own filename through Python's sys.modules cache.
+See tools_repo.py's docstring.
+"""
+
+import json
+import runpy
+import sys
+from pathlib import Path
+
+
+def main() -> None:
+    out, listing = sys.argv[1:3]
+    # benchmark reads the flag when it is imported, so set it first.
+    sys.argv = [listing, "--numbers"]
+    import benchmark
+
+    taken: list[tuple[str, float]] = []
+    report = benchmark.report
+
+    def recording(**measured: float) -> None:
+        taken.extend(measured.items())
+        report(**measured)
+
+    # setattr, not assignment: a checker types the attribute as that one
+    # function, and the listing imports whatever is there when it runs.
+    setattr(benchmark, "report", recording)
+    try:
+        runpy.run_path(listing, run_name="__main__")
+    finally:
+        Path(out).write_text(json.dumps(taken), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
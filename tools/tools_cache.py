@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Content-hash caches, so a tool can skip work whose inputs did not change.
+
+The gate re-runs everything on every invocation: every listing executes,
+every chapter is re-parsed, even when an editing session touched one
+paragraph. Most of that work is a pure function of a few files' text, so
+its result can be remembered under a hash of that text and reused for as
+long as the hash still matches.
+
+Three pieces live here:
+
+* `digest()` hashes any mix of strings and bytes into one key. Each part
+  is length-prefixed, so ``("ab", "c")`` and ``("a", "bc")`` never collide.
+* `local_deps()` finds the files a listing depends on beyond its own
+  text: the sibling modules it imports (transitively), the `utils/`
+  helpers, and the data files it names, such as ``amaze.txt``. A key that
+  omits a dependency would serve a stale pass after that dependency
+  changed, so the scan errs toward including too much.
+* `JsonCache` is the on-disk store: one JSON file per tool under
+  ``build/cache/``, gitignored with the rest of ``build/``.
+* `Durations` remembers how long each file took last time, so a pool can
+  start the slowest ones first instead of discovering them at the end.
+
+A cache only ever records a success. A failure is always re-run, since
+the point of the next run is usually to see whether it got fixed.
+
+Named tools_cache for the same reason as the other tools_* modules: it
+must never collide with a book listing's own filename through Python's
+sys.modules cache. See tools_repo.py's docstring.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from tools_config import CACHE_DIR
+
+# An import statement's module, at any indent, `lazy` included. A regex
+# rather than ast: it also reads a 3.15 `lazy import` under an older
+# interpreter, and a false match (an import inside a string) only adds a
+# dependency, which costs a cache miss and never a stale hit.
+IMPORT_RE = re.compile(
+    r"^[ \t]*(?:lazy[ \t]+)?"
+    r"(?:from[ \t]+(\w+)|import[ \t]+(\w+(?:[ \t]*,[ \t]*\w+)*))",
+    re.MULTILINE,
+)
+
+# A bare data-file name inside the source, e.g. "amaze.txt": the suffixes
+# extraction writes data files with.
+DATA_NAME_RE = re.compile(r"[\w-]+\.(?:txt|dat)\b")
+
+
+def digest(*parts: str | bytes) -> str:
+    """One hex key for a sequence of strings and bytes."""
+    h = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+def interpreter_tag() -> str:
+    """The running interpreter's full version, part of every result key.
+
+    Output can change between Python releases (a repr, an error message),
+    so a pass recorded under one interpreter proves nothing about another.
+    """
+    return f"{sys.implementation.name} {sys.version}"
+
+
+def imported_names(source: str) -> set[str]:
+    """The top-level module names `source` imports."""
+    names: set[str] = set()
+    for m in IMPORT_RE.finditer(source):
+        if m.group(1):
+            names.add(m.group(1))
+        else:
+            names.update(n.strip() for n in m.group(2).split(","))
+    return names
+
+
+def local_deps(source: str, search: list[Path]) -> list[Path]:
+    """Files under the `search` directories that `source` depends on.
+
+    Follows imports transitively through sibling modules and packages,
+    and picks up any data file whose name appears in a scanned source.
+    Anything not found under `search` (the standard library, numpy) is
+    ignored: the interpreter tag covers it.
+    """
+    found: dict[Path, None] = {}
+    pending = [source]
+    while pending:
+        text = pending.pop()
+        hits: list[Path] = []
+        for name in imported_names(text):
+            for folder in search:
+                module = folder / f"{name}.py"
+                package = folder / name
+                if module.is_file():
+                    hits.append(module)
+                elif package.is_dir():
+                    hits.extend(sorted(package.rglob("*.py")))
+        for name in DATA_NAME_RE.findall(text):
+            hits.extend(
+                folder / name for folder in search
+                if (folder / name).is_file()
+            )
+        for path in hits:
+            if path not in found:
+                found[path] = None
+                if path.suffix == ".py":
+                    pending.append(path.read_text(encoding="utf-8"))
+    return sorted(found)
+
+
+def source_key(source: str, search: list[Path], *salt: str) -> str:
+    """The cache key for running `source`: its text plus its deps'."""
+    parts: list[str | bytes] = [interpreter_tag(), *salt, source]
+    for path in local_deps(source, search):
+        parts += [path.name, path.read_bytes()]
+    return digest(*parts)
+
+
+def cache_file(name: str) -> Path:
+    """Where the tool called `name` keeps its cache."""
+    return CACHE_DIR / f"{name}.json"
+
+
+class JsonCache:
+    """A JSON object on disk, loaded whole and written back whole.
+
+    A missing or unreadable file is an empty cache, never an error: the
+    worst a corrupt cache can do is make one run slow.
+    """
+
+    def __init__(self, path: Path, *, enabled: bool = True) -> None:
+        self.path = path
+        self.enabled = enabled
+        self.data: dict[str, Any] = self._load() if enabled else {}
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self) -> None:
+        """Write the cache to a temporary file, then rename it into place.
+
+        Two tools saving the same cache at once then leave one whole file
+        or the other, never a torn mix that loads as empty.
+        """
+        if not self.enabled:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent,
+                                   prefix=f"{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self.data, sort_keys=True))
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+class Durations:
+    """Per-file run times from the last run, for longest-first scheduling.
+
+    A pool fed in path order can start its slowest file last and then
+    wait on it alone while every other worker idles. Starting the longest
+    expected jobs first (LPT) bounds the finish at roughly the total work
+    divided by the workers, or the single longest job if that is larger.
+    """
+
+    def __init__(self, tool: str, *, enabled: bool = True) -> None:
+        self.store = JsonCache(
+            cache_file(f"{tool}.durations"), enabled=enabled
+        )
+        self.timed: dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    def longest_first(self, names: list[str]) -> list[int]:
+        """Indices into `names`, longest expected first.
+
+        A name with no history sorts ahead of every known one: it may be
+        slow, and guessing short is the costly mistake.
+        """
+        known = self.store.data
+        return sorted(
+            range(len(names)),
+            key=lambda i: -known.get(names[i], float("inf")),
+        )
+
+    def record(self, name: str, seconds: float) -> None:
+        self.timed[name] = seconds
+        self.store.data[name] = round(seconds, 3)
+
+    def save(self) -> None:
+        self.store.save()
+
+    def critical_path(self, jobs: int) -> tuple[float, list[str]]:
+        """This run's times laid out longest-first on `jobs` workers.
+
+        Returns when the last worker finishes and what it ran, in order:
+        the chain that sets the wall clock. Shortening anything else
+        cannot end the run sooner.
+        """
+        lanes: list[tuple[float, int, list[str]]] = [
+            (0.0, i, []) for i in range(max(1, jobs))
+        ]
+        for name, seconds in sorted(self.timed.items(),
+                                    key=lambda kv: -kv[1]):
+            busy, i, ran = heapq.heappop(lanes)
+            heapq.heappush(lanes, (busy + seconds, i, [*ran, name]))
+        finish, _, ran = max(lanes)
+        return finish, ran
+
+    def report(self, jobs: int, top: int) -> None:
+        """Print the slowest files and how they bound this run."""
+        if not self.timed or top <= 0:
+            return
+        wall = time.perf_counter() - self.started
+        work = sum(self.timed.values())
+        slowest = sorted(self.timed.items(), key=lambda kv: -kv[1])
+        # No schedule finishes before its longest job, or before the work
+        # spread perfectly over every worker: the better of the two bounds.
+        ideal = max(slowest[0][1], work / jobs)
+        print(
+            f"\nSlowest {min(top, len(slowest))} of {len(slowest)}: "
+            f"{wall:.1f}s wall, {ideal:.1f}s ideal for {work:.1f}s "
+            f"of work on {jobs} worker(s)"
+        )
+        for name, seconds in slowest[:top]:
+            print(f"  {seconds:6.2f}s  {name}")
+        finish, chain = self.critical_path(jobs)
+        print(f"Critical path, {finish:.1f}s longest-first: "
+              + " -> ".join(chain))
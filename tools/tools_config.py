@@ -35,6 +35,10 @@ EXAMPLES_TREE = BUILD_DIR / "examples"
 BUILD_SITE_DIR = BUILD_DIR / "site"
 BUILD_EPUB_DIR = BUILD_DIR / "epub"
 
+# Per-tool result caches (tools_cache.py). Deleting it is always safe: the
+# next run just does everything again.
+CACHE_DIR = BUILD_DIR / "cache"
+
 NORUN_FILE = DATA_DIR / "norun.txt"
 
 # A line marking a listing as unrunnable (GUI, interactive input, infinite
@@ -111,23 +111,36 @@ def extract(
     return result
 
 
-def write_tree(result: ExtractResult, root: Path) -> int:
-    """Write every extracted file under `root`. Returns how many changed.
-
-    Unchanged files are left alone so their mtimes stay put, which keeps
-    tools that watch timestamps from seeing the whole tree churn.
+def write_changed(result: ExtractResult, root: Path) -> list[str]:
+    """Write the extracted files that differ from what is under `root`.
+
+    Returns the relative paths actually written. Unchanged files are left
+    alone so their mtimes stay put, which keeps tools that watch
+    timestamps from seeing the whole tree churn. The size is compared
+    before the bytes, so the usual case (an unedited file) costs one
+    stat() and one read, with no decode.
     """
-    written = 0
+    written: list[str] = []
     for extracted in result.files.values():
         dest = root / extracted.path
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        if (not dest.exists()
-                or dest.read_text(encoding="utf-8") != extracted.content):
+        data = extracted.content.encode("utf-8")
+        try:
+            same = (dest.stat().st_size == len(data)
+                    and dest.read_bytes() == data)
+        except FileNotFoundError:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            same = False
+        if not same:
             write_text_lf(dest, extracted.content)
-            written += 1
+            written.append(extracted.path)
     return written
 
 
+def write_tree(result: ExtractResult, root: Path) -> int:
+    """Write every extracted file under `root`. Returns how many changed."""
+    return len(write_changed(result, root))
+
+
 def check_against(
     result: ExtractResult, root: Path,
 ) -> tuple[list[str], list[str]]:
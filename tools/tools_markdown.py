@@ -22,17 +22,32 @@ is a trailing empty string for a file ending in a newline, which is
 normal for this convention and is what comment_periods.py,
 comment_spacing.py and listing_format.py already assumed.
 
+`Document.parse()` also remembers its work on disk. The blocks and the
+prose-line classification are a pure function of the file's text, so they
+are stored under build/cache/documents/, one small JSON file named by a hash
+of the file's path and a hash of the text and of this parser's own source.
+Every tool that parses the book shares that store, and a run after editing
+one chapter re-parses only that chapter. Storing a new parse deletes the
+older ones for the same path, so the store holds one entry per file rather
+than one per edit. `from_text()` never touches the cache, so a test building a
+document in memory stays free of the filesystem.
+
 Named tools_markdown for the same reason as tools_config/tools_repo/
 tools_pycode/tools_report/tools_prose: it must never collide with a
 book listing's own filename through Python's sys.modules cache. See
 tools_repo.py's docstring for the failure that caused those renames.
 """
 
+import json
+import os
 import re
 from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 
+import tools_cache
+import tools_prose
 from tools_config import PATH_LINE_RE, RUST_PATH_LINE_RE
 from tools_prose import is_prose_line
 
@@ -49,6 +64,12 @@ PYTHON_LANGS = frozenset({"python", "py"})
 # An ATX heading, capturing its text without the leading #s.
 HEADING = re.compile(r"^#{1,6}\s+(.*?)\s*$")
 
+# Part of every cached parse's key: a change to how a file is parsed or
+# how a prose line is recognized must not be answered from the old rules.
+PARSER_TAG = tools_cache.digest(
+    Path(__file__).read_bytes(), Path(tools_prose.__file__).read_bytes()
+)
+
 
 @dataclass(frozen=True)
 class Block:
@@ -117,7 +138,58 @@ class Document:
 
     @classmethod
     def parse(cls, path: Path) -> "Document":
-        return cls.from_text(path.read_text(encoding="utf-8"), path)
+        """Parse the file at `path`, reusing a cached parse of this text."""
+        text = path.read_text(encoding="utf-8")
+        source = tools_cache.digest(str(path.resolve()))[:16]
+        entry = (tools_cache.CACHE_DIR / "documents" / f"{source}."
+                 f"{tools_cache.digest(PARSER_TAG, text)}.json")
+        try:
+            saved = json.loads(entry.read_text(encoding="utf-8"))
+            return cls._restore(text, path, saved)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        doc = cls.from_text(text, path)
+        doc._store(entry)
+        return doc
+
+    @classmethod
+    def _restore(cls, text: str, path: Path, saved: dict) -> "Document":
+        """Rebuild a Document from what `_store` saved for the same text."""
+        lines = text.split("\n")
+        blocks = [
+            Block(lang=lang, open_at=open_at, end=end,
+                  lines=lines[open_at + 1:end])
+            for lang, open_at, end in saved["blocks"]
+        ]
+        doc = cls(path=path, text=text, lines=lines, blocks=blocks)
+        # Seed the cached property, which is where the time goes.
+        doc.__dict__["_prose"] = saved["prose"]
+        return doc
+
+    def _store(self, entry: Path) -> None:
+        """Save this parse under `entry`, atomically, so tools can share it.
+
+        Written to a temporary name and renamed into place, so a tool
+        running concurrently never reads half a file. The entries left by
+        earlier versions of the same file, which share the name's first
+        part, are deleted. Failing to write or delete is not an error: the
+        cache only saves time.
+        """
+        saved = {
+            "blocks": [[b.lang, b.open_at, b.end] for b in self.blocks],
+            "prose": self._prose,
+        }
+        tmp = entry.with_name(f"{entry.stem}.{os.getpid()}.tmp")
+        source = entry.name.partition(".")[0]
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(saved), encoding="utf-8")
+            tmp.replace(entry)
+            for old in entry.parent.glob(f"{source}.*.json"):
+                if old != entry:
+                    old.unlink(missing_ok=True)
+        except OSError:
+            pass
 
     @classmethod
     def from_text(cls, text: str, path: Path = Path("<text>")) -> "Document":
@@ -152,6 +224,12 @@ class Document:
         The complement is the file's prose and headings, which is what
         `prose_lines()` walks.
         """
+        return list(self._fenced)
+
+    @cached_property
+    def _fenced(self) -> list[bool]:
+        # Computed once per document: headings(), outside_fences() and
+        # prose_lines() all need it, and several checks call each.
         flags = [False] * len(self.lines)
         for block in self.blocks:
             stop = min(self.end_of(block), len(self.lines))
@@ -159,6 +237,15 @@ class Document:
                 flags[k] = True
         return flags
 
+    @cached_property
+    def _prose(self) -> list[int]:
+        """0-based indices of the prose lines; see prose_lines()."""
+        fenced = self._fenced
+        return [
+            index for index, line in enumerate(self.lines)
+            if not fenced[index] and is_prose_line(line)
+        ]
+
     @staticmethod
     def end_of(block: Block) -> int:
         """One past the block's closing fence line."""
@@ -171,7 +258,7 @@ class Document:
         keeps everything else, including a trailing `{#id}`, since a
         caller checking anchors needs to see the explicit id.
         """
-        fenced = self.in_fence()
+        fenced = self._fenced
         for index, line in enumerate(self.lines):
             if fenced[index]:
                 continue
@@ -186,7 +273,7 @@ class Document:
         link can appear in any of them, so a link checker wants all of it
         and only needs the code excluded.
         """
-        fenced = self.in_fence()
+        fenced = self._fenced
         for index, line in enumerate(self.lines):
             if not fenced[index]:
                 yield index + 1, line
@@ -198,10 +285,9 @@ class Document:
         headings, lists, tables, block quotes and indented code are left
         out along with the code.
         """
-        fenced = self.in_fence()
-        for index, line in enumerate(self.lines):
-            if not fenced[index] and is_prose_line(line):
-                yield index + 1, line
+        lines = self.lines
+        for index in self._prose:
+            yield index + 1, lines[index]
 
     def rendered(self, lines: list[str] | None = None) -> str:
         """`lines` (default: this document's) joined back into file text.
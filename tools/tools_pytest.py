@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""pytest plugin behind pytest_examples.py: balanced shards, per-test times.
+
+Loaded into the pytest run over an example tree with ``-p tools_pytest``
+(pytest_examples.py puts tools/ on PYTHONPATH). It does two things:
+
+* ``--balance-from FILE`` reads each test's run time from the last run
+  (a JSON object of node id to seconds) and, under ``-n N --dist
+  loadgroup``, deals the tests into N ``xdist_group`` shards of nearly
+  equal total time, longest first, each onto the least-loaded shard. Left
+  to itself, xdist hands tests out in file order, so one chapter's slow
+  tests can land on a single worker and hold the whole run open. Every
+  worker collects the same tests and reads the same file, so each
+  computes the same shards.
+* ``--report-to FILE`` writes every test's outcome and time, and every
+  file that failed to collect, for pytest_examples.py to record.
+
+A test with no recorded time is costed at the mean of the known ones,
+or one second when none are known.
+
+Named tools_pytest for the same reason as the other tools_* modules: it
+is imported into a process that imports the book's listings, so it must
+never collide with a listing's own filename through Python's sys.modules
+cache. See tools_repo.py's docstring.
+"""
+
+import heapq
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+# xdist appends "@<group>" to the node id of a test in a group.
+SHARD = "@shard"
+
+
+def shards(costs: list[float], n: int) -> list[int]:
+    """Deal items costing `costs` into `n` shards; each item's shard."""
+    load = [(0.0, shard) for shard in range(n)]
+    assigned = [0] * len(costs)
+    for i in sorted(range(len(costs)), key=lambda i: -costs[i]):
+        total, shard = heapq.heappop(load)
+        assigned[i] = shard
+        heapq.heappush(load, (total + costs[i], shard))
+    return assigned
+
+
+def base_id(nodeid: str) -> str:
+    """`nodeid` without the shard suffix xdist adds."""
+    return nodeid.split(SHARD, 1)[0]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("tools_pytest")
+    group.addoption("--balance-from", metavar="FILE",
+                    help="shard tests across xdist workers by the run "
+                         "times in FILE")
+    group.addoption("--report-to", metavar="FILE",
+                    help="write each test's outcome and time to FILE")
+
+
+@pytest.hookimpl(tryfirst=True)  # before xdist renames the grouped tests
+def pytest_collection_modifyitems(config: pytest.Config,
+                                  items: list[pytest.Item]) -> None:
+    source = config.getoption("balance_from")
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    if not source or workers < 2:
+        return
+    try:
+        known = json.loads(Path(source).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        known = {}
+    fallback = sum(known.values()) / len(known) if known else 1.0
+    costs = [known.get(item.nodeid, fallback) for item in items]
+    for item, shard in zip(items, shards(costs, workers)):
+        item.add_marker(pytest.mark.xdist_group(f"{SHARD[1:]}{shard}"))
+
+
+class Recorder:
+    """Collects the outcome and time of every test, in the controller."""
+
+    def __init__(self, out: Path, root: Path) -> None:
+        self.out = out
+        self.root = root
+        self.tests: dict[str, dict[str, Any]] = {}
+
+    def entry(self, nodeid: str) -> dict[str, Any]:
+        nodeid = base_id(nodeid)
+        file = str(self.root / nodeid.split("::", 1)[0])
+        return self.tests.setdefault(
+            nodeid, {"file": file, "outcome": "passed", "seconds": 0.0})
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        entry = self.entry(report.nodeid)
+        entry["seconds"] += report.duration
+        if report.failed:
+            entry["outcome"] = "failed"
+        elif report.skipped and entry["outcome"] == "passed":
+            entry["outcome"] = "skipped"
+
+    def pytest_collectreport(self, report: pytest.CollectReport) -> None:
+        if report.failed:
+            self.entry(report.nodeid)["outcome"] = "failed"
+
+    def pytest_sessionfinish(self) -> None:
+        self.out.parent.mkdir(parents=True, exist_ok=True)
+        self.out.write_text(json.dumps(self.tests), encoding="utf-8")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    out = config.getoption("report_to")
+    if out and not hasattr(config, "workerinput"):  # not in an xdist worker
+        config.pluginmanager.register(
+            Recorder(Path(out), config.rootpath), "tools_pytest_recorder")
@@ -18,11 +18,14 @@ block in a single process.
 
 import argparse
 import os
+import re
 import shutil
 import subprocess
+import tomllib
 from pathlib import Path
+from typing import Any
 
-from tools_config import CHAPTERS_DIR, PATH_LINE_RE
+from tools_config import CHAPTERS_DIR, PATH_LINE_RE, ROOT
 
 
 def md_files(paths: list[str | Path] | None = None) -> list[Path]:
@@ -99,6 +102,35 @@ def load_glob_list(path: Path) -> list[str]:
     return out
 
 
+def ty_settings() -> dict[str, Any]:
+    """ty's configuration for the book, as ty reads it from pyproject.toml.
+
+    That is the [tool.ty] table, plus the python-version ty infers from
+    requires-python when the table sets none, so the result still holds
+    when written out as a standalone ty.toml.
+    """
+    with open(ROOT / "pyproject.toml", "rb") as f:
+        config = tomllib.load(f)
+    settings = config.get("tool", {}).get("ty", {})
+    env = settings.setdefault("environment", {})
+    floor = re.search(r"\d+\.\d+",
+                      config.get("project", {}).get("requires-python", ""))
+    if floor and "python-version" not in env:
+        env["python-version"] = floor.group()
+    return settings
+
+
+def ty_extra_paths() -> list[Path]:
+    """The directories pyproject.toml hands ty as extra import roots.
+
+    Besides utils/, these include chapter directories that other files
+    import by bare name, so a check scoped to part of the tree has to keep
+    them in view too.
+    """
+    paths = ty_settings().get("environment", {}).get("extra-paths", [])
+    return [ROOT / path for path in paths]
+
+
 def write_text_lf(path: Path, text: str) -> None:
     """Write `text` to `path` as UTF-8 with LF line endings.
 
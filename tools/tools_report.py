@@ -93,6 +93,14 @@ class Check:
     runner knows whether --fix means anything for it.
     """
 
+    cross_file: bool = False
+    """True if one file's findings depend on other files' text.
+
+    `anchors` reads the heading a link points at, so an edit to one
+    chapter can break a link in another. gate_stamp.py narrows the
+    other checks to the chapters that changed, but never this kind.
+    """
+
 
 def report(
     findings: Iterable[Finding], *, clean: str, problem: str,
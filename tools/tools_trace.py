@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Chrome trace events from the tools, for one timeline of a whole run.
+
+`make ci` spends minutes across extract_examples, validate_output,
+run_examples, ty, ruff, pytest, and build_site, and each tool's own
+summary only says how long it took itself. This records where the time
+goes, in the trace-event format that chrome://tracing and
+https://ui.perfetto.dev open directly:
+
+* `span()` times a block: one stage of a tool, or one file.
+* `run()` is subprocess.run, timed as a span named for the command.
+* `traced()` wraps the function a pool maps over, so every call is a
+  span in whichever worker ran it, preceded by a "queue wait" span from
+  the moment the work was handed to the pool.
+
+Nothing is recorded unless the TOOLS_TRACE environment variable names a
+directory; `make trace` (tools/trace_make.py) sets it. Every process then
+appends its events, one JSON object per line, to a file of its own there.
+Pool workers inherit the variable and write their own files, and
+`merge()` gathers them all into one trace afterwards.
+
+Events are written as they happen rather than buffered until exit, and
+that is what keeps a pool worker's events. A multiprocessing worker
+leaves through os._exit(), which skips atexit. An ordinary exit closes
+the file through atexit. Switched off, each call costs one environment
+lookup.
+
+Named tools_trace for the same reason as the other tools_* modules: it
+must never collide with a book listing's own filename through Python's
+sys.modules cache. See tools_repo.py's docstring.
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable, Generator, Sequence
+from pathlib import Path
+from typing import Any, TextIO
+
+TRACE_ENV = "TOOLS_TRACE"
+
+_lock = threading.Lock()
+_out: tuple[tuple[int, str], TextIO] | None = None  # ((pid, dir), file)
+
+
+def _after_fork() -> None:
+    # A forked child owns neither the parent's file nor, if another thread
+    # held it at the fork, the lock.
+    global _lock, _out
+    _lock = threading.Lock()
+    _out = None
+
+
+def _close() -> None:
+    # A worker that leaves through os._exit() skips this, but its events
+    # are already flushed and the OS closes the file behind it.
+    global _out
+    with _lock:
+        if _out is not None:
+            _out[1].close()
+            _out = None
+
+
+os.register_at_fork(after_in_child=_after_fork)
+atexit.register(_close)
+
+
+def enabled() -> bool:
+    return bool(os.environ.get(TRACE_ENV))
+
+
+def _process_name() -> str:
+    from multiprocessing import parent_process
+
+    parent = parent_process()
+    if parent is not None:
+        return f"worker of {parent.pid}"
+    return " ".join([Path(sys.argv[0]).name, *sys.argv[1:]])[:80]
+
+
+def _emit(event: dict[str, Any]) -> None:
+    global _out
+    with _lock:
+        pid, where = os.getpid(), os.environ[TRACE_ENV]
+        if _out is None or _out[0] != (pid, where):
+            if _out is not None:
+                _out[1].close()
+            folder = Path(where)
+            folder.mkdir(parents=True, exist_ok=True)
+            # The time in the name keeps a reused pid from sharing a file.
+            events = open(folder / f"{pid}-{time.time_ns()}.jsonl", "a",
+                          encoding="utf-8")
+            _out = ((pid, where), events)
+            events.write(json.dumps({
+                "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                "args": {"name": _process_name()},
+            }) + "\n")
+        _out[1].write(json.dumps(event) + "\n")
+        _out[1].flush()
+
+
+def complete(name: str, cat: str, start_ns: int, end_ns: int,
+             **args: Any) -> None:
+    """Record a finished span, timed by the wall clock every process shares."""
+    _emit({
+        "name": name, "cat": cat, "ph": "X",
+        "ts": start_ns / 1000, "dur": (end_ns - start_ns) / 1000,
+        "pid": os.getpid(), "tid": threading.get_native_id(), "args": args,
+    })
+
+
+@contextlib.contextmanager
+def span(name: str, cat: str = "tool", **args: Any) -> Generator[None]:
+    """Time the block as one span, if tracing is on."""
+    if not enabled():
+        yield
+        return
+    start = time.time_ns()
+    try:
+        yield
+    finally:
+        complete(name, cat, start, time.time_ns(), **args)
+
+
+def run(command: Sequence[str], *, name: str | None = None,
+        **kwargs: Any) -> subprocess.CompletedProcess[Any]:
+    """subprocess.run, recorded as a span named for the command."""
+    if not enabled():
+        return subprocess.run(command, **kwargs)
+    label = name or " ".join(Path(str(part)).name for part in command[:2])
+    with span(label, "subprocess", command=" ".join(map(str, command)),
+              cwd=str(kwargs.get("cwd") or ".")):
+        return subprocess.run(command, **kwargs)
+
+
+class Traced[**P, R]:
+    """`fn`, tracing each call and how long it queued before starting.
+
+    Picklable whenever `fn` is, so it crosses into a process pool. A call
+    is named for its first argument, normally the file it works on.
+    """
+
+    def __init__(self, fn: Callable[P, R], cat: str) -> None:
+        self.fn = fn
+        self.cat = cat
+        self.submitted = time.time_ns()
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        start = time.time_ns()
+        name = str(args[0]) if args else "call"
+        complete("queue wait", "queue", self.submitted, start, item=name)
+        with span(name, self.cat):
+            return self.fn(*args, **kwargs)
+
+
+def traced[**P, R](fn: Callable[P, R], cat: str) -> Callable[P, R]:
+    """`fn` as a Traced when tracing is on, else `fn` itself.
+
+    Wrap at the moment of handing the work to the pool: the queue wait
+    is measured from here.
+    """
+    return Traced(fn, cat) if enabled() else fn
+
+
+def merge(folder: Path, out: Path) -> list[dict[str, Any]]:
+    """Gather every process's events into one trace file at `out`."""
+    events: list[dict[str, Any]] = []
+    for part in sorted(folder.glob("*.jsonl")):
+        for line in part.read_text(encoding="utf-8").splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue  # a process killed mid-write
+    events.sort(key=lambda e: e.get("ts", 0))
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"traceEvents": events,
+                               "displayTimeUnit": "ms"}),
+                   encoding="utf-8")
+    return events
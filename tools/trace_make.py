@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Run make with tracing on, and merge one Chrome trace of the whole run.
+
+    make trace                  # trace `make gate`
+    make trace TARGET=ci        # or any other target
+    python tools/trace_make.py ci --top 20
+
+This runs make with TOOLS_TRACE pointing at ``build/trace/``, so every
+tool that uses tools_trace.py records its spans there: each file
+validate_output.py and run_examples.py process and how long it queued
+for a worker, each pandoc call build_site.py makes, each gate-fast stage.
+It also replaces make's SHELL with this script's ``--shell`` mode, which
+runs the recipe line through the real shell inside a span. That way the
+steps with no Python of their own, such as ty, ruff and pytest, are on
+the timeline too, along with every recipe line of every sub-make.
+
+When make finishes, the per-process files are merged into
+``build/trace.json``, which opens in chrome://tracing or
+https://ui.perfetto.dev, and the slowest recipe lines are printed:
+
+    Slowest 3 of 21 recipe line(s), 74.2s wall:
+       31.90s  uv run python tools/validate_output.py --update Chapters
+       18.44s  uv run python tools/run_examples.py
+        9.02s  uv run python tools/pytest_examples.py build/examples
+
+The SHELL swap needs a POSIX shell and paths without spaces, since make
+splits SHELL on whitespace. Where either is missing, the recipe lines go
+untraced and the tools' own spans are still recorded.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import tools_trace
+from tools_config import BUILD_DIR, ROOT
+
+TRACE_DIR = BUILD_DIR / "trace"
+TRACE_FILE = BUILD_DIR / "trace.json"
+# The shell recipe lines really run in; make's own default.
+POSIX_SHELL = "/bin/sh"
+
+
+def shell(argv: list[str]) -> int:
+    """Stand in for make's SHELL: run one recipe line inside a span."""
+    line = argv[-1] if argv else ""
+    with tools_trace.span(line[:120], "make", command=line):
+        code = subprocess.run([POSIX_SHELL, *argv]).returncode
+    return code if code >= 0 else 128 - code  # killed by a signal
+
+
+def make_command(targets: list[str]) -> list[str]:
+    wrapper = [sys.executable, str(Path(__file__).resolve()), "--shell"]
+    if os.name == "nt" or any(" " in part for part in wrapper):
+        print("note: recipe lines are not traced here (see --help).")
+        return ["make", *targets]
+    return ["make", f"SHELL={' '.join(wrapper)}", *targets]
+
+
+def print_slowest(events: list[dict], top: int, wall: float) -> None:
+    lines = sorted((e for e in events if e.get("cat") == "make"),
+                   key=lambda e: -e["dur"])
+    if not lines or top <= 0:
+        return
+    print(f"\nSlowest {min(top, len(lines))} of {len(lines)} recipe "
+          f"line(s), {wall:.1f}s wall:")
+    for event in lines[:top]:
+        print(f"  {event['dur'] / 1e6:6.2f}s  {event['args']['command']}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--shell"]:
+        return shell(argv[1:])
+    ap = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("targets", nargs="*", default=["gate"],
+                    help="make targets to trace (default: gate)")
+    ap.add_argument("--top", type=int, default=10, metavar="N",
+                    help="print the N slowest recipe lines (default: 10)")
+    args = ap.parse_args(argv)
+
+    shutil.rmtree(TRACE_DIR, ignore_errors=True)
+    env = {**os.environ, tools_trace.TRACE_ENV: str(TRACE_DIR)}
+    start = time.perf_counter()
+    code = subprocess.run(make_command(args.targets), cwd=ROOT,
+                          env=env).returncode
+    wall = time.perf_counter() - start
+
+    events = tools_trace.merge(TRACE_DIR, TRACE_FILE)
+    print_slowest(events, args.top, wall)
+    pids = {e["pid"] for e in events}
+    print(f"\n{len(events)} event(s) from {len(pids)} process(es) in "
+          f"{TRACE_FILE.relative_to(ROOT)}; open it in chrome://tracing "
+          "or https://ui.perfetto.dev.")
+    if code:
+        print(f"make {' '.join(args.targets)} failed (exit {code}).")
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -31,6 +31,26 @@ chapter's stdout was being captured. A file that gets its own process
 cannot do either. Use -j 1 to go back to one process for everything,
 which is the right setting when debugging a block that misbehaves.
 
+A block that passes is remembered in build/cache/validate_output.json under
+a hash of its text, the sibling modules and data files it reaches, the
+interpreter version, and this script's own source. The next run skips any
+block whose hash is already there, so after editing one paragraph only the
+listings that could have changed actually execute. A failure is never
+remembered. Use --no-cache to run every block regardless.
+
+--warm keeps the one-process-per-file isolation but stops paying for each
+process's startup imports. Workers are forked from a forkserver template
+that has already imported the modules most listings share (WARM_MODULES:
+asyncio, numpy, stateless, ...), so each fresh process starts with them in
+sys.modules. Fork is copy-on-write, so a listing that mutates a preloaded
+module changes only its own process's copy. Where forkserver is not
+available (Windows) the flag is accepted and ignored.
+
+Files are handed to the pool longest-first, using the run times recorded in
+build/cache/validate_output.durations.json by the previous run, so the one
+slow chapter starts at once instead of last. Output is still printed in
+file order. --durations N prints the N slowest files at the end.
+
 Usage:
     python tools/validate_output.py file.py        # check one file
     python tools/validate_output.py Examples/      # check directory
@@ -38,6 +58,9 @@ Usage:
     python tools/validate_output.py --update file.py   # rewrite markers
     python tools/validate_output.py --update Chapters/ # rewrite the book
     python tools/validate_output.py -j 1 Chapters/     # serial, one process
+    python tools/validate_output.py --no-cache Chapters/  # run every block
+    python tools/validate_output.py --warm Chapters/   # preforked workers
+    python tools/validate_output.py --durations 5 Chapters/  # slowest five
 """
 
 import argparse
@@ -46,12 +69,17 @@ import fnmatch
 import functools
 import gc
 import io
+import multiprocessing
 import os
 import re
 import sys
+import time
 from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Iterable
 from pathlib import Path
 
+import tools_trace
+from tools_cache import Durations, JsonCache, cache_file, source_key
 from tools_config import EXAMPLES_TREE as DEFAULT_TREE
 from tools_config import INLINE_NORUN_MARKER, NORUN_FILE
 from tools_pycode import walk_fenced
@@ -60,6 +88,25 @@ from tools_repo import add_jobs_arg, block_slug, load_glob_list, write_text_lf
 # Matches #: or #: <content> at column 0 only.
 MARKER_RE = re.compile(r'^#:(?: (.*))?$')
 
+# Part of every cache key, so changing how blocks are checked invalidates
+# every pass recorded by the old code.
+SELF_SOURCE = Path(__file__).read_text(encoding='utf-8')
+
+# Imported once by the --warm template process, so every worker forked
+# from it starts with them loaded. Only third-party and standard-library
+# modules belong here: a chapter's own module (greeter, result) must be
+# imported fresh from that chapter's directory, or a different chapter's
+# file of the same name would answer the import. A name that fails to
+# import (numpy missing) is skipped by the forkserver, not an error.
+WARM_MODULES = [
+    'asyncio', 'collections', 'concurrent.futures', 'contextlib',
+    'dataclasses', 'datetime', 'enum', 'functools', 'itertools',
+    'numpy', 'random', 'stateless', 'threading', 'typing',
+    # This script itself, so a worker does not re-import it (and the
+    # tools_* libraries) to find the function it is meant to run.
+    '__main__',
+]
+
 
 def is_marker(line: str) -> bool:
     return bool(MARKER_RE.match(line.rstrip('\n\r')))
@@ -131,6 +178,33 @@ def exec_capture(
         sys.stdout = old_stdout
 
 
+class BlockCache:
+    """Keys of blocks known to pass, and what one file's run found.
+
+    ``known`` comes in from the previous run; ``valid`` goes out holding
+    every key that still passes, hit or freshly run, which is what the
+    file's cache entry becomes. Keys that stopped matching anything drop
+    out that way instead of accumulating.
+    """
+
+    def __init__(self, known: Iterable[str] = ()):
+        self.known = frozenset(known)
+        self.valid: list[str] = []
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self, key: str) -> bool:
+        if key in self.known:
+            self.hits += 1
+            self.valid.append(key)
+            return True
+        self.misses += 1
+        return False
+
+    def record(self, key: str) -> None:
+        self.valid.append(key)
+
+
 def collect_now() -> None:
     """Force cyclic garbage from the just-finished block to finalize now.
 
@@ -228,7 +302,10 @@ def process_block(
     return new_lines, ok, changed
 
 
-def process_file(path: Path, *, update: bool) -> bool | None:
+def process_file(
+    path: Path, *, update: bool, cache: BlockCache | None = None,
+    tree: Path = DEFAULT_TREE,
+) -> bool | None:
     """Check or update one .py file.
 
     Returns None  - no #: markers found (file skipped)
@@ -241,6 +318,11 @@ def process_file(path: Path, *, update: bool) -> bool | None:
     if not any(is_marker(line) for line in lines):
         return None
 
+    # What the file can reach: its siblings and tree/utils, as a block.
+    search = [path.parent, tree / 'utils']
+    if cache is not None and cache.hit(source_key(text, search, SELF_SOURCE)):
+        return True
+
     namespace: dict = {'__name__': '__main__', '__file__': str(path)}
     new_lines, ok, changed = process_block(
         lines, str(path), update=update, namespace=namespace
@@ -252,6 +334,8 @@ def process_file(path: Path, *, update: bool) -> bool | None:
     # fill-in above, which should persist regardless of --update.
     if changed:
         write_text_lf(path, ''.join(new_lines))
+    if ok and cache is not None:
+        cache.record(source_key(''.join(new_lines), search, SELF_SOURCE))
 
     return ok
 
@@ -291,6 +375,7 @@ def process_markdown(
     update: bool,
     tree: Path = DEFAULT_TREE,
     skips: list[str] | None = None,
+    cache: BlockCache | None = None,
 ) -> bool | None:
     """Check or update the #: markers in a Markdown file's python listings.
 
@@ -323,7 +408,7 @@ def process_markdown(
         if any(is_marker(line) for line in block):
             result = process_md_block(
                 block, path, chapter, block_start,
-                tree=tree, skips=skips, update=update,
+                tree=tree, skips=skips, update=update, cache=cache,
             )
             any_markers = True
             ok = ok and result.ok
@@ -361,6 +446,7 @@ def process_md_block(
     tree: Path,
     skips: list[str],
     update: bool,
+    cache: BlockCache | None = None,
 ) -> BlockResult:
     """Run one ```python block and check or rewrite its #: markers."""
     slug = block_slug(block)
@@ -382,6 +468,11 @@ def process_md_block(
         return BlockResult(block, ok=True, changed=False)
 
     rundir = filepath.parent if filepath else None
+    # What the block can reach: its extracted siblings and tree/utils.
+    search = [rundir, tree / 'utils'] if rundir else [tree / 'utils']
+    if cache is not None and cache.hit(source_key(text, search, SELF_SOURCE)):
+        return BlockResult(block, ok=True, changed=False)
+
     namespace: dict = {
         '__name__': '__main__',
         '__file__': str(filepath) if filepath else str(path),
@@ -395,11 +486,16 @@ def process_md_block(
         )
     del namespace
     collect_now()
+    if ok and cache is not None:
+        # Keyed on the lines as written back, which is what the next run
+        # will read.
+        cache.record(source_key(''.join(new_lines), search, SELF_SOURCE))
     return BlockResult(new_lines, ok, changed)
 
 
 def process_one(
     path: Path, *, update: bool, tree: Path, skips: list[str],
+    cache: BlockCache | None = None,
 ) -> tuple[bool | None, str]:
     """Process one file, returning its result and everything it printed.
 
@@ -416,13 +512,52 @@ def process_one(
     with contextlib.redirect_stdout(buf):
         if path.suffix == '.md':
             result = process_markdown(
-                path, update=update, tree=tree, skips=skips
+                path, update=update, tree=tree, skips=skips, cache=cache,
             )
         else:
-            result = process_file(path, update=update)
+            result = process_file(
+                path, update=update, cache=cache, tree=tree,
+            )
     return result, buf.getvalue()
 
 
+def process_cached(
+    path: Path, known: list[str] | None, *,
+    update: bool, tree: Path, skips: list[str],
+) -> tuple[bool | None, str, BlockCache | None, float]:
+    """process_one() with the file's known keys, returning what it found.
+
+    A worker process cannot update the parent's cache in place, so the
+    keys travel in as an argument and back out in the result, along with
+    how long the file took. ``known`` is None when caching is off.
+    """
+    cache = None if known is None else BlockCache(known)
+    start = time.perf_counter()
+    result, output = process_one(
+        path, update=update, tree=tree, skips=skips, cache=cache,
+    )
+    return result, output, cache, time.perf_counter() - start
+
+
+def pool_context(
+    *, warm: bool,
+) -> multiprocessing.context.BaseContext | None:
+    """The multiprocessing context workers start from.
+
+    None is the platform default. With ``warm``, a forkserver preloaded
+    with WARM_MODULES: the server imports them once, then forks every
+    worker from itself, so a worker skips both interpreter startup and
+    those imports while still being a process no other file has touched.
+    """
+    if not warm:
+        return None
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return None
+    ctx = multiprocessing.get_context('forkserver')
+    ctx.set_forkserver_preload(WARM_MODULES)
+    return ctx
+
+
 def collect_files(targets: list[Path]) -> list[Path]:
     files: list[Path] = []
     for t in targets:
@@ -460,6 +595,19 @@ def main(argv: list[str] | None = None) -> int:
         '-v', '--verbose', action='store_true',
         help='print each file as it is processed',
     )
+    ap.add_argument(
+        '--no-cache', action='store_true',
+        help='run every block, ignoring and not updating the pass cache',
+    )
+    ap.add_argument(
+        '--durations', type=int, default=0, metavar='N',
+        help='print the N slowest files at the end',
+    )
+    ap.add_argument(
+        '--warm', action='store_true',
+        help='fork workers from a template process that preloaded '
+             'WARM_MODULES (ignored where forkserver is unavailable)',
+    )
     add_jobs_arg(ap, 'files')
     args = ap.parse_args(argv)
 
@@ -475,9 +623,17 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     skips = load_glob_list(NORUN_FILE)
+    store = JsonCache(
+        cache_file('validate_output'), enabled=not args.no_cache
+    )
+    known = [
+        store.data.get(str(path.resolve()), []) if store.enabled else None
+        for path in files
+    ]
     work = functools.partial(
-        process_one, update=args.update, tree=args.tree, skips=skips
+        process_cached, update=args.update, tree=args.tree, skips=skips
     )
+    durations = Durations('validate_output')
 
     # One fresh process per file, not a pool of reused workers. Files are
     # independent, but a worker that ran several would share what a block
@@ -488,16 +644,32 @@ def main(argv: list[str] | None = None) -> int:
     # existing when a file gets an interpreter to itself.
     jobs = min(max(1, args.jobs), len(files))
     if jobs == 1:
-        outcomes = map(work, files)
+        outcomes = map(tools_trace.traced(work, 'validate_output'),
+                       files, known)
     else:
-        pool = ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1)
+        pool = ProcessPoolExecutor(
+            max_workers=jobs, max_tasks_per_child=1,
+            mp_context=pool_context(warm=args.warm),
+        )
+        # Submit longest-first, then put the results back in file order,
+        # so output is reproducible whatever order the pool ran things in.
+        order = durations.longest_first([str(path) for path in files])
         with pool:
-            # map() yields in submission order, so output stays in file
-            # order and the run is reproducible.
-            outcomes = list(pool.map(work, files))
+            ran = pool.map(
+                tools_trace.traced(work, 'validate_output'),
+                [files[i] for i in order], [known[i] for i in order],
+            )
+            by_index = dict(zip(order, ran, strict=True))
+        outcomes = [by_index[i] for i in range(len(files))]
 
-    n_ok = n_fail = n_skip = 0
-    for path, (result, output) in zip(files, outcomes, strict=True):
+    n_ok = n_fail = n_skip = hits = misses = 0
+    for path, (result, output, cache, seconds) in zip(
+        files, outcomes, strict=True
+    ):
+        # A file whose every block was a cache hit took no time worth
+        # scheduling by; keep the time it took when its blocks last ran.
+        if result is not None and (cache is None or cache.misses):
+            durations.record(str(path), seconds)
         if args.verbose:
             print(path)
         if output:
@@ -510,12 +682,21 @@ def main(argv: list[str] | None = None) -> int:
             case False:
                 print(f"FAIL: {path}")
                 n_fail += 1
+        if cache is not None:
+            store.data[str(path.resolve())] = cache.valid
+            hits += cache.hits
+            misses += cache.misses
+    store.save()
+    durations.save()
 
     action = 'updated' if args.update else 'ok'
     print(
         f"\n{n_ok} {action}, {n_fail} failed, "
         f"{n_skip} skipped (no markers)."
     )
+    if store.enabled:
+        print(f"cache: {hits} block(s) skipped, {misses} run.")
+    durations.report(jobs, args.durations)
     return 0 if n_fail == 0 else 1
 
 
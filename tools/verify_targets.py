@@ -29,27 +29,57 @@ commit, not any uncommitted changes, so it tests each target's own wiring
 rather than whether running it right now would leave your draft clean.
 
 Every target's combined stdout/stderr is saved to
-build/target_test_logs/<target>.log for inspection after the run.
+build/target_test_logs/<target>.log for inspection after the run, and
+every target's run time to build/target_test_logs/durations.json,
+slowest first.
+
+Targets run in an order built from the Makefile's prerequisites, so a
+target starts only after every tested target it depends on has passed,
+and its `make` call is given `-o` for each of those (when they ran in
+the same tree), so `ty` does not re-extract the tree `extract` just
+built, and `verify` does not re-run the `gate` already tested. A target
+whose prerequisite failed is reported as not run rather than run to fail
+the same way a second time.
+
+`-j N` runs up to N independent targets at once. The mutating targets
+then share a pool of up to N worktrees, created on first use and reset
+to HEAD (`git reset --hard`, `git clean -fd`) between targets rather than
+recreated, which keeps each worktree's `.venv`. Two groups run after
+that, one target at a time. First come the aggregates that re-run most
+of the Makefile (`gate`, `gate-fast`, `ci`, `verify`, `sync-ci`,
+`check-ch`), since they rewrite the build/ trees and caches every other
+target reads. Last come the clean-* targets and `reset`, since they
+delete those trees. Among the targets that are ready, the slowest last
+time (build/cache/verify_targets.durations.json) start first.
 
 Usage:
     python tools/verify_targets.py                  # every target
     python tools/verify_targets.py --only gate ci    # just these targets
     python tools/verify_targets.py --timeout 60      # per-target timeout
+    python tools/verify_targets.py -j 4              # 4 targets at once
+    python tools/verify_targets.py --durations 10    # show the 10 slowest
 """
 
 import argparse
-import contextlib
+import json
 import os
+import queue
+import re
 import shutil
 import subprocess
 import tempfile
+import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
 from typing import cast
 
 from make_help import MAKEFILE, entries
+from tools_cache import Durations
 from tools_config import ROOT
+from tools_repo import jobs_arg
 
 LOG_DIR = ROOT / "build" / "target_test_logs"
 DEFAULT_TIMEOUT = 300.0
@@ -61,6 +91,8 @@ EXCLUDED: dict[str, str] = {
     "serve": "starts a server that runs forever",
     "local": "starts a server that runs forever",
     "verify-targets": "this is the target that runs this script",
+    "bench": "times every measured listing for minutes and appends to "
+             "the benchmark history",
 }
 
 # Targets whose recipe rewrites tracked files unconditionally: run these in
@@ -71,6 +103,25 @@ WORKTREE_TARGETS: frozenset[str] = frozenset({
     "output", "solutions-output",
 })
 
+# Targets that run alone, after the rest: they re-run most of the
+# Makefile, writing the same build/ trees and caches as the targets they
+# would otherwise be racing. solutions-gate rewrites build/solutions/ and
+# its caches under the solutions-* targets, and sweep re-runs every check
+# over both trees.
+SERIAL: frozenset[str] = frozenset({
+    "gate", "gate-fast", "ci", "verify", "sync-ci", "check-ch", "trace",
+    "solutions-gate", "sweep",
+})
+
+# Targets that delete trees the others read, so they run alone and last,
+# along with anything that depends on them (reset).
+CLEANING: frozenset[str] = frozenset({
+    "clean-examples", "clean-solutions", "clean-site", "clean-epub",
+})
+
+# A rule line: "name: prerequisites  ## doc". Not `:=`, and not `.PHONY`.
+RULE_RE = re.compile(r"^([a-zA-Z][\w-]*):(?![:=])([^#\n]*)", re.MULTILINE)
+
 
 @dataclass
 class Result:
@@ -86,7 +137,30 @@ def documented_targets() -> list[str]:
     return [name for name, _ in entries(text) if name is not None]
 
 
-def run_target(name: str, cwd: Path, timeout: float) -> Result:
+def prerequisites(text: str) -> dict[str, list[str]]:
+    """Each rule's prerequisites, as the Makefile lists them."""
+    return {m.group(1): m.group(2).split() for m in RULE_RE.finditer(text)}
+
+
+def upstream(name: str, prereqs: dict[str, list[str]],
+             tested: set[str]) -> set[str]:
+    """The tested targets `name` depends on, directly or through others."""
+    found: set[str] = set()
+    stack = list(prereqs.get(name, []))
+    seen: set[str] = set()
+    while stack:
+        dep = stack.pop()
+        if dep in seen:
+            continue
+        seen.add(dep)
+        if dep in tested:
+            found.add(dep)
+        stack.extend(prereqs.get(dep, []))
+    return found
+
+
+def run_target(name: str, cwd: Path, timeout: float,
+               make_args: list[str] | None = None) -> Result:
     """Run `make <name>` in `cwd`, logging its output. Returns a Result."""
     # A parent VIRTUAL_ENV pointing at this repo's .venv makes uv print a
     # harmless but noisy mismatch warning when cwd is a different checkout
@@ -95,7 +169,8 @@ def run_target(name: str, cwd: Path, timeout: float) -> Result:
     start = time.monotonic()
     try:
         proc = subprocess.run(
-            ["make", name], cwd=cwd, capture_output=True, text=True,
+            ["make", *(make_args or []), name], cwd=cwd,
+            capture_output=True, text=True,
             timeout=timeout, env=env,
         )
     except subprocess.TimeoutExpired as exc:
@@ -125,27 +200,87 @@ def log_tail(name: str, lines: int = 25) -> str:
     return "\n".join(text.splitlines()[-lines:])
 
 
-@contextlib.contextmanager
-def disposable_worktree():
-    """A throwaway `git worktree` checked out at HEAD, removed on exit."""
-    base = Path(tempfile.mkdtemp(prefix="tip-worktree-"))
-    path = base / "wt"  # git worktree add requires a not-yet-existing path
-    subprocess.run(
-        ["git", "worktree", "add", "--detach", str(path), "HEAD"],
-        cwd=ROOT, check=True, capture_output=True, text=True,
-    )
-    try:
-        yield path
-    finally:
-        subprocess.run(
-            ["git", "worktree", "remove", "--force", str(path)],
-            cwd=ROOT, check=False, capture_output=True, text=True,
-        )
-        shutil.rmtree(base, ignore_errors=True)
-        subprocess.run(
-            ["git", "worktree", "prune"],
-            cwd=ROOT, check=False, capture_output=True, text=True,
-        )
+class WorktreePool:
+    """Disposable `git worktree`s at HEAD, reused between targets.
+
+    Created on first use, up to `size`, and reset to HEAD when a target
+    hands one back, so a run pays for at most `size` checkouts (and
+    `size` `.venv`s) however many mutating targets it tests.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.free: queue.SimpleQueue[Path] = queue.SimpleQueue()
+        self.paths: list[Path] = []
+        self.lock = threading.Lock()  # git locks its worktree list
+
+    def acquire(self) -> Path:
+        with self.lock:
+            if self.free.empty() and len(self.paths) < self.size:
+                base = Path(tempfile.mkdtemp(prefix="tip-worktree-"))
+                path = base / "wt"  # git worktree add needs a new path
+                git("worktree", "add", "--detach", str(path), "HEAD",
+                    check=True)
+                self.paths.append(path)
+                return path
+        return self.free.get()
+
+    def release(self, path: Path) -> None:
+        """Undo whatever the last target rewrote, keeping ignored files."""
+        git("reset", "--hard", "--quiet", cwd=path)
+        git("clean", "-fd", "--quiet", cwd=path)
+        self.free.put(path)
+
+    def close(self) -> None:
+        for path in self.paths:
+            git("worktree", "remove", "--force", str(path))
+            shutil.rmtree(path.parent, ignore_errors=True)
+        git("worktree", "prune")
+
+
+def git(*args: str, cwd: Path = ROOT, check: bool = False) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=check,
+                   capture_output=True, text=True)
+
+
+def schedule(names: list[str], waits: dict[str, set[str]], jobs: int,
+             run_one: Callable[[str, dict[str, Result]], Result],
+             durations: Durations, done: dict[str, Result]) -> None:
+    """Run `names` on `jobs` threads, each once its `waits` are done.
+
+    Among the targets ready to start, the slowest last time go first.
+    Results land in `done` and are printed as each target finishes.
+    """
+    pending = list(names)
+    running: dict[Future[Result], str] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            ready = [n for n in pending if waits[n] <= done.keys()]
+            if not ready and not running:
+                ready = pending[:1]  # a cycle make itself would reject
+            for i in durations.longest_first(ready):
+                if len(running) >= jobs:
+                    break
+                pending.remove(ready[i])
+                running[pool.submit(run_one, ready[i], done)] = ready[i]
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                del running[future]
+                done[result.name] = result
+                durations.record(result.name, result.seconds)
+                print(f"-> {result.name} ...",
+                      "ok" if result.ok else f"FAILED ({result.summary})",
+                      f"[{result.seconds:.1f}s]", flush=True)
+
+
+def write_durations(results: list[Result]) -> None:
+    """Every target's run time, slowest first, beside the logs."""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    ordered = sorted(results, key=lambda r: -r.seconds)
+    (LOG_DIR / "durations.json").write_text(
+        json.dumps({r.name: round(r.seconds, 2) for r in ordered}, indent=2)
+        + "\n", encoding="utf-8")
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -161,6 +296,15 @@ def main(argv: list[str] | None = None) -> int:
         "--timeout", type=float, default=DEFAULT_TIMEOUT,
         help=f"seconds before a target is killed (default: {DEFAULT_TIMEOUT:.0f})",
     )
+    ap.add_argument(
+        "-j", "--jobs", type=jobs_arg, default=1, metavar="N",
+        help="targets to run at once: an int or 'auto' for all cores "
+             "(default: 1, one at a time)",
+    )
+    ap.add_argument(
+        "--durations", type=int, default=0, metavar="N",
+        help="print the N slowest targets at the end",
+    )
     args = ap.parse_args(argv)
 
     if LOG_DIR.exists():
@@ -172,31 +316,54 @@ def main(argv: list[str] | None = None) -> int:
         targets = [t for t in targets if t in wanted]
 
     skipped = [t for t in targets if t in EXCLUDED]
-    worktree = [t for t in targets if t in WORKTREE_TARGETS]
-    direct = [
-        t for t in targets if t not in EXCLUDED and t not in WORKTREE_TARGETS
+    tested = [t for t in targets if t not in EXCLUDED]
+    worktree = [t for t in tested if t in WORKTREE_TARGETS]
+    prereqs = prerequisites(MAKEFILE.read_text(encoding="utf-8"))
+    waits = {t: upstream(t, prereqs, set(tested)) for t in tested}
+    # Anything waiting on a target in a later phase joins that phase.
+    cleaning = {t for t in tested if t in CLEANING or waits[t] & CLEANING}
+    serial = {t for t in tested if t in SERIAL or waits[t] & SERIAL}
+    serial -= cleaning
+    phases = [
+        ([t for t in tested if t not in serial | cleaning], args.jobs),
+        ([t for t in tested if t in serial], 1),
+        ([t for t in tested if t in cleaning], 1),
     ]
 
-    results: list[Result] = []
-
-    for name in direct:
-        print(f"-> {name} ...", end=" ", flush=True)
-        result = run_target(name, ROOT, args.timeout)
-        results.append(result)
-        print("ok" if result.ok else f"FAILED ({result.summary})",
-              f"[{result.seconds:.1f}s]")
+    pool = WorktreePool(min(args.jobs, len(worktree)))
+    durations = Durations("verify_targets")
+
+    def run_one(name: str, done: dict[str, Result]) -> Result:
+        failed = sorted(d for d in waits[name] if not done[d].ok)
+        if failed:
+            _write_log(name, f"not run: {failed[0]} failed\n")
+            return Result(name, False, 0.0, f"not run: {failed[0]} failed")
+        if name not in WORKTREE_TARGETS:
+            # Prerequisites that passed here need not be rebuilt by make.
+            made = sorted(d for d in waits[name] if d not in WORKTREE_TARGETS)
+            skip = [arg for d in made for arg in ("-o", d)]
+            return run_target(name, ROOT, args.timeout, skip)
+        wt = pool.acquire()
+        try:
+            return run_target(name, wt, args.timeout)
+        finally:
+            pool.release(wt)
 
     if worktree:
-        print(f"\nSetting up a disposable worktree for "
-              f"{len(worktree)} mutating target(s)...")
-        with disposable_worktree() as wt:
-            for name in worktree:
-                print(f"-> {name} (worktree) ...", end=" ", flush=True)
-                result = run_target(name, wt, args.timeout)
-                results.append(result)
-                print("ok" if result.ok else f"FAILED ({result.summary})",
-                      f"[{result.seconds:.1f}s]")
+        print(f"{len(worktree)} mutating target(s) run in up to "
+              f"{pool.size} disposable worktree(s).\n")
+    done: dict[str, Result] = {}
+    try:
+        for names, jobs in phases:
+            schedule(names, waits, jobs, run_one, durations, done)
+    finally:
+        pool.close()
+        durations.save()
+    results = [done[t] for t in tested]
+    write_durations(results)
+    durations.report(args.jobs, args.durations)
 
+    direct = [t for t in tested if t not in WORKTREE_TARGETS]
     if {"clean-examples", "clean-solutions", "clean-site",
             "clean-epub"} & set(direct):
         # Those targets are real, tested rmtree calls; leaving build/ empty